@@ -0,0 +1 @@
+"""Shared rendering helpers for the Roaring Trades store asset generators."""
@@ -0,0 +1,419 @@
+"""Command line entry point: ``python3 -m assetgen <command>``."""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from assetgen import (animate, bench, bundle, fonts, graph, ingest, jobs, pipeline, render, shard, trace, variants,
+                      verify, watch)
+from assetgen.cache import BuildCache
+
+
+def render_all_jobs(args, out=None):
+    """The render-all job list for the parsed options."""
+    out = out or args.out
+    job_list = jobs.all_jobs(args.assets, out)
+    if args.localized:
+        job_list += jobs.localized_jobs(args.assets, out, args.locale)
+    if args.multires:
+        job_list += jobs.multires_jobs(out)
+    if args.hires:
+        job_list += jobs.hires_jobs(args.assets, out)
+    if args.animated:
+        job_list += jobs.animation_jobs(args.assets, out, args.animation_format)
+    return job_list
+
+
+def _watch_files(assets_dir):
+    """Files the watcher polls: see ``assetgen.watch.watched_files``."""
+    import format_screenshots
+
+    assets_dir = assets_dir or format_screenshots.ASSETS
+    raw_names = [raw for raw, _, _, _ in format_screenshots.SCREENSHOTS]
+    return lambda: watch.watched_files(assets_dir, graph.DEFAULT_CONFIG, raw_names)
+
+
+def cmd_render_all(args):
+    """Render every store asset across a process pool."""
+    if args.watch:
+        return watch.watch(lambda: render_all_jobs(args, args.out or watch.PREVIEW_DIR),
+                           _watch_files(args.assets), args.workers or 1, args.port, args.force)
+    job_list = render_all_jobs(args)
+    cache = BuildCache()
+    if cache.evicted:
+        print("Build cache version changed; rebuilding everything.")
+    if args.check_stable:
+        return check_stable(job_list, args.workers, cache)
+    if args.trace:
+        trace.enable(args.trace)
+    if args.shard:
+        return render_shard(args, job_list)
+    workers = args.workers or render.default_workers()
+    if args.pipeline:
+        print(f"Rendering {len(job_list)} assets in a pipeline, {workers} threads per stage...")
+    else:
+        print(f"Rendering {len(job_list)} assets with {workers} workers...")
+    start = time.perf_counter()
+    results, skipped = render.build(job_list, args.workers, cache, force=args.force,
+                                    runner=pipeline.run if args.pipeline else None)
+    render.print_report(results, time.perf_counter() - start, skipped)
+    emit_variants(args, [path for job in job_list for path in jobs.outputs(job)])
+    return 0
+
+
+def render_shard(args, job_list):
+    """Render one shard of ``job_list`` into the shared directory."""
+    if args.format:
+        print("error: --format runs after merge, not per shard", file=sys.stderr)
+        return 2
+    try:
+        part = shard.parse(args.shard)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"Rendering {shard.name(part)}: {len(shard.select(job_list, part))} of {len(job_list)} assets...")
+    start = time.perf_counter()
+    results, skipped, manifest_path = shard.run_shard(job_list, part, args.shard_dir, args.workers, args.force,
+                                                      runner=pipeline.run if args.pipeline else None)
+    render.print_report(results, time.perf_counter() - start, skipped)
+    print(f"  partial manifest written to {manifest_path}")
+    return 0
+
+
+def cmd_merge(args):
+    """Check the shard manifests for full coverage and assemble the final assets."""
+    manifests, problems = shard.merge(args.shard_dir, args.out, args.shards)
+    for problem in problems:
+        print(f"error: {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    shard.print_shards(manifests)
+    total = sum(len(m["jobs"]) for m in manifests.values())
+    out = args.out or os.path.join(args.shard_dir, "merged")
+    print(f"Merged {total} jobs from {len(manifests)} shards into {out}")
+    return 0
+
+
+def emit_variants(args, masters):
+    """Write the ``--format`` variants of ``masters`` and report the trade-offs."""
+    if not args.format:
+        return
+    start = time.perf_counter()
+    made, unavailable = variants.make_variants(masters, args.format, args.workers, args.target_ssim, args.force)
+    for fmt in unavailable:
+        print(f"warning: this Pillow build cannot write {fmt}; skipping it", file=sys.stderr)
+    print(f"Wrote {len(made)} variants in {time.perf_counter() - start:.2f}s"
+          f" (target SSIM {args.target_ssim or variants.TARGET_SSIM})")
+    variants.print_variants(made)
+
+
+def check_stable(job_list, workers, cache):
+    """Re-render cached outputs and report any whose bytes changed."""
+    unstable = 0
+    for name, recorded, new in render.check_stable(job_list, workers, cache):
+        status = "stable" if recorded == new else "CHANGED"
+        unstable += recorded != new
+        print(f"  {name}: {status} ({new[:12]})")
+    return 1 if unstable else 0
+
+
+def cmd_build(args):
+    """Build the release media listed in config.yaml."""
+    if args.watch:
+        # Preview renders go to their own directory, never over the release media
+        return watch.watch(lambda: [render.retarget(node.job, watch.PREVIEW_DIR)
+                                    for node in graph.build_graph(args.config, args.assets)],
+                           _watch_files(args.assets), args.workers or 1, args.port, args.force)
+    try:
+        nodes = graph.build_graph(args.config, args.assets)
+    except graph.BuildGraphError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.dry_run:
+        for i, wave in enumerate(graph.waves(nodes), 1):
+            print(f"Wave {i}: " + ", ".join(node.uri for node in wave))
+        return 0
+    if args.trace:
+        trace.enable(args.trace)
+    print(f"Building {len(nodes)} release media from {args.config}...")
+    start = time.perf_counter()
+    results, skipped = graph.build_all(nodes, args.workers, force=args.force)
+    render.print_report(results, time.perf_counter() - start, skipped)
+    emit_variants(args, [path for node in nodes for path in jobs.outputs(node.job)])
+    return 0
+
+
+def cmd_ingest(args):
+    """Crop, normalize and dedupe a directory of device captures, then frame the rest."""
+    start = time.perf_counter()
+    kept, dropped, reused = ingest.ingest(args.captures, args.workers, args.threshold, force=args.force)
+    print(f"Ingested {len(kept) + len(dropped)} captures in {time.perf_counter() - start:.2f}s"
+          f" ({reused} unchanged since the last run)")
+    for capture in kept:
+        left, top, right, bottom = capture.crop
+        print(f"  {os.path.basename(capture.path)}: {capture.size[0]}x{capture.size[1]},"
+              f" cropped {top}px top, {capture.size[1] - bottom}px bottom")
+    for capture, original, bits in dropped:
+        print(f"  {os.path.basename(capture.path)}: duplicate of {os.path.basename(original.path)}"
+              f" ({bits} bits apart)")
+    if args.dry_run:
+        return 0
+    job_list = jobs.ingested_jobs(kept, args.out)
+    print(f"Framing {len(job_list)} captures...")
+    start = time.perf_counter()
+    results, skipped = render.build(job_list, args.workers, force=args.force)
+    render.print_report(results, time.perf_counter() - start, skipped)
+    return 0
+
+
+def cmd_pack(args):
+    """Check, hash and zip the release media and files listed in config.yaml."""
+    try:
+        config = graph.load_config(args.config)
+    except graph.BuildGraphError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    scanned, errors, path = bundle.pack(config, os.path.dirname(os.path.abspath(args.config)), args.out,
+                                        args.workers, args.check)
+    total = sum(s.bytes for s in scanned)
+    print(f"Hashed {len(scanned)} files ({total / 1e6:.1f} MB) in {time.perf_counter() - start:.2f}s")
+    for s in scanned:
+        size = f"{s.header.width}x{s.header.height}" if s.header else ""
+        print(f"  {s.sha256[:12]}  {s.bytes:>10}  {size:>9}  {s.artifact.uri}")
+    for error in errors:
+        print(f"error: {error}", file=sys.stderr)
+    if errors:
+        return 1
+    if path:
+        print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB) and {bundle.MANIFEST_NAME}")
+    return 0
+
+
+def cmd_verify(args):
+    """Re-render every asset in memory and compare it with the goldens."""
+    locales = args.locale
+    if args.localized and not locales:
+        from screenshot_captions import LOCALES
+        locales = LOCALES
+    targets = verify.targets(args.assets or args.goldens, locales)
+    if args.update:
+        missing = fonts.missing_faces(locales)
+        if missing and not args.allow_fallback_fonts:
+            print(f"error: no font file for {', '.join(missing)}; goldens rendered with Pillow's built-in font"
+                  " would not match the design (see fonts/README.md, or pass --allow-fallback-fonts)",
+                  file=sys.stderr)
+            return 2
+        for path in verify.update(targets, args.goldens):
+            print(f"  updated {path}")
+        return 0
+    start = time.perf_counter()
+    results = verify.verify(targets, args.goldens, args.diff_dir, args.tile, args.tolerance, args.workers)
+    failed = 0
+    for r in results:
+        if r.status == "ok":
+            print(f"  ok       {r.name}")
+        elif r.status == "changed":
+            failed += 1
+            print(f"  CHANGED  {r.name}: {r.changed_tiles}/{r.tiles} tiles, {r.changed_pixels} pixels,"
+                  f" max delta {r.max_delta} -> {r.heatmap}")
+        else:
+            failed += 1
+            print(f"  {r.status.upper():<8} {r.name}")
+    print(f"{len(results) - failed}/{len(results)} match in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+def cmd_bench_frame(args):
+    """Time the framed-screenshot frame with and without the cached template."""
+    scratch, template = bench.bench_frame(args.repeat)
+    print(f"Frame from scratch:  {scratch * 1000:7.2f} ms")
+    print(f"Frame from template: {template * 1000:7.2f} ms  ({scratch / template:.1f}x faster)")
+    return 0
+
+
+def cmd_bench(args):
+    """Run the benchmark suite and compare it with the stored baseline."""
+    missing = fonts.missing_faces() if args.save_baseline and not args.allow_fallback_fonts else []
+    if missing:
+        print(f"error: no font file for {', '.join(missing)}; timings with Pillow's built-in font"
+              " are not a baseline (see fonts/README.md, or pass --allow-fallback-fonts)", file=sys.stderr)
+        return 2
+    try:
+        results = bench.run_suite(args.only, args.repeat)
+    except KeyError as e:
+        print(f"error: {e.args[0]}", file=sys.stderr)
+        return 2
+    bench.write_results(results, args.out)
+    baseline = bench.load_results(args.baseline) if os.path.exists(args.baseline) else None
+    comparable = baseline is not None and not bench.mismatch(results, baseline)
+
+    print(f"{'benchmark':<26} {'best':>10} {'median':>10} {'peak':>9} {'vs baseline':>12}")
+    for name, r in results["benchmarks"].items():
+        base = comparable and baseline["benchmarks"].get(name)
+        change = f"{(r['best_ms'] / base['best_ms'] - 1) * 100:+.0f}%" if base else "-"
+        print(f"{name:<26} {r['best_ms']:8.1f}ms {r['median_ms']:8.1f}ms {r['peak_mb']:7.1f}MB {change:>12}")
+    print(f"Results written to {args.out}")
+
+    if args.save_baseline:
+        bench.write_results(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        if args.ci:
+            print(f"error: no baseline at {args.baseline}; commit one made with --save-baseline", file=sys.stderr)
+            return 2
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    try:
+        regressions = bench.compare(results, baseline, args.threshold)
+    except ValueError as e:
+        print(f"{'error' if args.ci else 'not comparing'}: {e}; record one here with --save-baseline",
+              file=sys.stderr if args.ci else sys.stdout)
+        return 2 if args.ci else 0
+    if baseline["environment"] != results["environment"]:
+        print("warning: baseline was recorded with a different Python or Pillow version")
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name} {metric}: {old} -> {new}")
+    return 1 if regressions else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python3 -m assetgen",
+                                     description="Roaring Trades store asset tools.")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log font resolution and other details")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("render-all", help="render the icon, banner, editor's choice and screenshots")
+    p.add_argument("--workers", type=int, default=None,
+                   help="worker processes (default: one per CPU; 1 renders in-process)")
+    p.add_argument("--assets", default=None, help="directory holding the raw screenshots")
+    p.add_argument("--out", default=None, help="output directory (default: each script's own)")
+    p.add_argument("--localized", action="store_true",
+                   help="also render screenshot_<n>_<key>.<locale>.png for every locale")
+    p.add_argument("--locale", action="append", default=None,
+                   help="limit --localized to this locale (repeatable)")
+    p.add_argument("--multires", action="store_true",
+                   help="also render the launcher icon densities and banner sizes from supersampled masters")
+    p.add_argument("--hires", action="store_true",
+                   help="also render 2560x1600 tablet screenshots and the 3840x1920 promo art, in bands")
+    p.add_argument("--animated", action="store_true",
+                   help="also render animated previews: turning banner sunburst, caption reveals, screenshot tour")
+    p.add_argument("--animation-format", choices=sorted(animate.FORMATS), default="apng",
+                   help="container for --animated (default: apng)")
+    p.add_argument("--format", action="append", choices=sorted(variants.FORMATS), default=None,
+                   help="also write this format next to each PNG, at the smallest passing quality (repeatable)")
+    p.add_argument("--target-ssim", type=float, default=None,
+                   help=f"SSIM against the PNG a --format variant must reach (default {variants.TARGET_SSIM})")
+    p.add_argument("--pipeline", action="store_true",
+                   help="overlap decode, render and encode on threads instead of a process per job")
+    p.add_argument("--shard", default=None, metavar="I/N",
+                   help="render only shard I of N (by job name) into --shard-dir; combine them with merge")
+    p.add_argument("--shard-dir", default=shard.SHARD_DIR, help="shared directory for --shard outputs and manifests")
+    p.add_argument("--force", action="store_true", help="re-render even if outputs are up to date")
+    p.add_argument("--check-stable", action="store_true",
+                   help="re-render cached outputs to a scratch dir and compare their SHA-256")
+    p.add_argument("--trace", default=None, metavar="PATH",
+                   help="write per-stage spans to PATH (.csv, otherwise Chrome trace JSON)")
+    p.add_argument("--watch", action="store_true",
+                   help="re-render on every edit and serve a live preview in .asset-cache/preview")
+    p.add_argument("--port", type=int, default=watch.PORT, help="preview server port for --watch")
+    p.set_defaults(func=cmd_render_all)
+
+    p = sub.add_parser("merge", help="check that render-all --shard covered every job and assemble the outputs")
+    p.add_argument("--shard-dir", default=shard.SHARD_DIR, help="shared directory the shards wrote to")
+    p.add_argument("--out", default=None, help="final output directory (default: merged/ in --shard-dir)")
+    p.add_argument("--shards", type=int, default=None, help="merge only the N-way split (if several are present)")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("build", help="build the release media listed in config.yaml")
+    p.add_argument("--config", default=graph.DEFAULT_CONFIG, help="path to config.yaml")
+    p.add_argument("--assets", default=None,
+                   help="directory holding the raw screenshots (default: assets/ next to the config)")
+    p.add_argument("--workers", type=int, default=None,
+                   help="worker processes (default: one per CPU; 1 renders in-process)")
+    p.add_argument("--force", action="store_true", help="re-render even if outputs are up to date")
+    p.add_argument("--dry-run", action="store_true", help="print the build waves without rendering")
+    p.add_argument("--format", action="append", choices=sorted(variants.FORMATS), default=None,
+                   help="also write this format next to each PNG, at the smallest passing quality (repeatable)")
+    p.add_argument("--target-ssim", type=float, default=None,
+                   help=f"SSIM against the PNG a --format variant must reach (default {variants.TARGET_SSIM})")
+    p.add_argument("--trace", default=None, metavar="PATH",
+                   help="write per-stage spans to PATH (.csv, otherwise Chrome trace JSON)")
+    p.add_argument("--watch", action="store_true",
+                   help="re-render on every edit and serve a live preview in .asset-cache/preview")
+    p.add_argument("--port", type=int, default=watch.PORT, help="preview server port for --watch")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("ingest", help="crop, dedupe and frame a directory of raw device captures")
+    p.add_argument("captures", help="directory of raw captures")
+    p.add_argument("--out", default=None, help="output directory (framed files go in its ingested/)")
+    p.add_argument("--threshold", type=int, default=None,
+                   help=f"dHash bits within which captures are duplicates (default {ingest.THRESHOLD})")
+    p.add_argument("--workers", type=int, default=None,
+                   help="threads for ingesting and processes for framing (default: one per CPU)")
+    p.add_argument("--dry-run", action="store_true", help="report crops and duplicates without framing")
+    p.add_argument("--force", action="store_true", help="re-ingest and re-render unchanged captures")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("pack", help="check, hash and zip the release media and files in config.yaml")
+    p.add_argument("--config", default=graph.DEFAULT_CONFIG, help="path to config.yaml")
+    p.add_argument("--out", default=bundle.BUNDLE_DIR, help="where to write the manifest and zip")
+    p.add_argument("--workers", type=int, default=None, help="hashing threads (default: one per CPU)")
+    p.add_argument("--check", action="store_true", help="check and hash only, write nothing")
+    p.set_defaults(func=cmd_pack)
+
+    p = sub.add_parser("verify", help="re-render assets in memory and compare them with the goldens")
+    p.add_argument("--goldens", default=verify.GOLDEN_DIR, help="directory of golden PNGs (default: assets/)")
+    p.add_argument("--assets", default=None, help="directory holding the raw screenshots (default: --goldens)")
+    p.add_argument("--diff-dir", default=verify.DIFF_DIR, help="where to write heatmaps of failures")
+    p.add_argument("--tile", type=int, default=verify.TILE, help="tile edge in pixels")
+    p.add_argument("--tolerance", type=int, default=0,
+                   help="largest per-channel difference still counted as unchanged")
+    p.add_argument("--localized", action="store_true", help="also check screenshot_<n>_<key>.<locale>.png")
+    p.add_argument("--locale", action="append", default=None, help="check only this locale (repeatable)")
+    p.add_argument("--workers", type=int, default=None,
+                   help="worker processes (default: one per CPU; 1 checks in-process)")
+    p.add_argument("--update", action="store_true", help="write the current renders as the new goldens")
+    p.add_argument("--allow-fallback-fonts", action="store_true",
+                   help="let --update write goldens even where a face falls back to Pillow's built-in font")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("bench-frame", help="compare per-frame cost with and without the frame template")
+    p.add_argument("--repeat", type=int, default=20, help="iterations per variant (best time is kept)")
+    p.set_defaults(func=cmd_bench_frame)
+
+    p = sub.add_parser("bench", help="time every render function and stage against a baseline")
+    p.add_argument("--only", action="append", default=None, metavar="NAME",
+                   help="run only this benchmark (repeatable): " + ", ".join(bench.BENCHMARKS))
+    p.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    p.add_argument("--out", default=bench.RESULTS_PATH, help="where to write the JSON results")
+    p.add_argument("--baseline", default=bench.BASELINE_PATH, help="baseline JSON to compare with")
+    p.add_argument("--save-baseline", action="store_true",
+                   help="store these results as the baseline instead of comparing")
+    p.add_argument("--ci", action="store_true", default=bool(os.environ.get("CI")),
+                   help="fail when there is no baseline, or it is from another machine (default: on when $CI is set)")
+    p.add_argument("--allow-fallback-fonts", action="store_true",
+                   help="let --save-baseline record timings taken with Pillow's built-in font")
+    p.add_argument("--threshold", type=float, default=bench.THRESHOLD,
+                   help="fractional slowdown or memory growth that counts as a regression")
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(levelname)s %(name)s: %(message)s")
+    status = args.func(args)
+    # Written once per command, after every build it ran has collected its spans
+    if trace.enabled():
+        print(f"  trace written to {trace.save()}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Animated store previews built from changed rectangles.
+
+An animation here is a still composition with one part moving: the banner's
+sunburst turning, a screenshot caption fading in, one screenshot crossfading
+into the next. The static layers are rendered once. Every frame after the
+first redraws only the rectangle that moves and is stored as just that
+rectangle, painted over the previous frame: an APNG ``fdAT`` or a WebP
+``ANMF`` chunk (``encode.save_apng``, ``encode.save_animated_webp``). A
+frame identical to the one before it is not stored at all; the previous
+frame is shown longer instead.
+"""
+
+import os
+from collections import namedtuple
+
+from PIL import Image, ImageChops
+
+from assetgen.encode import save_animated_webp, save_apng
+
+FPS = int(os.environ.get("ASSETGEN_ANIMATION_FPS", "15"))
+# How long the end state of a transition is held, in milliseconds
+HOLD_MS = 1500
+FORMATS = {"apng": ".png", "webp": ".webp"}
+
+# ``image`` painted with its top-left corner at ``position`` for ``duration`` ms
+Frame = namedtuple("Frame", "image position duration")
+
+
+def frame_ms(fps=None):
+    return 1000 / (fps or FPS)
+
+
+def even_box(box):
+    """``box`` grown to start on even coordinates (WebP stores offsets halved)."""
+    x0, y0, x1, y1 = box
+    return x0 - x0 % 2, y0 - y0 % 2, x1, y1
+
+
+def changed_box(a, b):
+    """The smallest even-aligned box holding every pixel that differs, or None."""
+    box = ImageChops.difference(a, b).getbbox()
+    return even_box(box) if box else None
+
+
+def merge_holds(frames):
+    """Drop frames that repeat the one before, adding their time to it."""
+    merged = []
+    for frame in frames:
+        if merged and frame.image is None:
+            merged[-1] = merged[-1]._replace(duration=merged[-1].duration + frame.duration)
+        else:
+            merged.append(frame)
+    return merged
+
+
+def fade(base, layer, box, steps, duration, hold=HOLD_MS):
+    """Frames fading the RGBA ``layer`` (canvas-sized) in over ``base`` inside ``box``.
+
+    The last step shows the layer fully, held for ``hold`` ms.
+    """
+    patch, over = base.crop(box), layer.crop(box)
+    alpha = over.getchannel("A")
+    frames = []
+    for k in range(1, steps + 1):
+        step = patch.copy()
+        step.paste(over.convert(base.mode), (0, 0), alpha.point(lambda a, t=k / steps: round(a * t)))
+        frames.append(Frame(step, box[:2], hold if k == steps else duration))
+    return frames
+
+
+def crossfade(a, b, steps, duration, hold=HOLD_MS):
+    """Frames blending canvas ``a`` into canvas ``b``, only where they differ."""
+    box = changed_box(a, b)
+    if box is None:
+        return [Frame(None, (0, 0), hold)]
+    pa, pb = a.crop(box), b.crop(box)
+    return [Frame(Image.blend(pa, pb, k / steps), box[:2], hold if k == steps else duration)
+            for k in range(1, steps + 1)]
+
+
+def output_name(name, fmt):
+    """``name`` with the file extension of ``fmt`` ("apng" or "webp")."""
+    return os.path.splitext(name)[0] + FORMATS[fmt]
+
+
+def save_animation(path, frames, loops=0):
+    """Write ``frames`` (the first one whole) as APNG or WebP, by ``path``'s extension."""
+    frames = merge_holds(frames)
+    first = frames[0].image
+    save = save_animated_webp if path.endswith(".webp") else save_apng
+    return save(path, first.size, first.mode, [tuple(f) for f in frames], loops)
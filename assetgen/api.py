@@ -0,0 +1,108 @@
+"""In-memory rendering: the store assets as images or PNG buffers.
+
+The functions here take the render parameters (output size, captions,
+palette) and return ``PIL.Image`` objects or encoded PNG bytes. Nothing is
+read or written unless a path is passed in; the build and the command line
+wrap the same render functions and add only the file writing. ::
+
+    from assetgen import api
+    data = api.banner_png(2400, palette=api.PALETTE._replace(gold=(200, 200, 210)))
+    api.info(data)  # PngHeader(width=2400, height=1200, bit_depth=8, color_type=2)
+
+Sizes large enough to be rendered in bands (see ``assetgen.encode.banded``)
+are streamed from the bands straight into the PNG buffer by the ``*_png``
+functions, so only the encoded bytes are ever held in full.
+"""
+
+import io
+
+from PIL import Image
+
+from assetgen.encode import banded, encode_png, encode_png_bands, png_header
+from assetgen.palette import PALETTE, Palette  # noqa: F401  (re-exported for callers)
+
+
+def icon(size=512, layer="full", palette=None):
+    """The app icon at ``size``; ``layer`` as in ``create_assets.render_icon``."""
+    import create_assets
+
+    return create_assets.render_icon(size, layer, palette)
+
+
+def banner(width=1200, palette=None):
+    """The banner at ``width`` x ``width // 2``, drawn at that size."""
+    import create_assets
+
+    return create_assets.render_banner(width, palette=palette)
+
+
+def editors_choice(size=1200, palette=None):
+    """The editor's-choice graphic, drawn at ``size`` x ``size``."""
+    import create_assets
+
+    return create_assets.render_editors_choice(size, palette)
+
+
+def _capture(raw):
+    """An image from a path, an encoded buffer or an image.
+
+    A path or buffer is decoded into a copy and closed again, so no file
+    handle outlives the call.
+    """
+    if isinstance(raw, Image.Image):
+        return raw
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = io.BytesIO(raw)
+    with Image.open(raw) as im:
+        return im.copy()
+
+
+def _fitted(raw, size):
+    import format_screenshots
+
+    return format_screenshots.fit_screenshot(_capture(raw), size)
+
+
+def screenshot(raw, caption, subtitle=None, locale=None, size=None, palette=None):
+    """A framed store screenshot of the capture ``raw`` (a path, PNG/JPEG bytes or an image).
+
+    ``size`` defaults to the phone layout. The capture is resized in memory,
+    not through the build's disk-backed resize cache.
+    """
+    import format_screenshots
+
+    size = size or (format_screenshots.OUT_W, format_screenshots.OUT_H)
+    resized, rect = _fitted(raw, size)
+    return format_screenshots.compose_screenshot(resized, rect, caption, subtitle, locale, size, palette)
+
+
+def png_bytes(img, effort=None, min_psnr=None):
+    """``img`` encoded with ``assetgen.encode``'s smallest acceptable PNG."""
+    return encode_png(img, effort, min_psnr)[0]
+
+
+def banner_png(width=1200, palette=None):
+    """``banner(width)`` as PNG bytes, streamed from bands at large widths."""
+    import create_assets
+
+    size = (width, create_assets._scaler(width / 1200)(600))
+    if banded(size):
+        return encode_png_bands(size, "RGB", create_assets.banner_bands(width, palette))
+    return png_bytes(banner(width, palette))
+
+
+def screenshot_png(raw, caption, subtitle=None, locale=None, size=None, palette=None):
+    """``screenshot(...)`` as PNG bytes, streamed from bands at large sizes."""
+    import format_screenshots
+
+    size = size or (format_screenshots.OUT_W, format_screenshots.OUT_H)
+    if not banded(size):
+        return png_bytes(screenshot(raw, caption, subtitle, locale, size, palette))
+    resized, rect = _fitted(raw, size)
+    bands = format_screenshots.screenshot_bands(resized, rect, caption, subtitle, locale, size, palette)
+    return encode_png_bands(size, "RGB", bands)
+
+
+def info(data):
+    """Width, height, bit depth and color type of a PNG buffer or path, from its header."""
+    return png_header(data)
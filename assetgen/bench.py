@@ -0,0 +1,307 @@
+"""Micro-benchmarks and the regression benchmark suite for the asset generators.
+
+``run_suite`` times every render function and the stages they are built
+from (gradient, primitives, text, resize, encode). Each benchmark runs in a
+fresh process so its peak RSS is its own, and uses only the repo's four raw
+screenshots in ``assets/`` and whatever fonts resolve on this machine (the
+resolved fonts are recorded with the results, since they change timings).
+``compare`` checks results against the baseline committed in
+``bench/baseline.json``, and refuses when that was recorded on another
+machine, CPU count, font set or encoder setting.
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from assetgen.cache import CACHE_DIR, ROOT, write_json
+from assetgen.trace import max_rss_mb
+
+RESULTS_PATH = os.path.join(CACHE_DIR, "bench", "latest.json")
+BASELINE_PATH = os.path.join(ROOT, "bench", "baseline.json")
+
+# A benchmark regresses when it is more than THRESHOLD slower (or larger)
+# than the baseline and also past the absolute floor, so timer noise on
+# millisecond stages does not fail the run.
+THRESHOLD = 0.25
+MIN_REGRESSION_MS = 2.0
+MIN_REGRESSION_MB = 8.0
+# Environment entries that must match the baseline's for timings to compare
+COMPARABLE = ("machine", "cpus", "fonts", "encode")
+
+
+def _best_of(fn, repeat):
+    """Best wall time of ``repeat`` calls, in seconds."""
+    return min(_timings(fn, repeat))
+
+
+def _timings(fn, repeat):
+    """Wall time of each of ``repeat`` calls, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_frame(repeat=20):
+    """Compare drawing the screenshot frame from scratch with copying the template.
+
+    Both variants include the caption step, which runs for every screenshot
+    either way. Returns ``(scratch_seconds, template_seconds)`` per frame.
+    """
+    import format_screenshots as fs
+
+    size = (fs.OUT_W, fs.OUT_H)
+    rect = fs.screenshot_rect((1200, 2670), size)
+    caption, subtitle = fs.SCREENSHOTS[0][2], fs.SCREENSHOTS[0][3]
+
+    def scratch():
+        fs.draw_captions(fs.render_frame(size, True, rect), caption, subtitle)
+
+    def template():
+        fs.draw_captions(fs.frame_template(size, True, rect).copy(), caption, subtitle)
+
+    template()  # warm the template cache and the fonts
+    return _best_of(scratch, repeat), _best_of(template, repeat)
+
+
+def _screenshots():
+    """``(raw_path, caption, subtitle)`` for each of the raw screenshots."""
+    import format_screenshots as fs
+    return [(os.path.join(fs.ASSETS, raw), caption, subtitle) for raw, _, caption, subtitle in fs.SCREENSHOTS]
+
+
+# Each benchmark below does its setup and returns the zero-argument callable
+# that is timed. ``scratch`` is a temporary output directory.
+
+def _function_icon(scratch):
+    import create_assets
+    return lambda: create_assets.create_icon(scratch)
+
+
+def _function_banner(scratch):
+    import create_assets
+    return lambda: create_assets.create_banner(scratch)
+
+
+def _function_editors_choice(scratch):
+    import create_assets
+    return lambda: create_assets.create_editors_choice(scratch)
+
+
+def _function_framed_screenshot(scratch):
+    import format_screenshots as fs
+    from assetgen.resize_cache import RESIZE_CACHE
+
+    RESIZE_CACHE.cache_dir = None  # decode and resize for real on every run
+
+    def run():
+        RESIZE_CACHE.clear()
+        for raw, caption, subtitle in _screenshots():
+            fs.create_framed_screenshot(raw, "bench.png", caption, subtitle, scratch)
+    return run
+
+
+def _function_tablet_screenshot(scratch):
+    import format_screenshots as fs
+    from assetgen.resize_cache import RESIZE_CACHE
+
+    RESIZE_CACHE.cache_dir = None
+
+    def run():
+        RESIZE_CACHE.clear()
+        for raw, caption, subtitle in _screenshots():
+            fs.create_framed_screenshot(raw, "bench.png", caption, subtitle, scratch, size=fs.TABLET_SIZE)
+    return run
+
+
+def _function_promo(scratch):
+    import create_assets
+    return lambda: create_assets.create_promo(scratch)
+
+
+def _stage_gradient(scratch):
+    import format_screenshots as fs
+    from assetgen.gradients import vertical_gradient
+    return lambda: vertical_gradient((fs.OUT_W, fs.OUT_H), fs.CHARCOAL, fs.DEEP_BG)
+
+
+def _stage_primitives(scratch):
+    from PIL import Image
+
+    import create_assets as ca
+    from assetgen import primitives
+
+    img = Image.new("RGB", (1200, 1200))
+
+    def run():
+        primitives.sunburst(img, (600, 600), 520, (35, 35, 60), num_rays=60, width=1)
+        primitives.fan(img, (600, 40), 35, ca.GOLD, num_rays=13, width=2, direction="up")
+        primitives.diamonds(img, [(120 + dx, 90) for dx in range(0, 960, 40)], 4, ca.GOLD)
+        primitives.ring(img, (600, 530), 110, ca.GOLD)
+    return run
+
+
+def _stage_text(scratch):
+    import format_screenshots as fs
+
+    size = (fs.OUT_W, fs.OUT_H)
+    frame = fs.frame_template(size, True, fs.screenshot_rect((1200, 2670), size))
+
+    def run():
+        for _, caption, subtitle in _screenshots():
+            fs.draw_captions(frame.copy(), caption, subtitle)
+    return run
+
+
+def _stage_resize(scratch):
+    from PIL import Image
+
+    import format_screenshots as fs
+    from assetgen.resize_cache import ResizeCache
+
+    rects = []
+    for raw, _, _ in _screenshots():
+        with Image.open(raw) as img:
+            rects.append((raw, fs.screenshot_rect(img.size)))
+
+    def run():
+        cache = ResizeCache()
+        for raw, rect in rects:
+            cache.resize(raw, rect[2:], Image.LANCZOS)
+    return run
+
+
+def _stage_encode(scratch):
+    from PIL import Image
+
+    import format_screenshots as fs
+    from assetgen.encode import encode_png
+    from assetgen.resize_cache import ResizeCache
+
+    images = []
+    for raw, caption, subtitle in _screenshots():
+        with Image.open(raw) as img:
+            rect = fs.screenshot_rect(img.size)
+        resized = ResizeCache().resize(raw, rect[2:], Image.LANCZOS)
+        images.append(fs.compose_screenshot(resized, rect, caption, subtitle))
+
+    def run():
+        for img in images:
+            encode_png(img)
+    return run
+
+
+# name -> (kind, factory)
+BENCHMARKS = {
+    "create_icon": ("function", _function_icon),
+    "create_banner": ("function", _function_banner),
+    "create_editors_choice": ("function", _function_editors_choice),
+    "create_framed_screenshot": ("function", _function_framed_screenshot),
+    "create_tablet_screenshot": ("function", _function_tablet_screenshot),
+    "create_promo": ("function", _function_promo),
+    "gradient": ("stage", _stage_gradient),
+    "primitives": ("stage", _stage_primitives),
+    "text": ("stage", _stage_text),
+    "resize": ("stage", _stage_resize),
+    "encode": ("stage", _stage_encode),
+}
+
+
+def _measure(name, repeat):
+    """Run one benchmark in this (fresh) process: warm up once, then time it."""
+    import create_assets  # noqa: F401  (imports are not part of the peak)
+    import format_screenshots  # noqa: F401
+
+    kind, factory = BENCHMARKS[name]
+    base_rss = max_rss_mb()
+    with tempfile.TemporaryDirectory() as scratch, contextlib.redirect_stdout(io.StringIO()):
+        fn = factory(scratch)
+        fn()  # warm fonts, templates and imports
+        times = _timings(fn, repeat)
+    return {
+        "kind": kind,
+        "repeat": repeat,
+        "best_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "peak_mb": round(max_rss_mb() - base_rss, 1),
+    }
+
+
+def environment():
+    """What the timings depend on besides the code."""
+    from assetgen import encode, fonts
+    import PIL
+
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        # Only the faces the benchmarks draw with
+        "fonts": {face: os.path.basename(path) if path else None
+                  for face, path in fonts.font_files().items() if face in ("serif", "serif-bold")},
+        "encode": encode.settings(),
+    }
+
+
+def run_suite(names=None, repeat=5):
+    """Run the named benchmarks (default: all), each in its own process."""
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise KeyError("unknown benchmark(s): " + ", ".join(unknown))
+    results = {}
+    spawn = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            results[name] = pool.submit(_measure, name, repeat).result()
+    return {"environment": environment(), "benchmarks": results}
+
+
+def write_results(results, path=RESULTS_PATH):
+    write_json(path, results)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def mismatch(results, baseline):
+    """The ``COMPARABLE`` environment entries that differ from the baseline's."""
+    ours, theirs = results["environment"], baseline["environment"]
+    return [key for key in COMPARABLE if ours.get(key) != theirs.get(key)]
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Return ``(name, metric, baseline, current)`` for every regression.
+
+    Raises ``ValueError`` if the baseline was recorded on a different
+    machine, CPU count, fonts or encoder settings, where timings say nothing.
+    """
+    different = mismatch(results, baseline)
+    if different:
+        old, new = baseline["environment"], results["environment"]
+        raise ValueError("baseline was recorded with different " + ", ".join(
+            key if isinstance(new.get(key), dict) else f"{key} (baseline {old.get(key)}, here {new.get(key)})"
+            for key in different))
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if not base:
+            continue
+        for metric, floor in [("best_ms", MIN_REGRESSION_MS), ("peak_mb", MIN_REGRESSION_MB)]:
+            old, new = base[metric], current[metric]
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append((name, metric, old, new))
+    return regressions
@@ -0,0 +1,164 @@
+"""Release bundle: check, hash and pack the files config.yaml publishes.
+
+``pack`` reads the ``release.media`` and ``release.files`` entries of
+config.yaml, then:
+
+1. Reads every artifact once, on a thread pool, and takes its SHA-256 and,
+   for PNGs, the dimensions from the IHDR chunk at the start of the same
+   read. Small files are read in fixed-size chunks. Files of at least
+   ``MMAP_BYTES`` (the APK) are memory-mapped and hashed a chunk at a time
+   from the mapping, which skips the copy into Python buffers. ``hashlib``
+   releases the GIL on large updates, so the threads hash in parallel.
+2. Checks that each file exists and that each PNG has the dimensions its
+   purpose needs (``DIMENSIONS``) and the ``_<w>x<h>`` in its name, if any.
+3. Writes ``manifest.json`` (purpose, URI, bytes, SHA-256, dimensions) and a
+   zip of the artifacts plus the manifest. PNGs and APKs are already
+   compressed, so they are stored as is instead of being deflated again.
+   Entries carry a fixed timestamp, so the same inputs give the same zip.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from assetgen.cache import CACHE_DIR, write_json
+from assetgen.encode import png_header
+
+BUNDLE_DIR = os.path.join(CACHE_DIR, "release")
+CHUNK_BYTES = 1 << 20
+MMAP_BYTES = 4 << 20
+BUNDLE_NAME = "release-bundle.zip"
+MANIFEST_NAME = "manifest.json"
+# Stored without compression: these formats are compressed already
+STORED = (".png", ".apk", ".jpg", ".jpeg", ".webp", ".zip")
+# Zip entry timestamp, so identical inputs give an identical archive
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+# purpose -> ("exact" or "min", (width, height))
+DIMENSIONS = {
+    "icon": ("exact", (512, 512)),
+    "banner": ("exact", (1200, 600)),
+    "screenshot": ("min", (1080, 1080)),
+}
+
+# One file to publish. section: "media" or "files"
+Artifact = namedtuple("Artifact", "section purpose uri path")
+# What reading it found; header is a PngHeader for PNGs, else None
+Scanned = namedtuple("Scanned", "artifact bytes sha256 header")
+
+
+def artifacts(config, base):
+    """The ``release.media`` and ``release.files`` entries, in file order."""
+    release = config.get("release") or {}
+    found, seen = [], set()
+    for section in ("media", "files"):
+        for entry in release.get(section) or []:
+            uri = entry.get("uri")
+            if uri and uri not in seen:
+                seen.add(uri)
+                found.append(Artifact(section, entry.get("purpose"), uri, os.path.join(base, uri)))
+    return found
+
+
+def _header(head):
+    try:
+        return png_header(head)
+    except ValueError:
+        return None
+
+
+def scan(artifact):
+    """Read ``artifact`` once: its size, SHA-256 and PNG header."""
+    h = hashlib.sha256()
+    size = os.path.getsize(artifact.path)
+    with open(artifact.path, "rb") as f:
+        if size >= MMAP_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                head = bytes(view[:26])
+                for start in range(0, size, CHUNK_BYTES):
+                    h.update(view[start:start + CHUNK_BYTES])
+                view.release()
+        else:
+            block = f.read(CHUNK_BYTES)
+            head = block[:26]
+            while block:
+                h.update(block)
+                block = f.read(CHUNK_BYTES)
+    return Scanned(artifact, size, h.hexdigest(), _header(head))
+
+
+def problems(scanned):
+    """What is wrong with a scanned artifact, as a list of messages."""
+    artifact, header = scanned.artifact, scanned.header
+    if not artifact.uri.lower().endswith(".png"):
+        return []
+    if header is None:
+        return [f"{artifact.uri}: not a PNG"]
+    found = []
+    size = (header.width, header.height)
+    rule = DIMENSIONS.get(artifact.purpose)
+    if rule and rule[0] == "exact" and size != rule[1]:
+        found.append(f"{artifact.uri}: {artifact.purpose} must be {rule[1][0]}x{rule[1][1]}, is {size[0]}x{size[1]}")
+    if rule and rule[0] == "min" and (size[0] < rule[1][0] or size[1] < rule[1][1]):
+        found.append(f"{artifact.uri}: {artifact.purpose} must be at least {rule[1][0]}x{rule[1][1]},"
+                     f" is {size[0]}x{size[1]}")
+    named = re.search(r"_(\d+)x(\d+)\.png$", artifact.uri)
+    if named and (int(named.group(1)), int(named.group(2))) != size:
+        found.append(f"{artifact.uri}: named {named.group(1)}x{named.group(2)}, is {size[0]}x{size[1]}")
+    return found
+
+
+def manifest(scanned):
+    """The manifest as a JSON-ready dict."""
+    entries = []
+    for s in scanned:
+        entry = {"section": s.artifact.section, "purpose": s.artifact.purpose, "uri": s.artifact.uri,
+                 "bytes": s.bytes, "sha256": s.sha256}
+        if s.header:
+            entry.update(width=s.header.width, height=s.header.height)
+        entries.append(entry)
+    return {"artifacts": entries}
+
+
+def write_zip(path, scanned, manifest_data):
+    """The artifacts under their URIs plus ``manifest.json``, written atomically."""
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w") as z:
+        for s in scanned:
+            info = zipfile.ZipInfo(s.artifact.uri, ZIP_DATE)
+            stored = s.artifact.uri.lower().endswith(STORED)
+            info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            with open(s.artifact.path, "rb") as src, z.open(info, "w") as dst:
+                for block in iter(lambda: src.read(CHUNK_BYTES), b""):
+                    dst.write(block)
+        info = zipfile.ZipInfo(MANIFEST_NAME, ZIP_DATE)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        z.writestr(info, manifest_data)
+    os.replace(tmp, path)
+
+
+def pack(config, base, out_dir, workers=None, check_only=False):
+    """Check and hash every artifact; unless ``check_only``, write the manifest and zip.
+
+    Returns ``(scanned, errors, bundle_path)``; nothing is written when there
+    are errors.
+    """
+    found = artifacts(config, base)
+    missing = [a for a in found if not os.path.isfile(a.path)]
+    errors = [f"{a.uri}: missing" for a in missing]
+    present = [a for a in found if a not in missing]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        scanned = list(pool.map(scan, present))
+    for s in scanned:
+        errors += problems(s)
+    if errors or check_only:
+        return scanned, errors, None
+    data = write_json(os.path.join(out_dir, MANIFEST_NAME), manifest(scanned))
+    bundle_path = os.path.join(out_dir, BUNDLE_NAME)
+    write_zip(bundle_path, scanned, data)
+    return scanned, errors, bundle_path
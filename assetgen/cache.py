@@ -0,0 +1,185 @@
+"""Content-addressed incremental build cache for generated assets.
+
+Every job is keyed by a hash of everything that can change its output: the
+bytes of any input file it reads, its arguments (captions, subtitles, output
+names), the resolved font files, the PNG encoder settings, the source of the
+assetgen modules its script draws with, and the source and values of the
+script-level functions and constants its render function actually reaches.
+Editing one function or constant in a generator script therefore only
+invalidates the jobs that use it. A job whose key and output file both still
+match the manifest is skipped. The manifest also records the SHA-256 of each
+output, so a forced re-render can confirm the PNG encoder is byte-stable.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+
+import PIL
+
+from assetgen import encode, fonts
+from assetgen.jobs import outputs
+
+# Bump to evict every cached entry after a change the keys cannot see.
+CACHE_VERSION = 3
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("ASSETGEN_CACHE_DIR", os.path.join(ROOT, ".asset-cache"))
+
+_CHUNK = 1 << 20
+_digests = {}
+
+
+def write_json(path, data, indent=1):
+    """Write ``data`` to ``path`` as sorted-key JSON, atomically; returns the text.
+
+    The temporary file is named per process and thread, so concurrent writers
+    of the same path never share one; the last rename wins.
+    """
+    text = json.dumps(data, indent=indent, sort_keys=True) + "\n"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return text
+
+
+def file_digest(path):
+    """SHA-256 of a file, read in fixed-size chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def input_digest(path):
+    """``file_digest`` memoized on (path, size, mtime) for repeated inputs."""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if memo_key not in _digests:
+        _digests[memo_key] = file_digest(path)
+    return _digests[memo_key]
+
+
+def _source_with_defaults(func):
+    """Source plus evaluated defaults, which may come from module constants."""
+    return inspect.getsource(func) + repr((func.__defaults__, func.__kwdefaults__))
+
+
+def _function_sources(module, func):
+    """Source of ``func`` and of the module-level functions and values it reaches.
+
+    Follows the global names used by each function's code (and by any nested
+    function or lambda) within ``module``; imported modules and objects from
+    assetgen are covered by ``_code_sources`` instead.
+    """
+    parts = {func.__name__: _source_with_defaults(func)}
+    namespace = vars(module)
+    seen, stack = set(), [func.__code__]
+    while stack:
+        code = stack.pop()
+        stack.extend(const for const in code.co_consts if inspect.iscode(const))
+        for name in code.co_names:
+            if name in seen or name not in namespace:
+                continue
+            seen.add(name)
+            value = inspect.unwrap(namespace[name]) if callable(namespace[name]) else namespace[name]
+            if inspect.isfunction(value) and value.__module__ == module.__name__:
+                parts[name] = _source_with_defaults(value)
+                stack.append(value.__code__)
+            elif isinstance(value, (int, float, str, tuple, list, dict)):
+                parts[name] = repr(value)
+    return parts
+
+
+def _font_files():
+    """Digests of the font files the generators resolve on this machine."""
+    return {face: input_digest(path) if path else None for face, path in fonts.font_files().items()}
+
+
+def _code_sources(module):
+    """Source of ``module`` and, transitively, the assetgen modules it uses."""
+    seen, stack, sources = set(), [module], {}
+    while stack:
+        mod = stack.pop()
+        if mod.__name__ in seen:
+            continue
+        seen.add(mod.__name__)
+        sources[mod.__name__] = inspect.getsource(mod)
+        for value in vars(mod).values():
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+            if isinstance(name, str) and name.startswith("assetgen.") and name in sys.modules:
+                stack.append(sys.modules[name])
+    return sources
+
+
+def file_args(job):
+    """Arguments that name existing input files (e.g. raw screenshots)."""
+    values = list(job.args) + [v for _, v in sorted(job.kwargs.items())]
+    return [v for v in values if isinstance(v, str) and os.path.isfile(v)]
+
+
+def job_key(job):
+    """Hash every input that can affect a job's output."""
+    module = importlib.import_module(job.module)
+    func = getattr(module, job.func)
+    parts = {
+        "call": [job.module, job.func, repr(job.args), repr(sorted(job.kwargs.items()))],
+        "fonts": _font_files(),
+        "encode": encode.settings(),
+        "function": _function_sources(module, func),
+        "code": {name: source for name, source in _code_sources(module).items() if name != module.__name__},
+        "files": {path: input_digest(path) for path in file_args(job)},
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class BuildCache:
+    """Manifest of job keys and output digests, stored as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "build.json")
+        self.stamp = {"version": CACHE_VERSION, "pillow": PIL.__version__}
+        self.entries = {}
+        self.evicted = False
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("stamp") == self.stamp:
+                self.entries = data.get("entries", {})
+            else:
+                # Cache format or encoder changed: every entry is suspect.
+                self.evicted = True
+
+    def lookup(self, job):
+        return self.entries.get(os.path.abspath(outputs(job)[0]))
+
+    def is_fresh(self, job, key):
+        """True if every output of the job exists and was built from ``key``."""
+        entry = self.lookup(job)
+        if not entry or entry["key"] != key:
+            return False
+        for path in outputs(job):
+            recorded = entry["outputs"].get(os.path.abspath(path))
+            if not recorded or not os.path.isfile(path) or file_digest(path) != recorded["sha256"]:
+                return False
+        return True
+
+    def record(self, job, key):
+        """Remember the key and digests of a job's freshly written outputs."""
+        self.entries[os.path.abspath(outputs(job)[0])] = {
+            "job": job.name,
+            "key": key,
+            "outputs": {os.path.abspath(path): {"sha256": file_digest(path),
+                                                "bytes": os.path.getsize(path)}
+                        for path in outputs(job)},
+        }
+
+    def save(self):
+        write_json(self.path, {"stamp": self.stamp, "entries": self.entries})
@@ -0,0 +1,113 @@
+"""Layered compositing for the framed screenshots.
+
+A screenshot is a stack of named layers, bottom to top: background, frame
+ornaments, device bezel, the screenshot itself and its caption. Each layer is
+an image at a canvas position; RGBA layers are composited "over" through
+their alpha, RGB layers replace what is under them. ``flatten`` composites a
+stack in one pass, optionally for just a band of rows, so band-by-band
+rendering (see ``assetgen.encode.banded``) goes through the same code.
+
+Static layers (everything but the screenshot and caption) are flattened once
+per layout and shared; what changes per screenshot and locale is composited
+on top. Device masks, the anti-aliased rounded-corner shapes of the screen
+and its bezel, are cached per device profile and screen size.
+"""
+
+import functools
+from collections import namedtuple
+
+from PIL import Image, ImageChops, ImageDraw
+
+from assetgen.primitives import SUPERSAMPLE
+
+# One layer: ``image`` with its top-left corner at ``position`` on the canvas,
+# seen through ``mask`` (an L image of the same size) if one is given.
+# ``image`` may also be a color, which fills the mask.
+Layer = namedtuple("Layer", "name image position mask", defaults=(None,))
+
+# How a screenshot is mounted: screen corners rounded to ``corner`` times the
+# screen width, inside a ``bezel``-pixel ring of ``color`` with a one-pixel
+# ``edge`` line where it meets the screen.
+DeviceProfile = namedtuple("DeviceProfile", "name corner bezel color edge")
+
+
+@functools.lru_cache(maxsize=64)
+def rounded_mask(size, radius):
+    """An anti-aliased L mask of a ``size`` rectangle with corners of ``radius``.
+
+    Only the corners are supersampled: a circle of ``radius``, split into
+    quarters and pasted into an opaque rectangle.
+    """
+    w, h = size
+    mask = Image.new("L", size, 255)
+    r = min(radius, w // 2, h // 2)
+    if r <= 0:
+        return mask
+    f = SUPERSAMPLE
+    circle = Image.new("L", (2 * r * f, 2 * r * f), 0)
+    ImageDraw.Draw(circle).ellipse([0, 0, 2 * r * f - 1, 2 * r * f - 1], fill=255)
+    circle = circle.reduce(f)
+    for cx, cy in [(0, 0), (r, 0), (0, r), (r, r)]:
+        corner = circle.crop((cx, cy, cx + r, cy + r))
+        mask.paste(corner, (0 if cx == 0 else w - r, 0 if cy == 0 else h - r))
+    return mask
+
+
+def corner_radius(profile, screen_size):
+    return round(profile.corner * screen_size[0])
+
+
+def bezel_layers(profile, rect):
+    """The bezel around the screen at ``rect``: a ring of ``profile.color``
+    with an ``edge`` line just outside the screen. Both are fills through cached
+    masks, so they cost no image memory of their own."""
+    x, y, w, h = rect
+    b = profile.bezel
+    r = corner_radius(profile, (w, h))
+    return [Layer("bezel", profile.color, (x - b, y - b), rounded_mask((w + 2 * b, h + 2 * b), r + b)),
+            Layer("bezel edge", profile.edge, (x - 1, y - 1), rounded_mask((w + 2, h + 2), r + 1))]
+
+
+def screen_layer(profile, image, position):
+    """The screenshot seen through the profile's rounded screen corners.
+
+    ``image`` is used as is (it may be shared, e.g. from the resize cache).
+    """
+    mask = rounded_mask(image.size, corner_radius(profile, image.size))
+    if image.mode == "RGBA":
+        mask = ImageChops.multiply(mask, image.getchannel("A"))
+        image = image.convert("RGB")
+    return Layer("screenshot", image, position, mask)
+
+
+def flatten(layers, size, rows=None, mode="RGB"):
+    """Composite ``layers`` bottom to top onto a new ``mode`` canvas of ``size``.
+
+    ``rows=(top, bottom)`` returns just that band, compositing only the part
+    of each layer inside it.
+    """
+    top, bottom = rows or (0, size[1])
+    out = Image.new(mode, (size[0], bottom - top))
+    for layer in layers:
+        img, mask = layer.image, layer.mask
+        fill = not isinstance(img, Image.Image)
+        w, h = (mask if fill else img).size
+        x, y = layer.position
+        y0, y1 = max(y, top), min(y + h, bottom)
+        if y0 >= y1:
+            continue
+        if (y0, y1) != (y, y + h):
+            box = (0, y0 - y, w, y1 - y)
+            img = img if fill else img.crop(box)
+            mask = mask.crop(box) if mask is not None else None
+        if fill:
+            out.paste(tuple(img), (x, y0 - top, x + w, y1 - top), mask)
+        elif mask is not None:
+            out.paste(img, (x, y0 - top), mask)
+        elif img.mode != "RGBA":
+            out.paste(img, (x, y0 - top))
+        elif mode == "RGBA":
+            out.alpha_composite(img, (x, y0 - top))
+        else:
+            out.paste(img, (x, y0 - top), img)
+    return out
@@ -0,0 +1,426 @@
+"""PNG encoding stage shared by the generators.
+
+``img.save(path, "PNG")`` uses zlib level 6 with the default strategy, which
+is rarely the smallest file. ``save_png`` encodes the image with several
+settings at once (zlib levels and strategies, Pillow's ``optimize`` pass,
+and a palette version when one is lossless or close enough), keeps the
+smallest result and writes it atomically. Candidates encode on a thread
+pool; Pillow releases the GIL while compressing. Process pool workers and
+the pipeline's encode threads each get their share of the CPUs for it
+(``share_cpus``), so concurrent encoders do not oversubscribe the machine.
+
+The search is tuned with environment variables:
+
+``ASSETGEN_PNG_EFFORT``
+    0 writes a single default save, 1 (default) adds zlib level 9 with the
+    default and filtered strategies, 2 tries every level from 6 and every
+    strategy plus ``optimize``. Effort 1 and up also try an exact palette
+    version of images with at most 256 colors. ``watch`` previews drop to
+    0, since they are rebuilt on every edit and never shipped.
+``ASSETGEN_PNG_MIN_PSNR``
+    Accept a 256-color palette version if its PSNR against the original is at
+    least this many dB. Unset, only lossless candidates are kept.
+``ASSETGEN_MAX_CANVAS_MB``, ``ASSETGEN_BAND_MB``
+    Generators render canvases larger than the first (default 8 MB of
+    pixels) as bands of about the second (default 1 MB) each, written with
+    ``save_png_bands``. This caps a job's canvas memory whatever the output
+    size.
+
+``save_png_bands`` is the bounded-memory alternative for images rendered as
+horizontal bands: each band is filtered and fed to one zlib stream as it
+arrives, so neither the whole image nor its encodings are ever held at once.
+It picks the None, Sub or Up row filter per band (by the usual
+minimum-sum-of-absolute-differences heuristic) and uses a single zlib setting
+instead of the search.
+
+``save_apng`` and ``save_animated_webp`` write animations whose frames after
+the first are only the rectangles that changed (see ``assetgen.animate``).
+"""
+
+import io
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageChops, ImageStat
+
+from assetgen import trace
+
+# zlib strategies, passed to Pillow as ``compress_type``
+Z_DEFAULT, Z_FILTERED, Z_HUFFMAN_ONLY, Z_RLE = 0, 1, 2, 3
+
+PNG_EFFORT = int(os.environ.get("ASSETGEN_PNG_EFFORT", "1"))
+_min_psnr = os.environ.get("ASSETGEN_PNG_MIN_PSNR")
+PNG_MIN_PSNR = float(_min_psnr) if _min_psnr else None
+ENCODE_THREADS = os.cpu_count() or 1
+MAX_CANVAS_MB = float(os.environ.get("ASSETGEN_MAX_CANVAS_MB", "8"))
+BAND_MB = float(os.environ.get("ASSETGEN_BAND_MB", "1"))
+WEBP_QUALITY = 90
+
+# label: what the candidate is; image: what is encoded; options: save() kwargs
+Candidate = namedtuple("Candidate", "label image options")
+# label of the winner, its encoded size, the size with default settings, and
+# its PSNR against the original (inf when lossless)
+EncodeReport = namedtuple("EncodeReport", "path label bytes baseline_bytes psnr")
+
+# What a PNG's IHDR chunk says, without decoding it
+PngHeader = namedtuple("PngHeader", "width height bit_depth color_type")
+
+_totals = {"files": 0, "bytes": 0, "baseline_bytes": 0}
+_lock = threading.Lock()
+_local = threading.local()
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color type per image mode (all 8 bits per sample)
+COLOR_TYPES = {"L": 0, "RGB": 2, "RGBA": 6}
+FILTER_NONE, FILTER_SUB, FILTER_UP = 0, 1, 2
+IDAT_BYTES = 1 << 16
+# Treat filtered bytes as signed when scoring a filter: 255 is -1, not 255.
+_SIGNED_COST = [min(v, 256 - v) for v in range(256)]
+
+
+def configure(effort=None, min_psnr=None):
+    """Change the search here and in worker processes started from now on."""
+    global PNG_EFFORT, PNG_MIN_PSNR
+    if effort is not None:
+        PNG_EFFORT = effort
+        os.environ["ASSETGEN_PNG_EFFORT"] = str(effort)
+    if min_psnr is not None:
+        PNG_MIN_PSNR = min_psnr
+        os.environ["ASSETGEN_PNG_MIN_PSNR"] = str(min_psnr)
+
+
+def share_cpus(workers):
+    """Give each of ``workers`` concurrent encoders an equal share of the CPUs.
+
+    Use as a process pool initializer. Returns the previous thread count.
+    """
+    global ENCODE_THREADS
+    previous, ENCODE_THREADS = ENCODE_THREADS, max(1, (os.cpu_count() or 1) // max(1, workers))
+    return previous
+
+
+def settings():
+    """The knobs that change encoded bytes, for build cache keys."""
+    return {"effort": PNG_EFFORT, "min_psnr": PNG_MIN_PSNR, "max_canvas_mb": MAX_CANVAS_MB, "band_mb": BAND_MB}
+
+
+def banded(size, mode="RGB"):
+    """Whether a canvas this large should be rendered in bands."""
+    return size[0] * size[1] * Image.getmodebands(mode) > MAX_CANVAS_MB * 2 ** 20
+
+
+def band_ranges(size, mode="RGB"):
+    """``(top, bottom)`` row ranges of about ``BAND_MB`` each, covering ``size``."""
+    w, h = size
+    rows = max(1, int(BAND_MB * 2 ** 20 // (w * Image.getmodebands(mode))))
+    return [(top, min(top + rows, h)) for top in range(0, h, rows)]
+
+
+def psnr(original, candidate):
+    """Peak signal-to-noise ratio in dB over all bands; inf when identical."""
+    diff = ImageChops.difference(original, candidate.convert(original.mode))
+    mse = sum(rms * rms for rms in ImageStat.Stat(diff).rms) / len(diff.getbands())
+    return math.inf if mse == 0 else 10 * math.log10(255 * 255 / mse)
+
+
+def _palette(img, min_psnr):
+    """A palette version of ``img`` and its PSNR, or None if it would lose too much.
+
+    Images with at most 256 colors convert exactly. Others are quantized only
+    when ``min_psnr`` allows a lossy result.
+    """
+    if img.mode == "RGB" and img.getcolors(256):
+        palette = Image.new("P", (1, 1))
+        palette.putpalette([c for _, rgb in img.getcolors(256) for c in rgb])
+        return img.quantize(palette=palette, dither=Image.Dither.NONE), math.inf
+    if min_psnr is None:
+        return None
+    method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+    pal = img.quantize(256, method=method, dither=Image.Dither.NONE)
+    score = psnr(img, pal)
+    return (pal, score) if score >= min_psnr else None
+
+
+def candidates(img, effort=None, min_psnr=None):
+    """The encodings to try, default settings first. Returns ``[(Candidate, psnr)]``."""
+    effort = PNG_EFFORT if effort is None else effort
+    found = [(Candidate("default", img, {}), math.inf)]
+    if effort <= 0:
+        return found
+    if effort == 1:
+        grid = [(9, Z_DEFAULT), (9, Z_FILTERED)]
+    else:
+        grid = [(level, strategy) for level in range(6, 10)
+                for strategy in (Z_DEFAULT, Z_FILTERED, Z_HUFFMAN_ONLY, Z_RLE)]
+    names = {Z_DEFAULT: "default", Z_FILTERED: "filtered", Z_HUFFMAN_ONLY: "huffman", Z_RLE: "rle"}
+    for level, strategy in grid:
+        found.append((Candidate(f"level {level} {names[strategy]}", img,
+                                {"compress_level": level, "compress_type": strategy}), math.inf))
+    if effort >= 2:
+        found.append((Candidate("optimize", img, {"optimize": True}), math.inf))
+
+    if img.mode in ("RGB", "RGBA"):
+        pal = _palette(img, PNG_MIN_PSNR if min_psnr is None else min_psnr)
+        if pal:
+            found.append((Candidate("palette", pal[0], {"compress_level": 9}), pal[1]))
+    return found
+
+
+def _encode(candidate):
+    buf = io.BytesIO()
+    candidate.image.save(buf, "PNG", **candidate.options)
+    return buf.getvalue()
+
+
+def encode_png(img, effort=None, min_psnr=None):
+    """Return ``(data, label, baseline_bytes, psnr)`` for the smallest acceptable encoding."""
+    options = candidates(img, effort, min_psnr)
+    if len(options) == 1:
+        data = _encode(options[0][0])
+        return data, options[0][0].label, len(data), math.inf
+    with ThreadPoolExecutor(max_workers=min(ENCODE_THREADS, len(options))) as pool:
+        encoded = list(pool.map(_encode, [c for c, _ in options]))
+    # Smallest wins; ties go to the earlier (cheaper to decode) candidate.
+    best = min(range(len(options)), key=lambda i: (len(encoded[i]), i))
+    return encoded[best], options[best][0].label, len(encoded[0]), options[best][1]
+
+
+def save_png(img, path, effort=None, min_psnr=None):
+    """Write ``img`` to ``path`` with the smallest acceptable encoding."""
+    with trace.span("encode", file=os.path.basename(path)):
+        data, label, baseline, score = encode_png(img, effort, min_psnr)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    _count(len(data), baseline)
+    return EncodeReport(path, label, len(data), baseline, score)
+
+
+def _count(nbytes, baseline):
+    """Add a written file to the process totals and this thread's."""
+    with _lock:
+        for totals in (_totals, thread_stats()):
+            totals["files"] += 1
+            totals["bytes"] += nbytes
+            totals["baseline_bytes"] += baseline
+
+
+def _chunk(kind, data=b""):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _filter_band(band, previous):
+    """``(filter type, filtered band)`` with the lowest cost.
+
+    ``previous`` is the last row of the band above (None for the first band),
+    which the Up filter needs for this band's first row.
+    """
+    w, h = band.size
+    left = Image.new(band.mode, band.size)
+    left.paste(band.crop((0, 0, w - 1, h)), (1, 0))
+    above = Image.new(band.mode, band.size)
+    if previous is not None:
+        above.paste(previous, (0, 0))
+    above.paste(band.crop((0, 0, w, h - 1)), (0, 1))
+    options = [(FILTER_NONE, band),
+               (FILTER_SUB, ImageChops.subtract_modulo(band, left)),
+               (FILTER_UP, ImageChops.subtract_modulo(band, above))]
+    lut = _SIGNED_COST * len(band.getbands())
+    return min(options, key=lambda o: sum(ImageStat.Stat(o[1].point(lut)).sum))
+
+
+def _filtered_rows(band, previous=None):
+    """The rows of ``band`` as PNG scanlines: each prefixed with its filter byte."""
+    kind, filtered = _filter_band(band, previous)
+    stride = band.width * Image.getmodebands(band.mode)
+    # View the band as bytes, one row per line, with a column for the filter byte
+    raw = Image.new("L", (stride + 1, band.height), kind)
+    raw.paste(Image.frombytes("L", (stride, band.height), filtered.tobytes()), (1, 0))
+    return raw.tobytes()
+
+
+def _write_png_bands(f, size, mode, bands, level):
+    """Stream the horizontal ``bands`` of a ``size`` image to the file ``f`` as PNG."""
+    if mode not in COLOR_TYPES:
+        raise ValueError(f"cannot stream a {mode} image to PNG")
+    w, h = size
+    rows = 0
+    f.write(PNG_SIGNATURE + _chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, COLOR_TYPES[mode], 0, 0, 0)))
+    compressor = zlib.compressobj(level)
+    pending, previous = [], None
+    for band in bands:
+        if band.mode != mode or band.width != w or rows + band.height > h:
+            raise ValueError(f"band {band.mode} {band.size} does not fit a {mode} {w}x{h} image at row {rows}")
+        pending.append(compressor.compress(_filtered_rows(band, previous)))
+        previous = band.crop((0, band.height - 1, w, band.height))
+        rows += band.height
+        if sum(map(len, pending)) >= IDAT_BYTES:
+            f.write(_chunk(b"IDAT", b"".join(pending)))
+            pending = []
+    if rows != h:
+        raise ValueError(f"bands cover {rows} of {h} rows")
+    pending.append(compressor.flush())
+    f.write(_chunk(b"IDAT", b"".join(pending)) + _chunk(b"IEND"))
+
+
+def _band_level(level):
+    return (6 if PNG_EFFORT <= 0 else 9) if level is None else level
+
+
+def save_png_bands(path, size, mode, bands, level=None):
+    """Write the horizontal ``bands`` of a ``size`` image to ``path`` as they arrive.
+
+    ``bands`` is an iterable of ``mode`` images spanning the full width whose
+    heights add up to the image height.
+    """
+    level = _band_level(level)
+    tmp = path + ".tmp"
+    with trace.span("encode", file=os.path.basename(path), banded=True), open(tmp, "wb") as f:
+        _write_png_bands(f, size, mode, bands, level)
+        nbytes = f.tell()
+    os.replace(tmp, path)
+    _count(nbytes, nbytes)
+    return EncodeReport(path, f"banded level {level}", nbytes, nbytes, math.inf)
+
+
+def encode_png_bands(size, mode, bands, level=None):
+    """``save_png_bands`` into memory: returns the PNG as bytes."""
+    buf = io.BytesIO()
+    _write_png_bands(buf, size, mode, bands, _band_level(level))
+    return buf.getvalue()
+
+
+def save_apng(path, size, mode, frames, loops=0, level=None):
+    """Write an animated PNG whose frames are the changed rectangles only.
+
+    ``frames`` is a sequence of ``(image, (x, y), duration_ms)``. The first
+    is the whole ``size`` canvas at (0, 0) (it is also the still image shown
+    by viewers without APNG support); each later one is painted over the
+    previous frame at ``(x, y)``. ``loops=0`` repeats forever.
+    """
+    if mode not in COLOR_TYPES:
+        raise ValueError(f"cannot write a {mode} APNG")
+    frames = list(frames)
+    if not frames or frames[0][0].size != tuple(size) or tuple(frames[0][1]) != (0, 0):
+        raise ValueError("the first frame must be the whole canvas at (0, 0)")
+    level = _band_level(level)
+    w, h = size
+    tmp = path + ".tmp"
+    sequence = 0
+    with trace.span("encode", file=os.path.basename(path), frames=len(frames)), open(tmp, "wb") as f:
+        f.write(PNG_SIGNATURE + _chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, COLOR_TYPES[mode], 0, 0, 0)))
+        f.write(_chunk(b"acTL", struct.pack(">II", len(frames), loops)))
+        for i, (img, (x, y), duration) in enumerate(frames):
+            if img.mode != mode or x < 0 or y < 0 or x + img.width > w or y + img.height > h:
+                raise ValueError(f"frame {i} ({img.mode} {img.size} at {x},{y}) does not fit a {mode} {w}x{h} canvas")
+            # dispose: none (keep the canvas), blend: source (replace the rectangle)
+            f.write(_chunk(b"fcTL", struct.pack(">IIIIIHHBB", sequence, img.width, img.height, x, y,
+                                                round(duration), 1000, 0, 0)))
+            sequence += 1
+            data = zlib.compress(_filtered_rows(img), level)
+            if i == 0:
+                f.write(_chunk(b"IDAT", data))
+            else:
+                f.write(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+        f.write(_chunk(b"IEND"))
+        nbytes = f.tell()
+    os.replace(tmp, path)
+    _count(nbytes, nbytes)
+    return EncodeReport(path, f"apng {len(frames)} frames, level {level}", nbytes, nbytes, math.inf)
+
+
+def _riff_chunk(kind, data):
+    return kind + struct.pack("<I", len(data)) + data + b"\0" * (len(data) & 1)
+
+
+def _webp_bitstream(img, quality, lossless):
+    """The VP8/VP8L (and ALPH) chunks of ``img`` encoded as a still WebP."""
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", quality=quality, lossless=lossless, method=4)
+    data, chunks, pos = buf.getvalue(), [], 12
+    while pos < len(data):
+        kind, size = data[pos:pos + 4], struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        end = pos + 8 + size + (size & 1)
+        if kind in (b"ALPH", b"VP8 ", b"VP8L"):
+            chunks.append(data[pos:end])
+        pos = end
+    return b"".join(chunks)
+
+
+def save_animated_webp(path, size, mode, frames, loops=0, quality=WEBP_QUALITY, lossless=False):
+    """``save_apng`` for animated WebP: one ANMF chunk per changed rectangle.
+
+    WebP frame offsets are stored halved, so every ``(x, y)`` must be even.
+    """
+    if mode not in ("RGB", "RGBA"):
+        raise ValueError(f"cannot write a {mode} WebP")
+    frames = list(frames)
+    if not frames or frames[0][0].size != tuple(size) or tuple(frames[0][1]) != (0, 0):
+        raise ValueError("the first frame must be the whole canvas at (0, 0)")
+    w, h = size
+    alpha = 0x10 if mode == "RGBA" else 0
+    body = [_riff_chunk(b"VP8X", struct.pack("<B3x", 0x02 | alpha) + (w - 1).to_bytes(3, "little")
+                        + (h - 1).to_bytes(3, "little")),
+            _riff_chunk(b"ANIM", struct.pack("<4BH", 0, 0, 0, 0, loops))]
+    with trace.span("encode", file=os.path.basename(path), frames=len(frames)):
+        for i, (img, (x, y), duration) in enumerate(frames):
+            if img.mode != mode or x % 2 or y % 2 or x + img.width > w or y + img.height > h:
+                raise ValueError(f"frame {i} ({img.mode} {img.size} at {x},{y}) does not fit a {mode} {w}x{h}"
+                                 " canvas at even offsets")
+            header = b"".join(v.to_bytes(3, "little") for v in
+                              (x // 2, y // 2, img.width - 1, img.height - 1, round(duration)))
+            # flags: do not blend (the rectangle replaces the canvas), no disposal
+            body.append(_riff_chunk(b"ANMF", header + b"\x02" + _webp_bitstream(img, quality, lossless)))
+    data = b"".join(body)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", len(data) + 4) + b"WEBP" + data)
+        nbytes = f.tell()
+    os.replace(tmp, path)
+    _count(nbytes, nbytes)
+    label = f"webp {len(frames)} frames, " + ("lossless" if lossless else f"quality {quality}")
+    return EncodeReport(path, label, nbytes, nbytes, math.inf)
+
+
+def png_header(source):
+    """The ``PngHeader`` of a PNG path or buffer, read from its first 26 bytes.
+
+    Nothing is decoded, so this is cheap for any image size.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            head = f.read(26)
+    else:
+        head = bytes(memoryview(source)[:26])
+    if len(head) < 26 or head[:8] != PNG_SIGNATURE or head[12:16] != b"IHDR":
+        raise ValueError("not a PNG")
+    return PngHeader(*struct.unpack(">IIBB", head[16:26]))
+
+
+def describe(report):
+    """One-line summary: size, savings over default settings, and the winner."""
+    saved = report.baseline_bytes - report.bytes
+    text = f"{report.bytes / 1024:.1f}KB, saved {saved / 1024:.1f}KB ({report.label}"
+    if report.psnr != math.inf:
+        text += f", {report.psnr:.1f} dB"
+    return text + ")"
+
+
+def stats():
+    """Totals for every PNG written by this process."""
+    with _lock:
+        return dict(_totals)
+
+
+def thread_stats():
+    """Totals for the PNGs written by the calling thread (a live dict)."""
+    if not hasattr(_local, "totals"):
+        _local.totals = {"files": 0, "bytes": 0, "baseline_bytes": 0}
+    return _local.totals
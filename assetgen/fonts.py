@@ -0,0 +1,228 @@
+"""Font resolution and loading shared by the asset generators.
+
+A *face* is a logical font ("serif", "serif-bold", or a script-specific face
+such as "cjk-ja" for localized captions) that resolves to a file by
+searching, in order:
+
+1. ``ASSETGEN_FONT_<FACE>`` (e.g. ``ASSETGEN_FONT_SERIF_BOLD``): an explicit file;
+2. ``ASSETGEN_FONT_DIR``, then the repo's bundled ``fonts/`` directory;
+3. the macOS system fonts the assets were designed with;
+4. fontconfig (``fc-match``), which is how Linux build agents find fonts.
+   fc-match always answers with its nearest font, so for a ``:lang=``
+   pattern the answer is only taken if ``fc-list`` says it covers that
+   language; otherwise the face warns and falls through;
+5. Pillow's built-in scalable font, with a warning, since it changes output.
+
+Resolved paths and loaded ``FreeTypeFont`` objects are cached, so each face
+and size is parsed from disk once per process.
+"""
+
+import functools
+import logging
+import os
+import re
+import shutil
+import subprocess
+from collections import namedtuple
+
+from PIL import ImageFont, features
+
+log = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLED_DIR = os.path.join(ROOT, "fonts")
+
+# files: names searched for in the override and bundled directories
+# system: absolute paths tried next
+# fontconfig: pattern handed to fc-match
+Face = namedtuple("Face", "files system fontconfig")
+
+_MAC = "/System/Library/Fonts"
+FACES = {
+    "serif": Face(
+        ["Georgia.ttf", "Times New Roman.ttf", "LiberationSerif-Regular.ttf", "DejaVuSerif.ttf"],
+        [f"{_MAC}/Supplemental/Georgia.ttf", f"{_MAC}/Supplemental/Times New Roman.ttf"],
+        "Georgia,serif:style=Regular",
+    ),
+    "serif-bold": Face(
+        ["Georgia Bold.ttf", "Times New Roman Bold.ttf", "LiberationSerif-Bold.ttf", "DejaVuSerif-Bold.ttf"],
+        [f"{_MAC}/Supplemental/Georgia Bold.ttf", f"{_MAC}/Supplemental/Times New Roman Bold.ttf"],
+        "Georgia,serif:style=Bold",
+    ),
+    # Georgia covers Cyrillic; the fontconfig pattern makes sure a Linux
+    # fallback does too.
+    "cyrillic": Face(
+        ["Georgia.ttf", "LiberationSerif-Regular.ttf", "DejaVuSerif.ttf", "NotoSerif-Regular.ttf"],
+        [f"{_MAC}/Supplemental/Georgia.ttf", f"{_MAC}/Supplemental/Times New Roman.ttf"],
+        "serif:lang=ru:style=Regular",
+    ),
+    "cyrillic-bold": Face(
+        ["Georgia Bold.ttf", "LiberationSerif-Bold.ttf", "DejaVuSerif-Bold.ttf", "NotoSerif-Bold.ttf"],
+        [f"{_MAC}/Supplemental/Georgia Bold.ttf", f"{_MAC}/Supplemental/Times New Roman Bold.ttf"],
+        "serif:lang=ru:style=Bold",
+    ),
+    "cjk-ja": Face(
+        ["NotoSerifCJKjp-Regular.otf", "NotoSerifCJK-Regular.ttc", "NotoSansCJK-Regular.ttc"],
+        [f"{_MAC}/ヒラギノ明朝 ProN.ttc", f"{_MAC}/ヒラギノ角ゴシック W3.ttc"],
+        "serif:lang=ja:style=Regular",
+    ),
+    "cjk-ja-bold": Face(
+        ["NotoSerifCJKjp-Bold.otf", "NotoSerifCJK-Bold.ttc", "NotoSansCJK-Bold.ttc"],
+        [f"{_MAC}/ヒラギノ角ゴシック W6.ttc", f"{_MAC}/ヒラギノ明朝 ProN.ttc"],
+        "serif:lang=ja:style=Bold",
+    ),
+    "cjk-ko": Face(
+        ["NotoSerifCJKkr-Regular.otf", "NotoSerifCJK-Regular.ttc", "NotoSansCJK-Regular.ttc"],
+        [f"{_MAC}/AppleSDGothicNeo.ttc", f"{_MAC}/Supplemental/AppleMyungjo.ttf"],
+        "serif:lang=ko:style=Regular",
+    ),
+    "cjk-ko-bold": Face(
+        ["NotoSerifCJKkr-Bold.otf", "NotoSerifCJK-Bold.ttc", "NotoSansCJK-Bold.ttc"],
+        [f"{_MAC}/AppleSDGothicNeo.ttc"],
+        "serif:lang=ko:style=Bold",
+    ),
+    "cjk-zh": Face(
+        ["NotoSerifCJKsc-Regular.otf", "NotoSerifCJK-Regular.ttc", "NotoSansCJK-Regular.ttc"],
+        [f"{_MAC}/Supplemental/Songti.ttc", f"{_MAC}/PingFang.ttc"],
+        "serif:lang=zh-cn:style=Regular",
+    ),
+    "cjk-zh-bold": Face(
+        ["NotoSerifCJKsc-Bold.otf", "NotoSerifCJK-Bold.ttc", "NotoSansCJK-Bold.ttc"],
+        [f"{_MAC}/STHeiti Medium.ttc", f"{_MAC}/Supplemental/Songti.ttc"],
+        "serif:lang=zh-cn:style=Bold",
+    ),
+    "devanagari": Face(
+        ["NotoSerifDevanagari-Regular.ttf", "NotoSansDevanagari-Regular.ttf"],
+        [f"{_MAC}/Supplemental/DevanagariMT.ttc", f"{_MAC}/Kohinoor.ttc"],
+        "serif:lang=hi:style=Regular",
+    ),
+    "devanagari-bold": Face(
+        ["NotoSerifDevanagari-Bold.ttf", "NotoSansDevanagari-Bold.ttf"],
+        [f"{_MAC}/Supplemental/DevanagariMT.ttc", f"{_MAC}/Kohinoor.ttc"],
+        "serif:lang=hi:style=Bold",
+    ),
+}
+
+# Locales whose captions need a face with a different script than "serif".
+LOCALE_FACES = {
+    "ru": "cyrillic",
+    "ja": "cjk-ja",
+    "ko": "cjk-ko",
+    "zh-CN": "cjk-zh",
+    "hi": "devanagari",
+}
+
+# Scripts that need complex text layout (libraqm) to shape correctly.
+_NEEDS_LAYOUT = {"devanagari", "devanagari-bold"}
+
+
+def _env_name(face):
+    return "ASSETGEN_FONT_" + face.upper().replace("-", "_")
+
+
+def _fc(*args):
+    """stdout of a fontconfig tool, or None if it is absent or fails."""
+    if not shutil.which(args[0]):
+        return None
+    try:
+        out = subprocess.run(args, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout if out.returncode == 0 else None
+
+
+def _fontconfig(pattern):
+    """Ask fc-match for a font file, or return None if fontconfig is absent."""
+    path = (_fc("fc-match", "--format=%{file}", pattern) or "").strip()
+    return path if os.path.isfile(path) else None
+
+
+def _covers(path, lang):
+    """Whether fontconfig lists the file at ``path`` among the fonts covering ``lang``."""
+    listed = _fc("fc-list", "--format=%{file}\n", f":lang={lang}") or ""
+    return os.path.realpath(path) in {os.path.realpath(line) for line in listed.splitlines() if line}
+
+
+def _candidates(face):
+    """Yield (source, path) pairs for a face in search order."""
+    spec = FACES[face]
+    override = os.environ.get(_env_name(face))
+    if override:
+        yield "env", override
+    for source, directory in [("env dir", os.environ.get("ASSETGEN_FONT_DIR")), ("bundled", BUNDLED_DIR)]:
+        if directory:
+            for name in spec.files:
+                yield source, os.path.join(directory, name)
+    for path in spec.system:
+        yield "system", path
+
+
+@functools.lru_cache(maxsize=None)
+def resolve(face):
+    """Return the font file for a face, or None if only Pillow's default is left."""
+    if face not in FACES:
+        raise KeyError(f"unknown font face: {face!r}")
+    for source, path in _candidates(face):
+        if os.path.isfile(path):
+            log.info("font %s -> %s (%s)", face, path, source)
+            return path
+    pattern = FACES[face].fontconfig
+    path = _fontconfig(pattern)
+    lang = re.search(r":lang=([\w-]+)", pattern)
+    if path and lang and not _covers(path, lang.group(1)):
+        _warn_once(face, f"fontconfig's nearest match {path} does not cover lang={lang.group(1)}; "
+                         "install a font for it (e.g. Noto) or set " + _env_name(face))
+        return None
+    if path:
+        log.info("font %s -> %s (fontconfig)", face, path)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_once(face, message):
+    log.warning("font %s: %s", face, message)
+
+
+@functools.lru_cache(maxsize=64)
+def load(face, size):
+    """Load a face at a pixel size. Cached per (face, size)."""
+    path = resolve(face)
+    if face in _NEEDS_LAYOUT and not features.check("raqm"):
+        _warn_once(face, "Pillow was built without libraqm; conjuncts will not shape correctly")
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError as e:
+            _warn_once(face, f"cannot load {path} ({e})")
+    _warn_once(face, "no font file found, using Pillow's built-in font; "
+                     "output will not match the golden assets")
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def face_for(locale=None, bold=False):
+    """The face that covers a locale's script."""
+    face = LOCALE_FACES.get(locale, "serif")
+    return face + "-bold" if bold else face
+
+
+def get_font(size, bold=False, locale=None):
+    """The generators' serif font at ``size``, or a face covering ``locale``."""
+    return load(face_for(locale, bold), size)
+
+
+def missing_faces(locales=None):
+    """The faces the generators use (with ``locales``' too) that resolve to no file.
+
+    Pillow's built-in font stands in for them, so goldens or timings taken
+    now would not match the design.
+    """
+    faces = ["serif", "serif-bold"] + [face_for(locale, bold) for locale in locales or () for bold in (False, True)]
+    return [face for face in dict.fromkeys(faces) if not resolve(face)]
+
+
+def font_files():
+    """Resolved file for every face, for cache keys."""
+    return {face: resolve(face) for face in sorted(FACES)}
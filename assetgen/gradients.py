@@ -0,0 +1,117 @@
+"""Whole-image gradient fills.
+
+Every gradient is built from one of PIL's native 256-level ramps
+(``Image.linear_gradient`` / ``Image.radial_gradient``), mapped through a
+per-channel lookup table and merged, so no Python code runs per row.
+"""
+
+from PIL import Image
+
+
+def _normalize_stops(stops):
+    """Accept a list of colors or (position, color) pairs; return sorted pairs."""
+    stops = list(stops)
+    if len(stops) < 2:
+        raise ValueError("a gradient needs at least two stops")
+    if len(stops[0]) == 2:
+        pairs = [(float(pos), color) for pos, color in stops]
+    else:
+        last = len(stops) - 1
+        pairs = [(i / last, color) for i, color in enumerate(stops)]
+    pairs.sort(key=lambda p: p[0])
+    return pairs
+
+
+def _channel_luts(stops):
+    """Build three 256-entry lookup tables (R, G, B) for the given stops."""
+    pairs = _normalize_stops(stops)
+    luts = ([], [], [])
+    seg = 0
+    for i in range(256):
+        t = i / 255
+        while seg < len(pairs) - 2 and t > pairs[seg + 1][0]:
+            seg += 1
+        (p0, c0), (p1, c1) = pairs[seg], pairs[seg + 1]
+        if t <= p0:
+            ratio = 0.0
+        elif t >= p1:
+            ratio = 1.0
+        else:
+            ratio = (t - p0) / (p1 - p0)
+        for ch in range(3):
+            luts[ch].append(int(c0[ch] * (1 - ratio) + c1[ch] * ratio))
+    return luts
+
+
+def _colorize(ramp, stops):
+    """Map an 'L' ramp image through the stop colors into an RGB image."""
+    return Image.merge("RGB", [ramp.point(lut) for lut in _channel_luts(stops)])
+
+
+def linear_gradient(size, stops, direction="vertical", rows=None):
+    """Return an RGB image filled with a linear gradient.
+
+    ``stops`` is either a list of colors (evenly spaced) or a list of
+    ``(position, color)`` pairs with positions in 0..1. ``direction`` is
+    ``"vertical"`` (top to bottom) or ``"horizontal"`` (left to right).
+    ``rows=(top, bottom)`` returns just that strip of the full-size gradient.
+    """
+    w, h = size
+    top, bottom = rows or (0, h)
+    if direction == "vertical":
+        ramp = Image.linear_gradient("L").resize((1, h), Image.BILINEAR)
+    elif direction == "horizontal":
+        ramp = Image.linear_gradient("L").transpose(Image.TRANSPOSE).resize((w, 1), Image.BILINEAR)
+    else:
+        raise ValueError(f"unknown gradient direction: {direction!r}")
+    # Colorize the single row/column, then stretch it across the canvas.
+    line = _colorize(ramp, stops)
+    if direction == "vertical":
+        line = line.crop((0, top, 1, bottom))
+    return line.resize((w, bottom - top), Image.NEAREST)
+
+
+def vertical_gradient(size, color1, color2, rows=None):
+    """Top-to-bottom two-color gradient."""
+    return linear_gradient(size, [color1, color2], "vertical", rows)
+
+
+def horizontal_gradient(size, color1, color2):
+    """Left-to-right two-color gradient."""
+    return linear_gradient(size, [color1, color2], "horizontal")
+
+
+def radial_gradient(size, stops, center=None, radius=None):
+    """Return an RGB image with a radial gradient.
+
+    The first stop sits at ``center`` (default: image center) and the last
+    at ``radius`` pixels away (default: distance to the farthest corner).
+    The stops fall off linearly with distance in every direction:
+
+    >>> img = radial_gradient((201, 201), [(0, 0, 0), (255, 255, 255)], radius=100)
+    >>> [img.getpixel((100 + d, 100))[0] for d in (0, 25, 50, 75, 99)]
+    [1, 62, 126, 190, 252]
+    >>> [img.getpixel((100 + d, 100 + d))[0] for d in (18, 35, 53, 70)]
+    [64, 124, 190, 252]
+    """
+    w, h = size
+    cx, cy = center if center is not None else (w / 2, h / 2)
+    if radius is None:
+        radius = max(((x - cx) ** 2 + (y - cy) ** 2) ** 0.5 for x in (0, w) for y in (0, h))
+    # PIL's radial ramp is 256x256, centered at 128, with a value of
+    # 255 * d / (128 * sqrt(2)) at distance d. Only its inscribed circle is
+    # whole, so ``radius`` maps to a distance of 128 (a value of 255 / sqrt(2))
+    # and the values are stretched by sqrt(2) afterwards; beyond ``radius``
+    # they clip to the last stop.
+    scale = 128 / max(radius, 1e-6)
+    ramp = Image.radial_gradient("L").transform(
+        (w, h), Image.AFFINE,
+        (scale, 0, 128 - cx * scale, 0, scale, 128 - cy * scale),
+        resample=Image.BILINEAR, fillcolor=255,
+    )
+    return _colorize(ramp.point([min(255, round(v * 2 ** 0.5)) for v in range(256)]), stops)
+
+
+def fill_gradient(img, stops, direction="vertical"):
+    """Paint a linear gradient over the whole of ``img`` in place."""
+    img.paste(linear_gradient(img.size, stops, direction))
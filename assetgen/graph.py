@@ -0,0 +1,102 @@
+"""Build graph driven by the ``release.media`` entries in config.yaml.
+
+Each media URI becomes a node backed by a render recipe (a job from
+``assetgen.jobs``). A node depends on another when it reads the other's
+output. Nodes are built in dependency waves: every node in a wave is
+independent of the others and they render concurrently, and only nodes
+whose inputs changed are re-rendered (see ``assetgen.cache``).
+"""
+
+import os
+from collections import namedtuple
+
+from assetgen import jobs as jobs_module
+from assetgen.cache import ROOT, BuildCache, file_args
+from assetgen.render import build
+
+DEFAULT_CONFIG = os.path.join(ROOT, "config.yaml")
+
+Node = namedtuple("Node", "uri job deps")
+
+
+class BuildGraphError(Exception):
+    """The config references media the generators cannot produce."""
+
+
+def load_config(config_path=DEFAULT_CONFIG):
+    """Parse config.yaml. PyYAML is only needed for config-driven builds."""
+    try:
+        import yaml
+    except ImportError:
+        raise BuildGraphError("config-driven builds need PyYAML: pip install pyyaml")
+    with open(config_path) as f:
+        return yaml.safe_load(f)
+
+
+def release_media(config):
+    """URIs of the ``release.media`` entries, in file order, without duplicates."""
+    uris = []
+    for entry in (config.get("release") or {}).get("media") or []:
+        uri = entry.get("uri")
+        if uri and uri not in uris:
+            uris.append(uri)
+    return uris
+
+
+def recipes(output_dir, assets_dir):
+    """Map output paths to the jobs that produce them."""
+    return {os.path.abspath(path): job
+            for job in jobs_module.all_jobs(assets_dir, output_dir)
+            for path in jobs_module.outputs(job)}
+
+
+def build_graph(config_path=DEFAULT_CONFIG, assets_dir=None):
+    """Resolve every release media URI to a node, failing on any without a recipe."""
+    base = os.path.dirname(os.path.abspath(config_path))
+    assets_dir = assets_dir or os.path.join(base, "assets")
+    by_dir = {}
+    nodes, missing = [], []
+    for uri in release_media(load_config(config_path)):
+        path = os.path.join(base, uri)
+        out_dir = os.path.dirname(path)
+        if out_dir not in by_dir:
+            by_dir[out_dir] = recipes(out_dir, assets_dir)
+        job = by_dir[out_dir].get(path)
+        if job is None:
+            missing.append(uri)
+        else:
+            nodes.append(Node(uri, job, ()))
+    if missing:
+        raise BuildGraphError("no render recipe for: " + ", ".join(missing))
+
+    # A node depends on every other node whose output it reads.
+    outputs = {os.path.abspath(path): node.uri
+               for node in nodes for path in jobs_module.outputs(node.job)}
+    return [node._replace(deps=tuple(outputs[os.path.abspath(p)] for p in file_args(node.job)
+                                     if os.path.abspath(p) in outputs))
+            for node in nodes]
+
+
+def waves(nodes):
+    """Group nodes into dependency order; nodes within a wave are independent."""
+    done, pending, order = set(), list(nodes), []
+    while pending:
+        ready = [node for node in pending if all(dep in done for dep in node.deps)]
+        if not ready:
+            raise BuildGraphError("dependency cycle between: "
+                                  + ", ".join(node.uri for node in pending))
+        order.append(ready)
+        done.update(node.uri for node in ready)
+        pending = [node for node in pending if node.uri not in done]
+    return order
+
+
+def build_all(nodes, workers=None, cache=None, force=False):
+    """Build the graph wave by wave. Returns ``(results, skipped)`` like ``build``."""
+    cache = cache or BuildCache()
+    results, skipped = [], []
+    for wave in waves(nodes):
+        wave_results, wave_skipped = build([node.job for node in wave], workers, cache, force)
+        results += wave_results
+        skipped += wave_skipped
+    return results, skipped
@@ -0,0 +1,296 @@
+"""Batch ingestion of raw device captures.
+
+QA devices dump hundreds of captures per build, named however the device
+likes and at whatever size the device has. ``ingest`` turns a directory of
+them into inputs for ``format_screenshots.create_framed_screenshot``:
+
+1. Scan: list the images and read each one's size from its header
+   (``encode.png_header`` for PNG, Pillow's lazy ``Image.open`` otherwise),
+   skipping anything too small to be a capture. No pixels are decoded.
+2. Normalize, in parallel threads: crop the system status bar and the
+   navigation bar (uniform bands at the top and bottom, see ``bars``) and pad
+   the result to ``ASPECT`` with its own edge color, so every device's capture
+   sits the same way in the frame. The result is written to the ingest cache.
+3. Hash: a 64-bit difference hash (dHash) of the normalized capture reduced
+   to 9x8 gray pixels. Captures within ``THRESHOLD`` differing bits of one
+   already kept are dropped as near-duplicates; the first by name wins.
+
+The index (``.asset-cache/ingest/index.json``) remembers every capture's
+size, mtime, digest, crop and hash, so a re-run only decodes new or edited
+captures. The normalized files are content-addressed, so an unchanged
+capture keeps its build cache key and its framed screenshot is not
+re-rendered either.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageChops, ImageStat
+
+from assetgen.cache import CACHE_DIR, input_digest, write_json
+from assetgen.encode import png_header
+from assetgen.resize_cache import REDUCING_GAP
+
+# Bump to re-ingest every capture after a change ``settings`` cannot see.
+INGEST_VERSION = 1
+
+INGEST_DIR = os.path.join(CACHE_DIR, "ingest")
+EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+# Captures whose short side is below this are icons or thumbnails, not screens
+MIN_SIDE = 480
+
+# A system bar is a band at the top or bottom, at most BAR_MAX of the height,
+# whose rows are at least BAR_MATCH within BAR_TOLERANCE of the bar's color.
+BAR_MAX = 0.07
+BAR_MATCH = 0.6
+BAR_TOLERANCE = 12
+# Width / height of a phone capture once its system bars are cropped; captures
+# further than ASPECT_TOLERANCE (relative) from it are padded to it.
+ASPECT = 0.48
+ASPECT_TOLERANCE = 0.03
+# dHash: HASH_SIZE x HASH_SIZE bits; near-duplicates differ in at most THRESHOLD
+HASH_SIZE = 8
+THRESHOLD = int(os.environ.get("ASSETGEN_DEDUPE_THRESHOLD", "6"))
+
+# One ingested capture. crop: (left, top, right, bottom) kept from the
+# original; normalized: the cropped and padded PNG in the ingest cache.
+Capture = namedtuple("Capture", "path size sha256 dhash crop normalized")
+
+
+def settings():
+    """Everything that changes a normalized capture or its hash."""
+    return {"version": INGEST_VERSION, "bar_max": BAR_MAX, "bar_match": BAR_MATCH, "bar_tolerance": BAR_TOLERANCE,
+            "aspect": ASPECT, "aspect_tolerance": ASPECT_TOLERANCE, "hash_size": HASH_SIZE}
+
+
+def header_size(path):
+    """``(width, height)`` from the file header, or None if it is not an image."""
+    try:
+        if path.lower().endswith(".png"):
+            header = png_header(path)
+            return header.width, header.height
+        with Image.open(path) as img:
+            return img.size
+    except (OSError, ValueError):
+        return None
+
+
+def scan(capture_dir):
+    """``[(path, size)]`` for every capture in ``capture_dir``, sorted by name."""
+    found = []
+    for name in sorted(os.listdir(capture_dir)):
+        path = os.path.join(capture_dir, name)
+        if not name.lower().endswith(EXTENSIONS) or not os.path.isfile(path):
+            continue
+        size = header_size(path)
+        if size and min(size) >= MIN_SIDE:
+            found.append((path, size))
+    return found
+
+
+def _bar_height(region):
+    """Rows from the top of ``region`` that belong to a uniform bar, or 0."""
+    w, h = region.size
+    color = max(region.crop((0, 0, w, 1)).getcolors(w))[1]
+    diff = ImageChops.difference(region, Image.new("RGB", region.size, color))
+    r, g, b = diff.split()
+    close = ImageChops.lighter(ImageChops.lighter(r, g), b).point(lambda v: 255 if v <= BAR_TOLERANCE else 0)
+    # Share of each row's pixels close to the bar color, 0-255
+    shares = close.resize((1, h), Image.BOX).getdata()
+    for row, share in enumerate(shares):
+        if share < BAR_MATCH * 255:
+            return row
+    return 0  # the band never ends: content, not a bar
+
+
+def bars(img):
+    """``(top, bottom)``: heights of the status and navigation bars in ``img``."""
+    w, h = img.size
+    limit = max(1, int(h * BAR_MAX))
+    top = _bar_height(img.crop((0, 0, w, limit)))
+    bottom = _bar_height(img.crop((0, h - limit, w, h)).transpose(Image.Transpose.FLIP_TOP_BOTTOM))
+    return top, bottom
+
+
+def _median(strip):
+    return tuple(int(v) for v in ImageStat.Stat(strip).median)
+
+
+def normalize(img):
+    """Crop the system bars and pad to ``ASPECT``. Returns ``(image, crop)``.
+
+    Each side is padded with the median color of the edge it extends.
+    """
+    img = img.convert("RGB")
+    w, h = img.size
+    top, bottom = bars(img)
+    crop = (0, top, w, h - bottom)
+    img = img.crop(crop)
+    w, h = img.size
+    aspect = w / h
+    if abs(aspect / ASPECT - 1) <= ASPECT_TOLERANCE:
+        return img, crop
+    if aspect < ASPECT:  # too tall: pad the sides
+        size = (round(h * ASPECT), h)
+        x, y = (size[0] - w) // 2, 0
+        first, second = img.crop((0, 0, 1, h)), img.crop((w - 1, 0, w, h))
+        halves = (0, 0, x, h), (x + w, 0, size[0], h)
+    else:  # too wide: pad above and below
+        size = (w, round(w / ASPECT))
+        x, y = 0, (size[1] - h) // 2
+        first, second = img.crop((0, 0, w, 1)), img.crop((0, h - 1, w, h))
+        halves = (0, 0, w, y), (0, y + h, w, size[1])
+    padded = Image.new("RGB", size)
+    padded.paste(_median(first), halves[0])
+    padded.paste(_median(second), halves[1])
+    padded.paste(img, (x, y))
+    return padded, crop
+
+
+def dhash(img):
+    """64-bit difference hash: whether each of 8x8 gray pixels is brighter than its right neighbor."""
+    small = img.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS, reducing_gap=REDUCING_GAP).convert("L")
+    px = small.tobytes()
+    bits = 0
+    for y in range(HASH_SIZE):
+        row = px[y * (HASH_SIZE + 1):(y + 1) * (HASH_SIZE + 1)]
+        for x in range(HASH_SIZE):
+            bits = bits << 1 | (row[x] > row[x + 1])
+    return bits
+
+
+def distance(a, b):
+    """Differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def process(path, size):
+    """Normalize and hash one capture; the normalized PNG goes to ``INGEST_DIR``."""
+    digest = input_digest(path)
+    with Image.open(path) as raw:
+        img, crop = normalize(raw)
+    # Named by source and settings, so identical captures share one file
+    key = hashlib.sha256((digest + json.dumps(settings(), sort_keys=True)).encode()).hexdigest()
+    normalized = os.path.join(INGEST_DIR, f"{key[:32]}.png")
+    if not os.path.isfile(normalized):
+        os.makedirs(INGEST_DIR, exist_ok=True)
+        tmp = f"{normalized}.{os.getpid()}.{threading.get_ident()}.tmp"
+        img.save(tmp, "PNG", compress_level=1)
+        os.replace(tmp, normalized)
+    return Capture(path, size, digest, dhash(img), crop, normalized)
+
+
+class IngestIndex:
+    """What each capture normalized to, keyed by path, stored as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(INGEST_DIR, "index.json")
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("settings") == settings():
+                self.entries = data.get("entries", {})
+
+    def lookup(self, path):
+        """The cached ``Capture`` for ``path`` if the file is unchanged, else None."""
+        entry = self.entries.get(os.path.abspath(path))
+        if not entry or not os.path.isfile(entry["normalized"]):
+            return None
+        st = os.stat(path)
+        if [st.st_size, st.st_mtime_ns] != entry["stat"]:
+            return None
+        return Capture(path, tuple(entry["size"]), entry["sha256"], int(entry["dhash"], 16),
+                       tuple(entry["crop"]), entry["normalized"])
+
+    def record(self, capture):
+        st = os.stat(capture.path)
+        self.entries[os.path.abspath(capture.path)] = {
+            "stat": [st.st_size, st.st_mtime_ns], "size": list(capture.size), "sha256": capture.sha256,
+            "dhash": f"{capture.dhash:016x}", "crop": list(capture.crop), "normalized": capture.normalized,
+        }
+
+    def save(self):
+        write_json(self.path, {"settings": settings(), "entries": self.entries})
+
+
+def dedupe(captures, threshold=None):
+    """``(kept, dropped)``; dropped is ``[(capture, kept_capture, distance)]``."""
+    threshold = THRESHOLD if threshold is None else threshold
+    kept, dropped = [], []
+    for capture in captures:
+        match = min(((distance(capture.dhash, k.dhash), k) for k in kept), default=None, key=lambda m: m[0])
+        if match and match[0] <= threshold:
+            dropped.append((capture, match[1], match[0]))
+        else:
+            kept.append(capture)
+    return kept, dropped
+
+
+def ingest(capture_dir, workers=None, threshold=None, index=None, force=False):
+    """Scan, normalize and dedupe ``capture_dir``.
+
+    Returns ``(kept, dropped, reused)``: the captures to frame, the
+    near-duplicates with what they duplicate, and how many captures were
+    taken from the index without decoding.
+    """
+    index = index or IngestIndex()
+    found = scan(capture_dir)
+    cached = {path: None if force else index.lookup(path) for path, _ in found}
+    todo = [(path, size) for path, size in found if cached[path] is None]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        fresh = dict(zip([path for path, _ in todo], pool.map(lambda item: process(*item), todo)))
+    captures = [cached[path] or fresh[path] for path, _ in found]
+    for capture in fresh.values():
+        index.record(capture)
+    index.save()
+    kept, dropped = dedupe(captures, threshold)
+    return kept, dropped, len(found) - len(todo)
+
+
+def _words(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return [w for w in re.split(r"[\W_]+", stem) if w and w.lower() != "screenshot"] or [stem]
+
+
+def _title(path):
+    """``1. Screenshot Garage.png`` -> ``Garage``; ``market_02.png`` -> ``Market 02``."""
+    words = _words(path)
+    while len(words) > 1 and words[0].isdigit():
+        words.pop(0)
+    return " ".join(words).title()
+
+
+def slug(path):
+    """A file-name-safe stem for a capture: ``1. Screenshot Garage.png`` -> ``1_garage``."""
+    return re.sub(r"[^a-z0-9]+", "_", "_".join(_words(path)).lower()).strip("_") or "capture"
+
+
+def unique_slugs(paths):
+    """``{path: slug}`` with no two paths sharing a slug.
+
+    Captures whose slugs collide (``garage.png`` and ``Garage!.png``) get a
+    short digest of their file name appended, so each keeps its own output.
+    """
+    slugs = {path: slug(path) for path in paths}
+    counts = {}
+    for value in slugs.values():
+        counts[value] = counts.get(value, 0) + 1
+    return {path: value if counts[value] == 1 else
+            f"{value}_{hashlib.sha256(os.path.basename(path).encode()).hexdigest()[:8]}"
+            for path, value in slugs.items()}
+
+
+def caption_for(path, screenshots=()):
+    """``(caption, subtitle)``: the ``SCREENSHOTS`` entry whose caption names the
+    capture, else the capture's name as the caption."""
+    title = _title(path)
+    for _, _, caption, subtitle in screenshots:
+        if caption.lower() in title.lower().split():
+            return caption, subtitle
+    return title, None
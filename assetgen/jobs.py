@@ -0,0 +1,192 @@
+"""The list of store assets to render, as independent picklable jobs."""
+
+import importlib
+import os
+from collections import namedtuple
+
+# A single render: call ``module.func(*args, **kwargs)``, which writes
+# ``output`` (a path, or a tuple of paths for jobs that write several files).
+# Functions are named rather than referenced so jobs pickle cleanly into
+# worker processes.
+Job = namedtuple("Job", "name module func args kwargs output")
+
+
+def outputs(job):
+    """Every file a job writes."""
+    return job.output if isinstance(job.output, tuple) else (job.output,)
+
+
+def resolve(job):
+    """Import and return the render function a job points at."""
+    return getattr(importlib.import_module(job.module), job.func)
+
+
+def run_job(job):
+    """Run one job and return whatever the render function returns."""
+    return resolve(job)(*job.args, **job.kwargs)
+
+
+def graphic_jobs(output_dir=None):
+    """Jobs for the icon, banner and editor's-choice graphic."""
+    import create_assets
+
+    output_dir = output_dir or create_assets.OUTPUT_DIR
+    jobs = []
+    for name, func, out_name in [
+        ("icon", "create_icon", "icon_512x512.png"),
+        ("banner", "create_banner", "banner_1200x600.png"),
+        ("editors_choice", "create_editors_choice", "editors_choice_1200x1200.png"),
+    ]:
+        jobs.append(Job(name, "create_assets", func, (), {"output_dir": output_dir},
+                        os.path.join(output_dir, out_name)))
+    return jobs
+
+
+def screenshot_jobs(assets_dir=None, output_dir=None):
+    """One job per entry in ``format_screenshots.SCREENSHOTS``."""
+    import format_screenshots
+
+    assets_dir = assets_dir or format_screenshots.ASSETS
+    output_dir = output_dir or format_screenshots.ASSETS
+    jobs = []
+    for raw_name, out_name, caption, subtitle in format_screenshots.SCREENSHOTS:
+        jobs.append(Job(
+            os.path.splitext(out_name)[0], "format_screenshots", "create_framed_screenshot",
+            (os.path.join(assets_dir, raw_name), out_name, caption, subtitle),
+            {"output_dir": output_dir},
+            os.path.join(output_dir, out_name),
+        ))
+    return jobs
+
+
+def localized_jobs(assets_dir=None, output_dir=None, locales=None):
+    """One job per raw screenshot, each writing that screenshot in every locale.
+
+    Grouping by screenshot lets a job decode and resize the raw capture once
+    and share it across all of its locales.
+    """
+    import format_screenshots
+    from screenshot_captions import CAPTIONS, LOCALES
+
+    locales = list(locales or LOCALES)
+    unknown = [locale for locale in locales if locale not in CAPTIONS]
+    if unknown:
+        raise KeyError("no screenshot captions for locale(s): " + ", ".join(unknown))
+    assets_dir = assets_dir or format_screenshots.ASSETS
+    output_dir = output_dir or format_screenshots.ASSETS
+    jobs = []
+    for raw_name, out_name, _, _ in format_screenshots.SCREENSHOTS:
+        stem = os.path.splitext(out_name)[0]
+        key = stem.rsplit("_", 1)[1]
+        captions = tuple((locale,) + tuple(CAPTIONS[locale][key]) for locale in locales)
+        jobs.append(Job(
+            stem + ".l10n", "format_screenshots", "create_localized_screenshots",
+            (os.path.join(assets_dir, raw_name), out_name, captions),
+            {"output_dir": output_dir},
+            tuple(os.path.join(output_dir, format_screenshots.localized_name(out_name, locale))
+                  for locale in locales),
+        ))
+    return jobs
+
+
+def multires_jobs(output_dir=None):
+    """Jobs for the launcher icon densities and the banner sizes.
+
+    Each draws one supersampled master and writes every size derived from it.
+    """
+    import create_assets
+
+    output_dir = output_dir or create_assets.OUTPUT_DIR
+    icons = tuple(
+        os.path.join(output_dir, "launcher", f"mipmap-{density}", name)
+        for density, _ in create_assets.LAUNCHER_DENSITIES
+        for name in ("ic_launcher.png", "ic_launcher_foreground.png", "ic_launcher_background.png")
+    )
+    banners = tuple(os.path.join(output_dir, "banner", f"banner_{w}x{w // 2}.png")
+                    for w in create_assets.BANNER_WIDTHS)
+    return [
+        Job("icon_set", "create_assets", "create_icon_set", (), {"output_dir": output_dir}, icons),
+        Job("banner_set", "create_assets", "create_banner_set", (), {"output_dir": output_dir}, banners),
+    ]
+
+
+def hires_jobs(assets_dir=None, output_dir=None):
+    """Tablet screenshots and the 4K promo art.
+
+    These canvases are large enough to render in bands (see
+    ``assetgen.encode.banded``), which keeps each job's memory bounded.
+    """
+    import create_assets
+    import format_screenshots
+
+    assets_dir = assets_dir or format_screenshots.ASSETS
+    output_dir = output_dir or format_screenshots.ASSETS
+    jobs = []
+    for raw_name, out_name, caption, subtitle in format_screenshots.SCREENSHOTS:
+        name = os.path.join("tablet", out_name)
+        jobs.append(Job(
+            "tablet_" + os.path.splitext(out_name)[0], "format_screenshots", "create_framed_screenshot",
+            (os.path.join(assets_dir, raw_name), name, caption, subtitle),
+            {"output_dir": output_dir, "size": format_screenshots.TABLET_SIZE},
+            os.path.join(output_dir, name),
+        ))
+    w = create_assets.PROMO_WIDTH
+    jobs.append(Job("promo", "create_assets", "create_promo", (), {"output_dir": output_dir},
+                    os.path.join(output_dir, "promo", f"promo_{w}x{w // 2}.png")))
+    return jobs
+
+
+def animation_jobs(assets_dir=None, output_dir=None, fmt="apng"):
+    """Animated previews: the banner's turning sunburst, a caption reveal per
+    screenshot and a crossfading tour of all four. ``fmt`` is "apng" or "webp"."""
+    import create_assets
+    import format_screenshots
+    from assetgen.animate import output_name
+
+    assets_dir = assets_dir or format_screenshots.ASSETS
+    output_dir = output_dir or format_screenshots.ASSETS
+    jobs = [Job("banner_animated", "create_assets", "create_banner_animation", (),
+                {"output_dir": output_dir, "fmt": fmt},
+                os.path.join(output_dir, "animated", output_name("banner_1200x600", fmt)))]
+    tour = []
+    for raw_name, out_name, caption, subtitle in format_screenshots.SCREENSHOTS:
+        raw = os.path.join(assets_dir, raw_name)
+        name = os.path.join("animated", out_name)
+        jobs.append(Job(
+            "animated_" + os.path.splitext(out_name)[0], "format_screenshots", "create_caption_reveal",
+            (raw, name, caption, subtitle), {"output_dir": output_dir, "fmt": fmt},
+            os.path.join(output_dir, output_name(name, fmt)),
+        ))
+        tour.append((raw, caption, subtitle))
+    name = os.path.join("animated", "screenshot_tour.png")
+    jobs.append(Job("screenshot_tour", "format_screenshots", "create_screenshot_tour", (tuple(tour), name),
+                    {"output_dir": output_dir, "fmt": fmt}, os.path.join(output_dir, output_name(name, fmt))))
+    return jobs
+
+
+def ingested_jobs(captures, output_dir=None):
+    """One framed screenshot per capture kept by ``assetgen.ingest.ingest``.
+
+    Each renders the normalized capture to ``ingested/screenshot_<name>.png``.
+    """
+    import format_screenshots
+    from assetgen import ingest
+
+    output_dir = output_dir or format_screenshots.ASSETS
+    slugs = ingest.unique_slugs([capture.path for capture in captures])
+    jobs = []
+    for capture in captures:
+        name = os.path.join("ingested", f"screenshot_{slugs[capture.path]}.png")
+        caption, subtitle = ingest.caption_for(capture.path, format_screenshots.SCREENSHOTS)
+        jobs.append(Job(
+            "ingested_" + slugs[capture.path], "format_screenshots", "create_framed_screenshot",
+            (capture.normalized, name, caption, subtitle),
+            {"output_dir": output_dir},
+            os.path.join(output_dir, name),
+        ))
+    return jobs
+
+
+def all_jobs(assets_dir=None, output_dir=None):
+    """Every store asset, in a fixed order."""
+    return graphic_jobs(output_dir) + screenshot_jobs(assets_dir, output_dir)
@@ -0,0 +1,21 @@
+"""The Art Deco color palette shared by the generators.
+
+Render functions take an optional ``palette``; ``PALETTE`` is the app's own.
+``PALETTE._replace(gold=...)`` makes a variant.
+"""
+
+from collections import namedtuple
+
+Palette = namedtuple("Palette", "charcoal deep_bg gold dark_gold light_gold cream burgundy dark_burgundy")
+
+# Color palette from the app
+PALETTE = Palette(
+    charcoal=(26, 26, 46),         # #1A1A2E
+    deep_bg=(15, 15, 35),          # Even darker for depth
+    gold=(212, 175, 55),           # #D4AF37
+    dark_gold=(184, 134, 11),      # #B8860B
+    light_gold=(232, 212, 139),    # #E8D48B
+    cream=(255, 248, 231),         # #FFF8E7
+    burgundy=(114, 47, 55),        # #722F37
+    dark_burgundy=(74, 31, 36),    # #4A1F24
+)
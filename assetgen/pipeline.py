@@ -0,0 +1,235 @@
+"""Pipelined rendering: decode, render and encode stages on threads.
+
+``render.render_jobs`` runs each job start to finish, so a screenshot job
+reads and decodes its capture, draws and composites, then encodes and writes,
+and none of it overlaps. Here jobs are split into three stages, each with its
+own thread pool, joined by bounded queues:
+
+decode
+    load and resize the raw capture (through the resize cache)
+render
+    draw the frame and captions and composite the screenshot
+encode
+    PNG-encode and write each output
+
+Pillow releases the GIL while it decodes, resamples, composites and
+compresses, and file I/O releases it too, so the stages overlap on threads
+without the memory of a process per worker. The queues hold at most
+``QUEUE_SIZE`` items, so a fast stage waits for a slow one instead of piling
+up captures or canvases.
+
+Jobs split with a ``<func>`` -> ``<stages>`` entry in ``STAGED`` (see
+``format_screenshots.framed_stages``). Any other job (the graphics, and
+screenshots rendered in bands) runs whole in the render stage.
+
+Each stage reports its items, busy time and throughput; the stage with the
+most busy time per thread is the bottleneck.
+"""
+
+import importlib
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from assetgen import encode, trace
+from assetgen.encode import describe, save_png
+from assetgen.jobs import run_job
+from assetgen.render import JobResult, default_workers
+from assetgen.resize_cache import RESIZE_CACHE
+
+QUEUE_SIZE = int(os.environ.get("ASSETGEN_PIPELINE_QUEUE", "4"))
+DECODE_THREADS = 2
+
+# (module, render function) -> function returning its (decode, render) split
+STAGED = {
+    ("format_screenshots", "create_framed_screenshot"): "framed_stages",
+    ("format_screenshots", "create_localized_screenshots"): "localized_stages",
+}
+
+# items: how many went through; busy: seconds spent on them summed over threads
+StageReport = namedtuple("StageReport", "name threads items busy wall")
+
+_DONE = object()
+
+
+def stages(job):
+    """``(decode, render)`` for a job that splits, else None."""
+    name = STAGED.get((job.module, job.func))
+    if name is None:
+        return None
+    split = getattr(importlib.import_module(job.module), name)
+    return split(*job.args, **job.kwargs)
+
+
+class _Stage:
+    """A pool of threads applying ``work`` to every item put on ``inbox``.
+
+    ``work(item, emit)`` passes its results on with ``emit`` and returns how
+    many items of real work it did. Time spent waiting on a full downstream
+    queue is not counted as busy.
+    """
+
+    def __init__(self, name, threads, work, inbox, outbox, accounts):
+        self.name = name
+        self.work = work
+        self.inbox = inbox
+        self.outbox = outbox
+        self.accounts = accounts
+        self.items = 0
+        self.busy = 0.0
+        self.lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._loop, name=f"{name}-{n}", daemon=True)
+                        for n in range(threads)]
+        self.start = time.perf_counter()
+        self.end = None
+
+    def _loop(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                return
+            index = item[0]
+            account = self.accounts[index]
+            if account.error is not None:
+                continue
+            resize, encoded = dict(RESIZE_CACHE.thread_stats()), dict(encode.thread_stats())
+            waited = [0.0]
+
+            def emit(result):
+                start = time.perf_counter()
+                self.outbox.put(result)
+                waited[0] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            done = 0
+            try:
+                done = self.work(item, emit)
+            except Exception as e:  # fail the job, keep the pipeline draining
+                account.error = e
+            seconds = time.perf_counter() - start - waited[0]
+            with self.lock:
+                self.items += done
+                self.busy += seconds
+            account.add(seconds, _delta(RESIZE_CACHE.thread_stats(), resize),
+                        _delta(encode.thread_stats(), encoded))
+
+    def run(self):
+        for t in self.threads:
+            t.start()
+
+    def close(self):
+        """Wait for the inbox to drain and every thread to finish."""
+        for _ in self.threads:
+            self.inbox.put(_DONE)
+        for t in self.threads:
+            t.join()
+        self.end = time.perf_counter()
+
+    def report(self):
+        return StageReport(self.name, len(self.threads), self.items, self.busy, self.end - self.start)
+
+
+def _delta(after, before):
+    return {k: after[k] - before[k] for k in after}
+
+
+class _Account:
+    """What one job cost across the stages."""
+
+    def __init__(self, job):
+        self.job = job
+        self.output = job.output
+        self.seconds = 0.0
+        self.resize = dict.fromkeys(RESIZE_CACHE.stats(), 0)
+        self.encoded = dict.fromkeys(encode.stats(), 0)
+        self.error = None
+        self.lock = threading.Lock()
+
+    def add(self, seconds, resize, encoded):
+        with self.lock:
+            self.seconds += seconds
+            for k in resize:
+                self.resize[k] += resize[k]
+            for k in encoded:
+                self.encoded[k] += encoded[k]
+
+    def result(self):
+        return JobResult(self.job.name, self.output, self.seconds, self.resize, self.encoded, [])
+
+
+def run(jobs, workers=None):
+    """Render ``jobs`` through the pipeline; returns their results in job order.
+
+    ``workers`` threads run each of the render and encode stages (default:
+    one per CPU). Prints the per-stage report when done.
+    """
+    threads = workers or default_workers()
+    encode_threads = encode.share_cpus(threads)
+    accounts = [_Account(job) for job in jobs]
+    to_decode, to_render, to_encode = queue.Queue(), queue.Queue(QUEUE_SIZE), queue.Queue(QUEUE_SIZE)
+
+    def decode(item, emit):
+        index, job = item
+        split = stages(job)
+        if split is None:
+            emit((index, None, None))
+            return 0
+        with trace.span("decode", "pipeline", job=job.name):
+            loaded = split[0]()
+        emit((index, split[1], loaded))
+        return 1
+
+    def render(item, emit):
+        index, draw, loaded = item
+        account = accounts[index]
+        if draw is None:
+            with trace.span(account.job.name, "job", func=account.job.func):
+                account.output = run_job(account.job)
+            return 1
+        images = iter(draw(loaded))
+        done = 0
+        while True:
+            with trace.span("render", "pipeline", job=account.job.name):
+                path_image = next(images, None)
+            if path_image is None:
+                return done
+            emit((index,) + path_image)
+            done += 1
+
+    def write(item, emit):
+        _, path, img = item
+        with trace.span("write", "pipeline", file=os.path.basename(path)):
+            report = save_png(img, path)
+        print(f"  {os.path.basename(path)}: {img.size[0]}x{img.size[1]}, {describe(report)}")
+        return 1
+
+    pipeline = [_Stage("decode", min(DECODE_THREADS, threads), decode, to_decode, to_render, accounts),
+                _Stage("render", threads, render, to_render, to_encode, accounts),
+                _Stage("encode", threads, write, to_encode, None, accounts)]
+    for stage in pipeline:
+        stage.run()
+    for item in enumerate(jobs):
+        to_decode.put(item)
+    for stage in pipeline:
+        stage.close()
+
+    encode.ENCODE_THREADS = encode_threads  # restore the share this process had
+    print_stages([stage.report() for stage in pipeline])
+    for account in accounts:
+        if account.error is not None:
+            raise account.error
+    return [account.result() for account in accounts]
+
+
+def print_stages(reports):
+    """Print each stage's throughput and mark the bottleneck."""
+    slowest = max(reports, key=lambda r: r.busy / r.threads)
+    print(f"\nPipeline stages (queues of {QUEUE_SIZE}):")
+    for r in reports:
+        rate = r.items * r.threads / r.busy if r.busy else float("inf")
+        use = r.busy / (r.threads * r.wall) if r.wall else 0.0
+        mark = "  <- bottleneck" if r is slowest and r.busy else ""
+        print(f"  {r.name:<7} {r.items:4d} items  {r.busy:7.2f}s busy on {r.threads} thread(s)"
+              f"  {rate:7.1f} items/s  {use:4.0%} utilized{mark}")
@@ -0,0 +1,216 @@
+"""Anti-aliased Art Deco drawing primitives.
+
+``ImageDraw`` has no anti-aliasing, and the ornaments (sunbursts, fans,
+rings, diamond rows, chevrons) are made of many thin strokes, so they come
+out jagged. Each primitive here draws its whole shape into one coverage mask
+at ``SUPERSAMPLE`` times the output resolution, using as few ``ImageDraw``
+calls as possible (one multi-point ``line`` for all the rays of a sunburst,
+one ``ellipse`` for a ring), box-filters the mask down with ``reduce()`` and
+composites the color through it in a single paste.
+
+Coordinates are floats in output pixels, with the same convention as
+``ImageDraw`` (an integer coordinate is the center of that pixel). Images may
+be RGB or RGBA; on RGBA the shape is alpha-composited so the edges stay clean
+over transparent pixels.
+
+Anywhere an image is accepted, a ``Band`` (a horizontal strip of a taller
+canvas) is too: coordinates stay in full-canvas pixels and whatever falls
+outside the strip is clipped. ``draw_for`` gives the matching ``ImageDraw``.
+A shape's mask is always painted whole and cropped to the band, so a canvas
+painted band by band matches one painted whole.
+"""
+
+import math
+from collections import namedtuple
+
+from PIL import Image, ImageDraw
+
+SUPERSAMPLE = 4
+# Large shapes (a full-canvas sunburst) drop to a lower factor to bound the mask.
+MAX_MASK_PIXELS = 8_000_000
+
+# Rows ``top`` to ``top + image.height`` of a canvas ``height`` rows tall.
+Band = namedtuple("Band", "image top height")
+
+
+def image_of(canvas):
+    """The PIL image behind an image or a ``Band``."""
+    return canvas.image if isinstance(canvas, Band) else canvas
+
+
+def _shift(xy, dy):
+    """Move ``ImageDraw`` coordinates (points or a flat list) up by ``dy``."""
+    xy = list(xy)
+    if xy and isinstance(xy[0], (tuple, list)):
+        return [(x, y - dy) for x, y in xy]
+    return [v - dy if i % 2 else v for i, v in enumerate(xy)]
+
+
+class _BandDraw:
+    """``ImageDraw`` on a band, taking full-canvas coordinates."""
+
+    def __init__(self, band):
+        self._draw = ImageDraw.Draw(band.image)
+        self._top = band.top
+
+    def __getattr__(self, name):
+        # Anything not wrapped here would draw at band, not canvas, rows
+        raise AttributeError(f"{name!r} is not supported when drawing in bands")
+
+    def textlength(self, *args, **kwargs):
+        return self._draw.textlength(*args, **kwargs)
+
+    def textbbox(self, xy, *args, **kwargs):
+        x0, y0, x1, y1 = self._draw.textbbox((xy[0], xy[1] - self._top), *args, **kwargs)
+        return x0, y0 + self._top, x1, y1 + self._top
+
+    def line(self, xy, *args, **kwargs):
+        return self._draw.line(_shift(xy, self._top), *args, **kwargs)
+
+    def polygon(self, xy, *args, **kwargs):
+        return self._draw.polygon(_shift(xy, self._top), *args, **kwargs)
+
+    def rectangle(self, xy, *args, **kwargs):
+        return self._draw.rectangle(_shift(xy, self._top), *args, **kwargs)
+
+    def ellipse(self, xy, *args, **kwargs):
+        return self._draw.ellipse(_shift(xy, self._top), *args, **kwargs)
+
+    def text(self, xy, *args, **kwargs):
+        return self._draw.text((xy[0], xy[1] - self._top), *args, **kwargs)
+
+
+def draw_for(canvas):
+    """An ``ImageDraw`` for an image, or one for a ``Band`` in canvas coordinates."""
+    return _BandDraw(canvas) if isinstance(canvas, Band) else ImageDraw.Draw(canvas)
+
+
+def _stamp(canvas, bbox, color, paint, factor=SUPERSAMPLE):
+    """Paint a shape at ``factor``x inside ``bbox`` and composite it onto ``canvas``.
+
+    ``paint(draw, to_mask, factor)`` draws in white on the supersampled mask;
+    ``to_mask`` maps a list of output-pixel points to mask coordinates.
+    """
+    img = image_of(canvas)
+    top, height = (canvas.top, canvas.height) if isinstance(canvas, Band) else (0, img.height)
+    x0 = max(0, math.floor(bbox[0]) - 1)
+    y0 = max(0, math.floor(bbox[1]) - 1)
+    x1 = min(img.width, math.ceil(bbox[2]) + 2)
+    y1 = min(height, math.ceil(bbox[3]) + 2)
+    # Rows of the shape inside this band (all of them on a plain image)
+    band_y0, band_y1 = max(y0, top), min(y1, top + img.height)
+    if x1 <= x0 or band_y1 <= band_y0:
+        return
+    while factor > 1 and (x1 - x0) * (y1 - y0) * factor * factor > MAX_MASK_PIXELS:
+        factor -= 1
+
+    def to_mask(points):
+        return [((x - x0 + 0.5) * factor - 0.5, (y - y0 + 0.5) * factor - 0.5) for x, y in points]
+
+    # The mask always covers the whole shape: ImageDraw's rasterizer moves
+    # pixels when a line is clipped at a different edge, so masking only a
+    # band's rows would not match the same shape painted whole.
+    mask = Image.new("L", ((x1 - x0) * factor, (y1 - y0) * factor), 0)
+    paint(ImageDraw.Draw(mask), to_mask, factor)
+    if factor > 1:
+        mask = mask.reduce(factor)
+    if (band_y0, band_y1) != (y0, y1):
+        mask = mask.crop((0, band_y0 - y0, x1 - x0, band_y1 - y0))
+    if img.mode == "RGBA":
+        layer = Image.new("RGBA", mask.size, tuple(color[:3]) + (255,))
+        layer.putalpha(mask)
+        img.alpha_composite(layer, (x0, band_y0 - top))
+    else:
+        img.paste(tuple(color), (x0, band_y0 - top, x1, band_y1 - top), mask)
+
+
+def _bounds(points, pad):
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+
+def rays(img, center, ends, color, width=1):
+    """Lines from ``center`` to every point in ``ends``, drawn as one polyline."""
+    if not ends:
+        return
+    path = [center]
+    for end in ends:
+        path += [end, center]
+
+    def paint(draw, to_mask, factor):
+        draw.line(to_mask(path), fill=255, width=max(1, round(width * factor)))
+
+    _stamp(img, _bounds(path, width), color, paint)
+
+
+def _ray_ends(center, radius, angles):
+    cx, cy = center
+    return [(cx + radius * math.cos(a), cy + radius * math.sin(a)) for a in angles]
+
+
+def sunburst(img, center, radius, color, num_rays=24, width=2, start=0.0):
+    """Rays evenly spaced around a full circle, the first at angle ``start``."""
+    angles = [start + 2 * math.pi * i / num_rays for i in range(num_rays)]
+    rays(img, center, _ray_ends(center, radius, angles), color, width)
+
+
+def fan(img, center, radius, color, num_rays=9, width=2, direction="up"):
+    """A half sunburst; ``direction`` is "up" or "down", end rays included."""
+    start = math.pi if direction == "up" else 0.0
+    angles = [start + math.pi * i / (num_rays - 1) for i in range(num_rays)]
+    rays(img, center, _ray_ends(center, radius, angles), color, width)
+
+
+def corner_fan(img, corner, radius, color, num_rays=5, width=2, flip_h=False, flip_v=False):
+    """A quarter fan opening from a corner into the frame."""
+    sx = -1 if flip_h else 1
+    sy = -1 if flip_v else 1
+    ends = [(corner[0] + sx * radius * math.cos(a), corner[1] + sy * radius * math.sin(a))
+            for a in (math.pi / 2 * i / (num_rays - 1) for i in range(num_rays))]
+    rays(img, corner, ends, color, width)
+
+
+def ring(img, center, radius, color, width=1):
+    """A circle outline of ``width`` pixels centered on ``radius``."""
+    cx, cy = center
+    r = radius + width / 2
+    box = (cx - r, cy - r, cx + r, cy + r)
+
+    def paint(draw, to_mask, factor):
+        (ax, ay), (bx, by) = to_mask([box[:2], box[2:]])
+        draw.ellipse([ax, ay, bx, by], outline=255, width=max(1, round(width * factor)))
+
+    _stamp(img, box, color, paint)
+
+
+def diamonds(img, centers, size, color):
+    """Filled diamonds of half-diagonal ``size`` at every point in ``centers``."""
+    centers = list(centers)
+    if not centers:
+        return
+    shapes = [[(x, y - size), (x + size, y), (x, y + size), (x - size, y)] for x, y in centers]
+
+    def paint(draw, to_mask, factor):
+        for shape in shapes:
+            draw.polygon(to_mask(shape), fill=255)
+
+    _stamp(img, _bounds(centers, size), color, paint)
+
+
+def chevrons(img, y_start, y_end, width, color, spacing=20, line_width=1):
+    """Rows of zigzag lines across ``width`` pixels."""
+    rows = []
+    for y in range(y_start, y_end, spacing):
+        row = []
+        for x in range(0, width, spacing):
+            row += [(x, y), (x + spacing // 2, y + spacing // 2)]
+        rows.append(row)
+    if not rows:
+        return
+
+    def paint(draw, to_mask, factor):
+        for row in rows:
+            draw.line(to_mask(row), fill=255, width=max(1, round(line_width * factor)))
+
+    _stamp(img, _bounds([p for row in rows for p in row], line_width), color, paint)
@@ -0,0 +1,30 @@
+"""Downsampling pyramid: derive many output sizes from one supersampled master."""
+
+from PIL import Image
+
+
+def pyramid(master, sizes):
+    """Return ``{size: image}`` for every (w, h) in ``sizes``.
+
+    Sizes are produced largest first, each from the smallest level already
+    made that is at least as large, so every reduction starts from the
+    nearest level instead of the full master. Exact integer ratios use
+    ``reduce()`` (a box filter, ideal for supersampled artwork); others use
+    Lanczos.
+    """
+    levels = [master]
+    out = {}
+    for size in sorted(set(map(tuple, sizes)), key=lambda s: s[0] * s[1], reverse=True):
+        w, h = size
+        src = min((lvl for lvl in levels if lvl.width >= w and lvl.height >= h),
+                  key=lambda lvl: lvl.width * lvl.height)
+        fx, fy = src.width / w, src.height / h
+        if src.size == size:
+            img = src.copy()
+        elif fx == fy and fx.is_integer():
+            img = src.reduce(int(fx))
+        else:
+            img = src.resize(size, Image.LANCZOS, reducing_gap=2.0)
+        levels.append(img)
+        out[size] = img
+    return out
@@ -0,0 +1,124 @@
+"""Render store asset jobs across a process pool."""
+
+import os
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from assetgen import encode, trace
+from assetgen.cache import BuildCache, file_digest, job_key
+from assetgen.jobs import outputs, run_job
+from assetgen.resize_cache import RESIZE_CACHE
+
+JobResult = namedtuple("JobResult", "name output seconds resize_stats encode_stats trace")
+
+
+def _timed(job):
+    """Run a job in the current process and time it."""
+    before, encoded = RESIZE_CACHE.stats(), encode.stats()
+    start = time.perf_counter()
+    with trace.span(job.name, "job", func=job.func):
+        output = run_job(job)
+    seconds = time.perf_counter() - start
+    after, encoded_after = RESIZE_CACHE.stats(), encode.stats()
+    return JobResult(job.name, output, seconds, {k: after[k] - before[k] for k in after},
+                     {k: encoded_after[k] - encoded[k] for k in encoded}, trace.drain())
+
+
+def default_workers():
+    """One worker per CPU."""
+    return os.cpu_count() or 1
+
+
+def render_jobs(jobs, workers=None):
+    """Render every job and return their results in job order.
+
+    Each job writes its own output file, so the files produced are the same
+    whatever the worker count or completion order. ``workers=1`` renders in
+    this process without starting a pool.
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(jobs) <= 1:
+        return [_timed(job) for job in jobs]
+    workers = min(workers, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers, initializer=encode.share_cpus, initargs=(workers,)) as pool:
+        return list(pool.map(_timed, jobs))
+
+
+def build(jobs, workers=None, cache=None, force=False, runner=None):
+    """Render only the jobs whose inputs changed since the last build.
+
+    ``runner(jobs, workers)`` renders the stale jobs (default:
+    ``render_jobs``; see also ``assetgen.pipeline.run``). Returns
+    ``(results, skipped)``: timings for the jobs that ran and the jobs that
+    were already up to date.
+    """
+    cache = cache or BuildCache()
+    keys = [job_key(job) for job in jobs]
+    stale = [(job, key) for job, key in zip(jobs, keys) if force or not cache.is_fresh(job, key)]
+    skipped = [job for job, key in zip(jobs, keys) if (job, key) not in stale]
+    results = (runner or render_jobs)([job for job, _ in stale], workers)
+    for job, key in stale:
+        cache.record(job, key)
+    cache.save()
+    if trace.enabled():
+        for r in results:
+            trace.collect(r.trace)
+    return results, skipped
+
+
+def check_stable(jobs, workers=None, cache=None):
+    """Re-render cached jobs into a scratch directory and compare digests.
+
+    Returns ``(name, recorded_sha256, new_sha256)`` for every output of every
+    job that has a cache entry; matching digests mean the render and encode
+    are byte-stable.
+    """
+    cache = cache or BuildCache()
+    cached = [job for job in jobs if cache.lookup(job)]
+    with tempfile.TemporaryDirectory() as scratch:
+        retargeted = [retarget(job, scratch) for job in cached]
+        render_jobs(retargeted, workers)
+        report = []
+        for job, new in zip(cached, retargeted):
+            recorded = cache.lookup(job)["outputs"]
+            for old_path, new_path in zip(outputs(job), outputs(new)):
+                report.append((os.path.basename(old_path),
+                               recorded[os.path.abspath(old_path)]["sha256"], file_digest(new_path)))
+        return report
+
+
+def retarget(job, directory):
+    """The same job writing its output(s) under ``directory`` instead."""
+    output_dir = job.kwargs.get("output_dir")
+
+    def move(path):
+        rel = os.path.relpath(path, output_dir) if output_dir else os.path.basename(path)
+        return os.path.join(directory, rel)
+
+    output = tuple(map(move, job.output)) if isinstance(job.output, tuple) else move(job.output)
+    return job._replace(kwargs=dict(job.kwargs, output_dir=directory), output=output)
+
+
+def print_report(results, wall_seconds, skipped=()):
+    """Print the per-job timings and the overall wall time."""
+    width = max([len(r.name) for r in results] + [len(j.name) for j in skipped], default=0)
+    print("\nRender times:")
+    for r in results:
+        output = r.output if isinstance(r.output, str) else f"{len(r.output)} files"
+        print(f"  {r.name:<{width}}  {r.seconds:6.2f}s  {output}")
+    for job in skipped:
+        print(f"  {job.name:<{width}}  up to date")
+    resize = {k: sum(r.resize_stats[k] for r in results) for k in RESIZE_CACHE.stats()}
+    if any(resize.values()):
+        print(f"  resize cache: {resize['hits']} memory hits, {resize['disk_hits']} disk hits,"
+              f" {resize['misses']} misses")
+    png = {k: sum(r.encode_stats[k] for r in results) for k in encode.stats()}
+    if png["files"]:
+        saved = png["baseline_bytes"] - png["bytes"]
+        print(f"  png encode: {png['files']} files, {png['bytes'] / 1024:.1f}KB,"
+              f" saved {saved / 1024:.1f}KB over default settings")
+    busy = sum(r.seconds for r in results)
+    print(f"  {len(results)} jobs, {busy:.2f}s of rendering in {wall_seconds:.2f}s wall time"
+          f" ({len(skipped)} up to date)")
@@ -0,0 +1,136 @@
+"""Decode-once resize cache for raw screenshots.
+
+Resizing a 1200x2670 capture with Lanczos dominates a screenshot render, and
+the same capture is resized to the same size for every caption edit, locale
+and re-run. ``ResizeCache`` keys each result by (source SHA-256, target size,
+filter) and keeps it in memory (LRU) and, optionally, as a PNG on disk so a
+later process can skip the decode and resize entirely.
+
+On a miss the source is pre-shrunk cheaply before the final filter pass:
+``Image.draft`` lets the JPEG decoder drop resolution while decoding, and
+``reducing_gap`` makes Pillow ``reduce()`` by an integer factor first when
+the target is at least ``REDUCING_GAP`` times smaller than the source.
+
+The cache is thread-safe. Threads wanting the same resize wait for the one
+that is decoding it instead of decoding it again (on a fixed pool of striped
+locks, so two different resizes occasionally wait for each other too).
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from assetgen import trace
+from assetgen.cache import CACHE_DIR, input_digest
+
+log = logging.getLogger(__name__)
+
+# Per-key work is serialized on one of this many locks, picked by key hash,
+# so the lock table stays fixed however many keys a long-lived process sees.
+KEY_LOCKS = 64
+
+# Pillow documents 3.0 as indistinguishable from a plain resize in most cases.
+REDUCING_GAP = 3.0
+
+
+def _decode_resized(path, size, resample):
+    """Decode ``path`` and resize it. The full-size decode is freed on return,
+    before the caller goes on to encode or composite the result."""
+    with Image.open(path) as raw:
+        raw.draft(raw.mode, tuple(size))  # no-op for formats other than JPEG
+        return raw.resize(tuple(size), resample, reducing_gap=REDUCING_GAP)
+
+
+class ResizeCache:
+    """Memory and disk cache of resized images."""
+
+    def __init__(self, cache_dir=None, max_items=32):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCKS)]
+        self._local = threading.local()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _count(self, kind):
+        """Count a lookup in the totals and in this thread's own counts."""
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+        counts = self.thread_stats()
+        counts[kind] += 1
+
+    def _disk_path(self, key):
+        digest, (w, h), resample = key
+        return os.path.join(self.cache_dir, f"{digest[:32]}_{w}x{h}_{int(resample)}.png")
+
+    def _remember(self, key, img):
+        with self._lock:
+            self._memory[key] = img
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _cached(self, key):
+        with self._lock:
+            img = self._memory.get(key)
+            if img is not None:
+                self._memory.move_to_end(key)
+            return img
+
+    def resize(self, path, size, resample=Image.LANCZOS):
+        """Return ``path`` resized to ``size``. The result is shared: do not draw on it."""
+        with trace.span("resize", size=f"{size[0]}x{size[1]}") as span:
+            img, source = self._resize(path, size, resample)
+            if span is not None:
+                span.args["source"] = source
+        return img
+
+    def _resize(self, path, size, resample):
+        key = (input_digest(path), tuple(size), resample)
+        with self._key_locks[hash(key) % KEY_LOCKS]:
+            img = self._cached(key)
+            if img is not None:
+                self._count("hits")
+                return img, "memory"
+
+            disk_path = self._disk_path(key) if self.cache_dir else None
+            if disk_path and os.path.isfile(disk_path):
+                self._count("disk_hits")
+                with Image.open(disk_path) as cached:
+                    img = cached.copy()
+                self._remember(key, img)
+                return img, "disk"
+
+            self._count("misses")
+            img = _decode_resized(path, size, resample)
+            self._remember(key, img)
+            if disk_path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = f"{disk_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                img.save(tmp, "PNG", compress_level=1)
+                os.replace(tmp, disk_path)
+            return img, "decode"
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+    def thread_stats(self):
+        """The counts for lookups made on the calling thread (a live dict)."""
+        if not hasattr(self._local, "counts"):
+            self._local.counts = {"hits": 0, "disk_hits": 0, "misses": 0}
+        return self._local.counts
+
+    def clear(self):
+        """Drop the in-memory entries (the disk cache is left alone)."""
+        with self._lock:
+            self._memory.clear()
+
+
+# Shared by the generators in this process.
+RESIZE_CACHE = ResizeCache(os.environ.get("ASSETGEN_RESIZE_CACHE", os.path.join(CACHE_DIR, "resized")))
@@ -0,0 +1,179 @@
+"""Sharded rendering across machines, merged through a shared directory.
+
+``render-all --shard i/N`` renders one of N deterministic slices of the job
+list: the jobs sorted by name, every Nth one starting at the ith. Each shard
+renders into its own ``shard-<i>-of-<N>/`` under the shared directory, with
+its own build cache, and writes ``shard-<i>-of-<N>.json`` next to it. That
+partial manifest holds the name of every job in the full matrix, a
+fingerprint of the matrix, and the SHA-256, size and render time of each
+output the shard owns.
+
+``merge`` reads the partial manifests. It checks that all N shards reported,
+that they agree on the matrix, that every job was rendered exactly once, and
+that every output on disk still has its recorded hash. Only then does it
+copy the outputs into the final directory and write ``merged.json``.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import socket
+import time
+
+from assetgen.cache import CACHE_DIR, BuildCache, file_digest, write_json
+from assetgen.jobs import outputs
+from assetgen.render import build, retarget
+
+MANIFEST_VERSION = 1
+SHARD_DIR = os.path.join(CACHE_DIR, "shards")
+MERGED_NAME = "merged.json"
+_MANIFEST = re.compile(r"shard-(\d+)-of-(\d+)\.json$")
+
+
+def parse(spec):
+    """``"2/4"`` -> ``(2, 4)``; shards are numbered from 1."""
+    match = re.fullmatch(r"(\d+)/(\d+)", spec.strip())
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"shard must be i/N with 1 <= i <= N, got {spec!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def select(jobs, shard):
+    """The jobs shard ``(i, N)`` owns: every Nth by name, starting at the ith."""
+    index, count = shard
+    return [job for k, job in enumerate(sorted(jobs, key=lambda j: j.name)) if k % count == index - 1]
+
+
+def name(shard):
+    return f"shard-{shard[0]}-of-{shard[1]}"
+
+
+def layout(job):
+    """A job's output paths relative to whatever directory it renders into."""
+    return [os.path.normpath(path) for path in outputs(retarget(job, os.curdir))]
+
+
+def fingerprint(jobs):
+    """Hash of the job names and output layout, equal on every shard of one matrix."""
+    matrix = sorted((job.name, layout(job)) for job in jobs)
+    return hashlib.sha256(json.dumps(matrix).encode()).hexdigest()
+
+
+def run_shard(jobs, shard, shard_dir=None, workers=None, force=False, runner=None):
+    """Render shard ``(i, N)`` of ``jobs`` and write its partial manifest.
+
+    Returns ``(results, skipped, manifest_path)`` with results and skipped as
+    from ``render.build``.
+    """
+    shard_dir = shard_dir or SHARD_DIR
+    staging = os.path.join(shard_dir, name(shard))
+    os.makedirs(staging, exist_ok=True)
+    mine = [retarget(job, staging) for job in select(jobs, shard)]
+    cache = BuildCache(os.path.join(CACHE_DIR, f"build-{name(shard)}.json"))
+    start = time.perf_counter()
+    results, skipped = build(mine, workers, cache, force=force, runner=runner)
+    wall = time.perf_counter() - start
+    seconds = {r.name: r.seconds for r in results}
+    entries = {}
+    for job in mine:
+        entries[job.name] = {
+            "seconds": seconds.get(job.name),
+            "outputs": {os.path.relpath(path, staging): {"sha256": file_digest(path), "bytes": os.path.getsize(path)}
+                        for path in outputs(job)},
+        }
+    manifest_path = os.path.join(shard_dir, name(shard) + ".json")
+    write_json(manifest_path, {
+        "version": MANIFEST_VERSION, "shard": list(shard), "host": socket.gethostname(),
+        "fingerprint": fingerprint(jobs), "matrix": sorted(job.name for job in jobs),
+        "wall_seconds": wall, "jobs": entries,
+    })
+    return results, skipped, manifest_path
+
+
+def load_manifests(shard_dir, count=None):
+    """``{(i, N): manifest}`` for the partial manifests in ``shard_dir``.
+
+    With ``count``, only manifests of an N-way split are read.
+    """
+    found = {}
+    for path in sorted(glob.glob(os.path.join(shard_dir, "shard-*-of-*.json"))):
+        match = _MANIFEST.search(path)
+        if match and (count is None or int(match.group(2)) == count):
+            with open(path) as f:
+                found[(int(match.group(1)), int(match.group(2)))] = json.load(f)
+    return found
+
+
+def check(shard_dir, manifests):
+    """Problems that stop a merge, as a list of messages."""
+    if not manifests:
+        return [f"no shard manifests in {shard_dir}"]
+    counts = {count for _, count in manifests}
+    if len(counts) > 1:
+        return [f"manifests from {len(counts)} different splits ({', '.join(map(str, sorted(counts)))} shards);"
+                " pass --shards or clear the directory"]
+    count = counts.pop()
+    problems = [f"{name((i, count))}: missing" for i in range(1, count + 1) if (i, count) not in manifests]
+    reference = manifests[min(manifests)]
+    owners = {}
+    for shard, manifest in sorted(manifests.items()):
+        if manifest.get("version") != MANIFEST_VERSION:
+            problems.append(f"{name(shard)}: manifest version {manifest.get('version')}, expected {MANIFEST_VERSION}")
+            continue
+        if manifest["fingerprint"] != reference["fingerprint"]:
+            problems.append(f"{name(shard)}: rendered a different job matrix (from {manifest['host']})")
+        for job_name, entry in manifest["jobs"].items():
+            owners.setdefault(job_name, []).append(shard)
+            for rel, recorded in entry["outputs"].items():
+                path = os.path.join(shard_dir, name(shard), rel)
+                if not os.path.isfile(path):
+                    problems.append(f"{name(shard)}: {rel} is missing")
+                elif file_digest(path) != recorded["sha256"]:
+                    problems.append(f"{name(shard)}: {rel} changed since the shard wrote it")
+    for job_name in reference["matrix"]:
+        if job_name not in owners:
+            problems.append(f"{job_name}: not rendered by any shard")
+        elif len(owners[job_name]) > 1:
+            problems.append(f"{job_name}: rendered by {', '.join(name(s) for s in owners[job_name])}")
+    problems += [f"{job_name}: not in the job matrix" for job_name in owners if job_name not in reference["matrix"]]
+    return problems
+
+
+def merge(shard_dir=None, out_dir=None, count=None):
+    """Check the shards and copy their outputs into ``out_dir``.
+
+    Returns ``(manifests, problems)``; nothing is copied when there are problems.
+    """
+    shard_dir = shard_dir or SHARD_DIR
+    out_dir = out_dir or os.path.join(shard_dir, "merged")
+    manifests = load_manifests(shard_dir, count)
+    problems = check(shard_dir, manifests)
+    if problems:
+        return manifests, problems
+    merged = {}
+    for shard, manifest in sorted(manifests.items()):
+        for job_name, entry in manifest["jobs"].items():
+            for rel, recorded in entry["outputs"].items():
+                target = os.path.join(out_dir, rel)
+                if not (os.path.isfile(target) and file_digest(target) == recorded["sha256"]):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    tmp = f"{target}.{os.getpid()}.tmp"
+                    shutil.copyfile(os.path.join(shard_dir, name(shard), rel), tmp)
+                    os.replace(tmp, target)
+            merged[job_name] = dict(entry, shard=list(shard), host=manifest["host"])
+    write_json(os.path.join(shard_dir, MERGED_NAME), {
+        "version": MANIFEST_VERSION, "fingerprint": manifests[min(manifests)]["fingerprint"],
+        "out": os.path.abspath(out_dir), "jobs": merged,
+    })
+    return manifests, problems
+
+
+def print_shards(manifests):
+    """Jobs rendered, up to date and time per shard, to judge the balance."""
+    for shard, manifest in sorted(manifests.items()):
+        times = [entry["seconds"] for entry in manifest["jobs"].values() if entry["seconds"] is not None]
+        print(f"  {name(shard)} on {manifest['host']}: {len(manifest['jobs'])} jobs, {len(times)} rendered,"
+              f" {sum(times):.2f}s of rendering in {manifest['wall_seconds']:.2f}s wall time")
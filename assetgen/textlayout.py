@@ -0,0 +1,86 @@
+"""Cached text measurement and rasterization.
+
+The generators measure every string before drawing it (to center it, or to
+shrink a caption until it fits) and then draw it, sometimes twice for a drop
+shadow, and they do it again for every output, size and locale. Here each
+(text, font) pair is measured once and rasterized once into an alpha mask;
+drawing pastes the fill color through that mask, and a shadow is the same
+mask pasted again at an offset. Fonts come from ``assetgen.fonts``, which
+caches one object per face and size, so the font object stands for its size.
+
+On RGB images, pasting through the mask gives exactly the pixels
+``ImageDraw.text`` would. On RGBA images the text is alpha-composited instead,
+as the primitives are: ``ImageDraw`` blends the alpha channel like a color,
+which leaves dark fringes on text drawn over transparent pixels. Like the
+primitives, ``draw`` also accepts a ``primitives.Band``.
+"""
+
+import functools
+
+from PIL import Image, ImageDraw
+
+from assetgen import primitives
+
+_MEASURE = ImageDraw.Draw(Image.new("L", (1, 1)))
+
+
+@functools.lru_cache(maxsize=4096)
+def bbox(text, font):
+    """``ImageDraw.textbbox`` of ``text`` drawn at the origin."""
+    return _MEASURE.textbbox((0, 0), text, font=font)
+
+
+def width(text, font):
+    x0, _, x1, _ = bbox(text, font)
+    return x1 - x0
+
+
+def height(text, font):
+    _, y0, _, y1 = bbox(text, font)
+    return y1 - y0
+
+
+@functools.lru_cache(maxsize=512)
+def mask(text, font):
+    """``(mask, (dx, dy))``: the text's coverage as an L image, and the offset
+    of its top-left corner from the point the text is drawn at."""
+    x0, y0, x1, y1 = bbox(text, font)
+    img = Image.new("L", (max(1, x1 - x0), max(1, y1 - y0)), 0)
+    ImageDraw.Draw(img).text((-x0, -y0), text, font=font, fill=255)
+    return img, (x0, y0)
+
+
+def draw(canvas, xy, text, font, fill, shadow=None, offset=2):
+    """Draw ``text`` at ``xy`` as ``ImageDraw.text`` would.
+
+    With a ``shadow`` color, the text is first pasted in that color
+    ``offset`` pixels down and to the right.
+    """
+    coverage, (dx, dy) = mask(text, font)
+    img = primitives.image_of(canvas)
+    top = canvas.top if isinstance(canvas, primitives.Band) else 0
+    x, y = xy[0] + dx, xy[1] + dy - top
+    if shadow is not None:
+        _paint(img, coverage, shadow, x + offset, y + offset)
+    _paint(img, coverage, fill, x, y)
+
+
+def _paint(img, coverage, color, x, y):
+    """Fill ``color`` through ``coverage`` with its corner at (x, y)."""
+    w, h = coverage.size
+    if img.mode != "RGBA":
+        img.paste(tuple(color), (x, y, x + w, y + h), coverage)
+        return
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, img.width), min(y + h, img.height)
+    if x1 <= x0 or y1 <= y0:
+        return
+    layer = Image.new("RGBA", (x1 - x0, y1 - y0), tuple(color[:3]) + (255,))
+    layer.putalpha(coverage.crop((x0 - x, y0 - y, x1 - x, y1 - y)))
+    img.alpha_composite(layer, (x0, y0))
+
+
+def draw_centered(canvas, text, y, font, fill, canvas_width, shadow=None, offset=2):
+    """Draw ``text`` horizontally centered on a canvas ``canvas_width`` wide."""
+    draw(canvas, ((canvas_width - width(text, font)) // 2, y), text, font, fill, shadow, offset)
+
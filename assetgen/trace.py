@@ -0,0 +1,208 @@
+"""Opt-in stage tracing for the asset generators.
+
+Set ``ASSETGEN_TRACE=<path>`` (or pass ``--trace <path>`` to ``render-all``
+or ``build``) to record a timing span for every logical stage: background,
+ornaments, text, resize, frame, composite, encode, and the job around them. Code
+that wraps a block uses ``span``; straight-line drawing code is split into
+stages with ``phases`` instead, so it need not be re-indented. A ``.csv``
+path writes a flat table; anything else writes Chrome trace JSON, which
+chrome://tracing and Perfetto open directly. Each span also records how many
+``ImageDraw`` calls ran inside it and the process's peak RSS when it ended.
+
+Tracing is off by default. Then ``span`` and ``phases`` return shared no-op
+objects and ``ImageDraw`` is left unpatched, so the instrumentation costs a
+function call per stage.
+"""
+
+import contextlib
+import csv
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+from PIL import ImageDraw
+
+TRACE_PATH = os.environ.get("ASSETGEN_TRACE") or None
+
+# ImageDraw methods counted as draw calls
+DRAW_METHODS = ("arc", "bitmap", "chord", "ellipse", "line", "multiline_text", "pieslice",
+                "point", "polygon", "rectangle", "regular_polygon", "rounded_rectangle", "text")
+
+_NULL = contextlib.nullcontext()
+_local = threading.local()
+_events = []      # finished spans in this process, drained after each job
+_collected = []   # spans gathered from every process, in the parent
+_patched = False
+
+
+def enabled():
+    return TRACE_PATH is not None
+
+
+def enable(path):
+    """Turn tracing on here and in worker processes started from now on."""
+    global TRACE_PATH
+    TRACE_PATH = path
+    os.environ["ASSETGEN_TRACE"] = path
+    _patch_draw()
+
+
+def max_rss_mb():
+    """Peak resident memory of this process so far, in MB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class _Span:
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.draw_calls = 0
+
+    def __enter__(self):
+        _stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        stack = _stack()
+        # Drop anything an exception left open inside this span
+        while stack and stack.pop() is not self:
+            pass
+        if stack:
+            stack[-1].draw_calls += self.draw_calls
+        _events.append({
+            "name": self.name, "cat": self.category, "ph": "X",
+            "ts": self.start / 1000, "dur": (end - self.start) / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident() % 1_000_000,
+            "args": dict(self.args, draw_calls=self.draw_calls, depth=len(stack),
+                         max_rss_mb=round(max_rss_mb(), 1)),
+        })
+        return False
+
+
+def span(name, category="stage", **args):
+    """Time a block as ``name``. A no-op unless tracing is enabled."""
+    if TRACE_PATH is None:
+        return _NULL
+    _patch_draw()
+    return _Span(name, category, args)
+
+
+class _Phases:
+    """Consecutive spans over straight-line drawing code; see ``phases``."""
+
+    def __init__(self, category):
+        self.category = category
+        self.current = None
+
+    def __call__(self, name, **args):
+        self.close()
+        self.current = _Span(name, self.category, args).__enter__()
+
+    def close(self):
+        if self.current is not None:
+            self.current.__exit__(None, None, None)
+            self.current = None
+
+
+class _NullPhases:
+    def __call__(self, name, **args):
+        pass
+
+    def close(self):
+        pass
+
+
+_NULL_PHASES = _NullPhases()
+
+
+def phases(category="stage"):
+    """Split a block into back-to-back stages without re-indenting it.
+
+    ``phase = trace.phases()``, then ``phase("background")``,
+    ``phase("text")``, ... each end the previous stage and start the next;
+    ``phase.close()`` ends the last one.
+    """
+    if TRACE_PATH is None:
+        return _NULL_PHASES
+    _patch_draw()
+    return _Phases(category)
+
+
+def _counted(method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        stack = _stack()
+        if stack:
+            stack[-1].draw_calls += 1
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def _patch_draw():
+    """Count ImageDraw calls. Only installed once tracing is on."""
+    global _patched
+    if _patched:
+        return
+    _patched = True
+    for name in DRAW_METHODS:
+        method = getattr(ImageDraw.ImageDraw, name, None)
+        if method is not None:
+            setattr(ImageDraw.ImageDraw, name, _counted(method))
+
+
+def drain():
+    """Return and forget the spans recorded in this process so far."""
+    events = list(_events)
+    del _events[:]
+    return events
+
+
+def collect(events):
+    """Add spans returned by a worker (or this process) to the export."""
+    _collected.extend(events)
+
+
+def save(path=None):
+    """Write every collected span to ``path`` (default: ``ASSETGEN_TRACE``)."""
+    path = path or TRACE_PATH
+    if not path:
+        return None
+    collect(drain())
+    events = sorted(_collected, key=lambda e: e["ts"])
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "category", "pid", "tid", "depth", "start_ms", "duration_ms",
+                             "draw_calls", "max_rss_mb", "args"])
+            origin = events[0]["ts"] if events else 0
+            for e in events:
+                args = dict(e["args"])
+                extra = {k: v for k, v in args.items() if k not in ("depth", "draw_calls", "max_rss_mb")}
+                writer.writerow([e["name"], e["cat"], e["pid"], e["tid"], args["depth"],
+                                 f"{(e['ts'] - origin) / 1000:.3f}", f"{e['dur'] / 1000:.3f}",
+                                 args["draw_calls"], args["max_rss_mb"],
+                                 json.dumps(extra, sort_keys=True) if extra else ""])
+    else:
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+if TRACE_PATH:
+    _patch_draw()
@@ -0,0 +1,213 @@
+"""WebP and AVIF variants of the PNG outputs, at the smallest passing quality.
+
+For each PNG master and format, every quality in ``QUALITIES`` is encoded in
+memory on a thread pool (Pillow's encoders release the GIL), and the
+smallest encoding whose ``ssim`` against the master is at least
+``TARGET_SSIM`` is written next to the PNG (``icon_512x512.webp``). If none
+passes, the highest quality is kept. The choice is cached in
+``.asset-cache/variants.json`` by the master's SHA-256, format and target:
+a later build writes nothing if the variant is still on disk, and encodes
+once at the cached quality, without searching, if it is not.
+
+``ssim`` uses only Pillow: the mean structural similarity of the two
+luminance planes (and alpha planes, if any) over ``WINDOW``-pixel blocks,
+with block means, and the final mean, taken by box resizing float planes.
+(``ImageStat`` bins float images into 256 buckets, so it cannot be used.)
+"""
+
+import io
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageMath, features
+
+from assetgen.cache import CACHE_DIR, input_digest, write_json
+
+# Bump to search again after a change the cache key cannot see.
+VARIANTS_VERSION = 1
+
+TARGET_SSIM = float(os.environ.get("ASSETGEN_TARGET_SSIM", "0.98"))
+QUALITIES = (20, 30, 40, 50, 60, 70, 80, 90, 95)
+WINDOW = 8
+# SSIM stabilizers for 8-bit planes: (0.01 * 255) ** 2 and (0.03 * 255) ** 2
+C1 = 6.5025
+C2 = 58.5225
+# format -> (extension, Pillow feature name, save options besides quality)
+FORMATS = {
+    "webp": (".webp", "webp", {"method": 6}),
+    "avif": (".avif", "avif", {"speed": 6}),
+}
+
+# The chosen encoding of one master in one format; seconds: time to decode
+Variant = namedtuple("Variant", "master path format quality ssim bytes png_bytes decode_seconds png_decode_seconds"
+                                " searched")
+
+
+def available(fmt):
+    """Whether this Pillow build can write ``fmt``."""
+    return features.check(FORMATS[fmt][1])
+
+
+def variant_path(master, fmt):
+    return os.path.splitext(master)[0] + FORMATS[fmt][0]
+
+
+def _planes(img):
+    """The float planes SSIM is taken over: luminance, plus alpha if present."""
+    planes = [img.convert("L").convert("F")]
+    if "A" in img.getbands():
+        planes.append(img.getchannel("A").convert("F"))
+    return planes
+
+
+def _plane_ssim(x, y):
+    size = (max(1, x.width // WINDOW), max(1, x.height // WINDOW))
+
+    def mean(expr):
+        return ImageMath.lambda_eval(expr, x=x, y=y).resize(size, Image.BOX)
+
+    mx, my = mean(lambda a: a["x"]), mean(lambda a: a["y"])
+    xx, yy, xy = mean(lambda a: a["x"] * a["x"]), mean(lambda a: a["y"] * a["y"]), mean(lambda a: a["x"] * a["y"])
+    ssim_map = ImageMath.lambda_eval(
+        lambda a: (2 * a["mx"] * a["my"] + C1) * (2 * (a["xy"] - a["mx"] * a["my"]) + C2)
+        / ((a["mx"] * a["mx"] + a["my"] * a["my"] + C1)
+           * (a["xx"] - a["mx"] * a["mx"] + a["yy"] - a["my"] * a["my"] + C2)),
+        mx=mx, my=my, xx=xx, yy=yy, xy=xy)
+    return ssim_map.resize((1, 1), Image.BOX).getpixel((0, 0))
+
+
+def ssim(a, b):
+    """Mean SSIM of two same-sized images; the worst plane counts."""
+    return min(_plane_ssim(x, y) for x, y in zip(_planes(a), _planes(b)))
+
+
+def encode(img, fmt, quality):
+    buf = io.BytesIO()
+    img.save(buf, fmt.upper(), quality=quality, **FORMATS[fmt][2])
+    return buf.getvalue()
+
+
+def decode_seconds(data, repeat=3):
+    """Best time to fully decode an encoded image."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _trial(master, fmt, quality):
+    data = encode(master, fmt, quality)
+    with Image.open(io.BytesIO(data)) as decoded:
+        score = ssim(master, decoded.convert(master.mode))
+    return quality, data, score
+
+
+def search(master, fmt, pool, target=None):
+    """``(quality, data, ssim)``: the smallest encoding at or above ``target``."""
+    target = TARGET_SSIM if target is None else target
+    trials = list(pool.map(lambda q: _trial(master, fmt, q), QUALITIES))
+    passing = [t for t in trials if t[2] >= target]
+    if not passing:
+        return trials[-1]
+    return min(passing, key=lambda t: len(t[1]))
+
+
+class VariantCache:
+    """Quality chosen per master digest, format and target, stored as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "variants.json")
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") == VARIANTS_VERSION:
+                self.entries = data.get("entries", {})
+
+    @staticmethod
+    def key(digest, fmt, target):
+        return f"{digest}:{fmt}:{target}:{','.join(map(str, QUALITIES))}"
+
+    def get(self, digest, fmt, target):
+        return self.entries.get(self.key(digest, fmt, target))
+
+    def put(self, digest, fmt, target, entry):
+        self.entries[self.key(digest, fmt, target)] = entry
+
+    def save(self):
+        write_json(self.path, {"version": VARIANTS_VERSION, "entries": self.entries})
+
+
+def _is_still(path):
+    with Image.open(path) as img:
+        return not getattr(img, "is_animated", False)
+
+
+def make_variant(master_path, fmt, pool, cache, target=None, force=False):
+    """Write the ``fmt`` variant of one PNG; returns its ``Variant``."""
+    target = TARGET_SSIM if target is None else target
+    digest = input_digest(master_path)
+    path = variant_path(master_path, fmt)
+    entry = None if force else cache.get(digest, fmt, target)
+    if entry and os.path.isfile(path) and input_digest(path) == entry["sha256"]:
+        return Variant(master_path, path, fmt, entry["quality"], entry["ssim"], entry["bytes"],
+                       entry["png_bytes"], entry["decode_seconds"], entry["png_decode_seconds"], False)
+    with Image.open(master_path) as img:
+        master = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    if entry:
+        quality, data, score = entry["quality"], encode(master, fmt, entry["quality"]), entry["ssim"]
+    else:
+        quality, data, score = search(master, fmt, pool, target)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    with open(master_path, "rb") as f:
+        png = f.read()
+    variant = Variant(master_path, path, fmt, quality, score, len(data), len(png),
+                      decode_seconds(data), decode_seconds(png), entry is None)
+    cache.put(digest, fmt, target, {"quality": quality, "ssim": score, "bytes": len(data), "png_bytes": len(png),
+                                    "decode_seconds": variant.decode_seconds,
+                                    "png_decode_seconds": variant.png_decode_seconds,
+                                    "sha256": input_digest(path)})
+    return variant
+
+
+def make_variants(masters, formats, workers=None, target=None, force=False, cache=None):
+    """Variants of every still PNG in ``masters`` (any iterable of paths) in every available format.
+
+    Returns ``(variants, unavailable)``; ``unavailable`` lists the formats this
+    Pillow build cannot write, which are skipped.
+    """
+    cache = cache or VariantCache()
+    unavailable = [fmt for fmt in formats if not available(fmt)]
+    formats = [fmt for fmt in formats if fmt not in unavailable]
+    stills = [m for m in dict.fromkeys(masters) if m.lower().endswith(".png") and os.path.isfile(m) and _is_still(m)]
+    variants = []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for master in stills:
+            for fmt in formats:
+                variants.append(make_variant(master, fmt, pool, cache, target, force))
+    cache.save()
+    return variants, unavailable
+
+
+def print_variants(variants):
+    """Size and decode-time trade-off of each variant against its PNG."""
+    if not variants:
+        return
+    print(f"{'variant':<44} {'q':>3} {'ssim':>6} {'bytes':>9} {'vs png':>7} {'decode':>8} {'png':>8}")
+    for v in variants:
+        print(f"{os.path.basename(v.path):<44} {v.quality:>3} {v.ssim:6.4f} {v.bytes:>9}"
+              f" {v.bytes / v.png_bytes:7.1%} {v.decode_seconds * 1000:6.1f}ms {v.png_decode_seconds * 1000:6.1f}ms"
+              + ("" if v.searched else "  (cached)"))
+    for fmt in sorted({v.format for v in variants}):
+        made = [v for v in variants if v.format == fmt]
+        total, png = sum(v.bytes for v in made), sum(v.png_bytes for v in made)
+        print(f"  {fmt}: {len(made)} files, {total / 1e6:.2f} MB against {png / 1e6:.2f} MB of PNG ({total / png:.1%})")
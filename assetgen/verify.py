@@ -0,0 +1,157 @@
+"""Golden-image checks for the generated assets.
+
+Every asset is re-rendered in memory (no files written) and compared with
+its committed golden in ``assets/``. Both images are cut into fixed-size
+tiles and each tile is hashed; only tiles whose hashes differ are diffed pixel
+by pixel, with a per-channel ``tolerance`` for anti-aliasing noise. The
+golden's tile hashes are cached by file digest, so a clean run never decodes
+the goldens at all. Failures get a heatmap: the golden dimmed, changed
+pixels in red, changed tiles outlined.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageChops, ImageDraw
+
+from assetgen.cache import CACHE_DIR, ROOT, input_digest, write_json
+from assetgen.jobs import resolve
+
+GOLDEN_DIR = os.path.join(ROOT, "assets")
+DIFF_DIR = os.path.join(CACHE_DIR, "verify", "diffs")
+TILE = 64
+
+# One golden: render ``module.func(*args)`` and compare it with ``golden``.
+Target = namedtuple("Target", "name golden module func args")
+# status is "ok", "changed", "size" (dimensions differ) or "missing"
+Result = namedtuple("Result", "name status tiles changed_tiles changed_pixels max_delta heatmap")
+
+
+def targets(assets_dir=None, locales=None):
+    """Every golden the generators produce, optionally with localized screenshots."""
+    import format_screenshots
+
+    assets_dir = assets_dir or GOLDEN_DIR
+    found = [
+        Target("icon", "icon_512x512.png", "create_assets", "render_icon", ()),
+        Target("banner", "banner_1200x600.png", "create_assets", "render_banner", ()),
+        Target("editors_choice", "editors_choice_1200x1200.png", "create_assets", "render_editors_choice", ()),
+    ]
+    for raw_name, out_name, caption, subtitle in format_screenshots.SCREENSHOTS:
+        found.append(Target(os.path.splitext(out_name)[0], out_name, "format_screenshots",
+                            "render_screenshot", (os.path.join(assets_dir, raw_name), caption, subtitle)))
+    if locales:
+        from screenshot_captions import CAPTIONS
+
+        for raw_name, out_name, _, _ in format_screenshots.SCREENSHOTS:
+            key = os.path.splitext(out_name)[0].rsplit("_", 1)[1]
+            for locale in locales:
+                caption, subtitle = CAPTIONS[locale][key]
+                name = format_screenshots.localized_name(out_name, locale)
+                found.append(Target(os.path.splitext(name)[0], name, "format_screenshots", "render_screenshot",
+                                    (os.path.join(assets_dir, raw_name), caption, subtitle, locale)))
+    return found
+
+
+def _tile_boxes(size, tile):
+    w, h = size
+    return [(x, y, min(x + tile, w), min(y + tile, h)) for y in range(0, h, tile) for x in range(0, w, tile)]
+
+
+def tile_hashes(img, tile=TILE):
+    """BLAKE2 digest of each tile's raw pixels, row by row."""
+    return [hashlib.blake2b(img.crop(box).tobytes(), digest_size=16).hexdigest()
+            for box in _tile_boxes(img.size, tile)]
+
+
+def _golden_hashes(path, mode, tile):
+    """Tile hashes of a golden, cached by its digest so it is decoded once."""
+    cache_path = os.path.join(CACHE_DIR, "verify", f"{input_digest(path)[:32]}_{mode}_{tile}.json")
+    if os.path.isfile(cache_path):
+        with open(cache_path) as f:
+            data = json.load(f)
+        return tuple(data["size"]), data["hashes"]
+    with Image.open(path) as golden:
+        golden = golden.convert(mode)
+    size, hashes = golden.size, tile_hashes(golden, tile)
+    write_json(cache_path, {"size": size, "hashes": hashes}, indent=None)
+    return size, hashes
+
+
+def _max_channel_diff(a, b):
+    """Per-pixel largest channel difference, as an L image."""
+    bands = ImageChops.difference(a, b).split()
+    diff = bands[0]
+    for band in bands[1:]:
+        diff = ImageChops.lighter(diff, band)
+    return diff
+
+
+def heatmap(golden, diff, tolerance, boxes):
+    """The golden dimmed to a third, pixels over ``tolerance`` in red, ``boxes`` outlined."""
+    out = golden.convert("L").point(lambda v: v // 3).convert("RGB")
+    mask = diff.point(lambda v: 0 if v <= tolerance else min(255, 96 + 4 * v))
+    out.paste((255, 40, 40), (0, 0) + out.size, mask)
+    draw = ImageDraw.Draw(out)
+    for x0, y0, x1, y1 in boxes:
+        draw.rectangle([x0, y0, x1 - 1, y1 - 1], outline=(255, 210, 0))
+    return out
+
+
+def check(target, golden_dir=GOLDEN_DIR, diff_dir=DIFF_DIR, tile=TILE, tolerance=0):
+    """Render one target and compare it with its golden."""
+    golden_path = os.path.join(golden_dir, target.golden)
+    if not os.path.isfile(golden_path):
+        return Result(target.name, "missing", 0, 0, 0, 0, None)
+    img = resolve(target)(*target.args)
+    size, golden_hashes = _golden_hashes(golden_path, img.mode, tile)
+    if tuple(size) != img.size:
+        return Result(target.name, "size", 0, 0, 0, 0, None)
+
+    boxes = _tile_boxes(img.size, tile)
+    suspect = [box for box, h, g in zip(boxes, tile_hashes(img, tile), golden_hashes) if h != g]
+    if not suspect:
+        return Result(target.name, "ok", len(boxes), 0, 0, 0, None)
+
+    with Image.open(golden_path) as golden:
+        golden = golden.convert(img.mode)
+    changed, pixels, max_delta = [], 0, 0
+    for box in suspect:
+        diff = _max_channel_diff(img.crop(box), golden.crop(box))
+        over = sum(diff.histogram()[tolerance + 1:])
+        if over:
+            changed.append(box)
+            pixels += over
+            max_delta = max(max_delta, diff.getextrema()[1])
+    if not changed:
+        return Result(target.name, "ok", len(boxes), 0, 0, max_delta, None)
+
+    os.makedirs(diff_dir, exist_ok=True)
+    path = os.path.join(diff_dir, target.name + ".diff.png")
+    heatmap(golden, _max_channel_diff(img, golden), tolerance, changed).save(path, "PNG", compress_level=1)
+    return Result(target.name, "changed", len(boxes), len(changed), pixels, max_delta, path)
+
+
+def _check(args):
+    return check(*args)
+
+
+def verify(target_list, golden_dir=GOLDEN_DIR, diff_dir=DIFF_DIR, tile=TILE, tolerance=0, workers=None):
+    """Check every target, across a process pool. Results come back in target order."""
+    work = [(t, golden_dir, diff_dir, tile, tolerance) for t in target_list]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(work) <= 1:
+        return [_check(w) for w in work]
+    with ProcessPoolExecutor(max_workers=min(workers, len(work))) as pool:
+        return list(pool.map(_check, work))
+
+
+def update(target_list, golden_dir=GOLDEN_DIR):
+    """Re-render every target and write it as the new golden."""
+    from assetgen.encode import save_png
+
+    os.makedirs(golden_dir, exist_ok=True)
+    return [save_png(resolve(t)(*t.args), os.path.join(golden_dir, t.golden)).path for t in target_list]
@@ -0,0 +1,208 @@
+"""Watch mode: re-render what changed and serve a live preview.
+
+The watcher polls the mtimes of the generator scripts, the captions, the
+assetgen package, config.yaml, the bundled fonts and the raw screenshots.
+On a change it reloads the edited scripts in this process and runs an
+incremental build, so only jobs whose keys changed re-render (see
+``assetgen.cache``). An edit inside ``assetgen`` itself restarts the process,
+since its modules hold caches and are imported everywhere.
+
+Previews are encoded with the fastest PNG settings and written to their own
+directory. A small HTTP server shows every output on one page that reloads
+itself whenever a render finishes.
+"""
+
+import html
+import http.server
+import importlib
+import json
+import linecache
+import mimetypes
+import os
+import sys
+import threading
+import time
+import urllib.parse
+
+from assetgen import encode, fonts
+from assetgen.cache import CACHE_DIR, ROOT, BuildCache
+from assetgen.jobs import outputs
+from assetgen.render import build, print_report
+
+PREVIEW_DIR = os.path.join(CACHE_DIR, "preview")
+POLL_SECONDS = 0.2
+PORT = 8765
+
+# Scripts reloaded in place when edited, in dependency order.
+SCRIPTS = ["screenshot_captions", "format_screenshots", "create_assets"]
+
+_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Roaring Trades preview</title>
+<style>
+body {{ background: #111; color: #ddd; font: 14px sans-serif; margin: 16px; }}
+figure {{ display: inline-block; margin: 8px; vertical-align: top; }}
+img {{ max-width: 360px; max-height: 640px; display: block; background: #333; }}
+figcaption {{ margin-top: 4px; }}
+</style></head><body>
+<p>Generation {generation} &middot; {status}</p>
+{figures}
+<script>
+setInterval(async () => {{
+  const r = await fetch("/version");
+  if ((await r.json()).generation !== {generation}) location.reload();
+}}, 400);
+</script>
+</body></html>
+"""
+
+
+def watched_files(assets_dir, config_path, raw_names):
+    """Every file whose edit can change an output."""
+    paths = [os.path.join(ROOT, name + ".py") for name in SCRIPTS]
+    package = os.path.join(ROOT, "assetgen")
+    paths += [os.path.join(package, name) for name in sorted(os.listdir(package)) if name.endswith(".py")]
+    if config_path:
+        paths.append(config_path)
+    if os.path.isdir(fonts.BUNDLED_DIR):
+        paths += [os.path.join(fonts.BUNDLED_DIR, name) for name in sorted(os.listdir(fonts.BUNDLED_DIR))]
+    paths += [os.path.join(assets_dir, name) for name in raw_names]
+    return paths
+
+
+def snapshot(paths):
+    """``{path: mtime_ns}``; missing files map to None."""
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+class Preview:
+    """Generation counter and output list shared with the HTTP handler."""
+
+    def __init__(self):
+        self.generation = 0
+        self.status = "starting"
+        self.outputs = []
+        self.lock = threading.Lock()
+
+    def publish(self, paths, status):
+        with self.lock:
+            self.outputs = list(paths)
+            self.status = status
+            self.generation += 1
+
+    def page(self):
+        with self.lock:
+            figures = []
+            for i, path in enumerate(self.outputs):
+                stamp = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+                figures.append(f'<figure><img src="/file/{i}?v={stamp}" loading="lazy">'
+                               f'<figcaption>{html.escape(os.path.basename(path))}</figcaption></figure>')
+            return _PAGE.format(generation=self.generation, status=html.escape(self.status),
+                                figures="\n".join(figures))
+
+    def file(self, index):
+        with self.lock:
+            return self.outputs[index] if 0 <= index < len(self.outputs) else None
+
+
+def serve(preview, port=PORT):
+    """Start the preview server on a daemon thread; returns the server."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _send(self, body, content_type, status=200):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urllib.parse.urlparse(self.path).path
+            if path == "/":
+                self._send(preview.page().encode(), "text/html; charset=utf-8")
+            elif path == "/version":
+                self._send(json.dumps({"generation": preview.generation}).encode(), "application/json")
+            elif path.startswith("/file/") and path[6:].isdigit():
+                target = preview.file(int(path[6:]))
+                if target and os.path.isfile(target):
+                    with open(target, "rb") as f:
+                        self._send(f.read(), mimetypes.guess_type(target)[0] or "application/octet-stream")
+                else:
+                    self._send(b"not found", "text/plain", 404)
+            else:
+                self._send(b"not found", "text/plain", 404)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _reload_scripts(changed):
+    """Reload edited scripts (and the ones importing them) in dependency order."""
+    linecache.checkcache()
+    stale = False
+    for name in SCRIPTS:
+        path = os.path.join(ROOT, name + ".py")
+        stale = stale or path in changed
+        if stale and name in sys.modules:
+            importlib.reload(sys.modules[name])
+
+
+def _restart():
+    print("assetgen changed; restarting...", flush=True)
+    os.execv(sys.executable, [sys.executable, "-m", "assetgen"] + sys.argv[1:])
+
+
+def watch(make_jobs, files, workers=1, port=PORT, force=False):
+    """Rebuild ``make_jobs()`` whenever one of ``files()`` changes. Runs until interrupted."""
+    encode.configure(effort=0)
+    preview = Preview()
+    server = serve(preview, port)
+    print(f"Preview at http://127.0.0.1:{server.server_port}/  (Ctrl-C to stop)")
+    cache = BuildCache()
+    package = os.path.join(ROOT, "assetgen") + os.sep
+    stamps = {}
+    try:
+        while True:
+            paths = files()
+            current = snapshot(paths)
+            changed = {p for p in paths if current[p] != stamps.get(p)} if stamps else set(paths)
+            if changed:
+                if stamps and any(p.startswith(package) for p in changed):
+                    _restart()
+                if stamps:
+                    names = ", ".join(sorted(os.path.basename(p) for p in changed))
+                    print(f"\nChanged: {names}")
+                    _reload_scripts(changed)
+                    if any(p.startswith(fonts.BUNDLED_DIR) for p in changed):
+                        fonts.resolve.cache_clear()
+                        fonts.load.cache_clear()
+                stamps = current
+                start = time.perf_counter()
+                try:
+                    job_list = make_jobs()
+                    results, skipped = build(job_list, workers, cache, force=force)
+                except Exception as e:  # keep watching through a broken edit
+                    print(f"error: {type(e).__name__}: {e}")
+                    preview.publish(preview.outputs, f"error: {e}")
+                else:
+                    seconds = time.perf_counter() - start
+                    print_report(results, seconds, skipped)
+                    preview.publish([p for job in job_list for p in outputs(job)],
+                                    f"{len(results)} re-rendered in {seconds:.2f}s")
+                force = False
+            time.sleep(POLL_SECONDS)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.shutdown()
+    return 0
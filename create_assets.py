@@ -1,36 +1,39 @@
 #!/usr/bin/env python3
 """Generate Roaring Trades dApp Store assets with 1920s Art Deco design."""
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import math
 import os
+import sys
 
-OUTPUT_DIR = "/Users/heathbertram/Downloads/RoaringTrades/assets"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+from assetgen.fonts import get_font
+from assetgen import animate, primitives, textlayout, trace
+from assetgen.encode import band_ranges, banded, describe, png_header, save_png, save_png_bands
+from assetgen.gradients import fill_gradient, vertical_gradient
+from assetgen.palette import PALETTE
+from assetgen.pyramid import pyramid
 
-# Color palette from the app
-CHARCOAL = (26, 26, 46)        # #1A1A2E
-GOLD = (212, 175, 55)          # #D4AF37
-DARK_GOLD = (184, 134, 11)     # #B8860B
-LIGHT_GOLD = (232, 212, 139)   # #E8D48B
-CREAM = (255, 248, 231)        # #FFF8E7
-BURGUNDY = (114, 47, 55)       # #722F37
-DARK_BURGUNDY = (74, 31, 36)   # #4A1F24
-DEEP_BG = (15, 15, 35)         # Even darker for depth
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
 
+# Color palette from the app; render functions take a ``palette`` override
+CHARCOAL = PALETTE.charcoal
+GOLD = PALETTE.gold
+DARK_GOLD = PALETTE.dark_gold
+LIGHT_GOLD = PALETTE.light_gold
+CREAM = PALETTE.cream
+BURGUNDY = PALETTE.burgundy
+DARK_BURGUNDY = PALETTE.dark_burgundy
+DEEP_BG = PALETTE.deep_bg
 
-def draw_art_deco_corner(draw, x, y, size, color, flip_h=False, flip_v=False):
+
+def _scaler(k):
+    """Map a length in design pixels (the 1x layout) to output pixels."""
+    return lambda v: int(round(v * k))
+
+
+def draw_art_deco_corner(img, x, y, size, color, flip_h=False, flip_v=False):
     """Draw an Art Deco corner ornament."""
-    s = size
-    lines = []
-    # Fan lines from corner
-    for i in range(5):
-        angle = math.pi / 2 * i / 4
-        ex = x + int(s * math.cos(angle)) * (-1 if flip_h else 1)
-        ey = y + int(s * math.sin(angle)) * (-1 if flip_v else 1)
-        lines.append(((x, y), (ex, ey)))
-    for line in lines:
-        draw.line(line, fill=color, width=2)
+    primitives.corner_fan(img, (x, y), size, color, num_rays=5, width=2, flip_h=flip_h, flip_v=flip_v)
 
 
 def draw_art_deco_border(draw, bbox, color, width=2, inset=0):
@@ -43,30 +46,20 @@ def draw_art_deco_border(draw, bbox, color, width=2, inset=0):
         draw.polygon([(cx, cy - cs), (cx + cs, cy), (cx, cy + cs), (cx - cs, cy)], fill=color)
 
 
-def draw_sunburst(draw, cx, cy, radius, color, num_rays=24, ray_width=2):
+def draw_sunburst(img, cx, cy, radius, color, num_rays=24, ray_width=2, start=0.0):
     """Draw an Art Deco sunburst pattern."""
-    for i in range(num_rays):
-        angle = 2 * math.pi * i / num_rays
-        ex = cx + int(radius * math.cos(angle))
-        ey = cy + int(radius * math.sin(angle))
-        draw.line([(cx, cy), (ex, ey)], fill=color, width=ray_width)
+    primitives.sunburst(img, (cx, cy), radius, color, num_rays=num_rays, width=ray_width, start=start)
 
 
-def draw_chevron_pattern(draw, y_start, y_end, width, color, spacing=20):
+def draw_chevron_pattern(img, y_start, y_end, width, color, spacing=20):
     """Draw horizontal Art Deco chevron/zigzag pattern."""
-    for y in range(y_start, y_end, spacing):
-        points = []
-        for x in range(0, width, spacing):
-            points.append((x, y))
-            points.append((x + spacing // 2, y + spacing // 2))
-        if len(points) >= 2:
-            draw.line(points, fill=color, width=1)
+    primitives.chevrons(img, y_start, y_end, width, color, spacing=spacing)
 
 
-def draw_vertical_lines(draw, x_start, x_end, y_start, y_end, color, spacing=6):
+def draw_vertical_lines(draw, x_start, x_end, y_start, y_end, color, spacing=6, width=1):
     """Draw vertical parallel lines (Art Deco motif)."""
     for x in range(x_start, x_end, spacing):
-        draw.line([(x, y_start), (x, y_end)], fill=color, width=1)
+        draw.line([(x, y_start), (x, y_end)], fill=color, width=width)
 
 
 def draw_rt_monogram(draw, cx, cy, size, gold, dark_gold):
@@ -105,350 +98,483 @@ def draw_rt_monogram(draw, cx, cy, size, gold, dark_gold):
     draw.rectangle([t_center, r_top, t_center + int(8 * s), cy + int(22 * s)], fill=gold)
 
 
-def draw_decorative_frame(draw, x1, y1, x2, y2, color, dark_color):
+def draw_decorative_frame(draw, x1, y1, x2, y2, color, dark_color, scale=1):
     """Draw a decorative Art Deco double frame with corner ornaments."""
+    px = _scaler(scale)
     # Outer frame
-    draw.rectangle([x1, y1, x2, y2], outline=color, width=3)
+    draw.rectangle([x1, y1, x2, y2], outline=color, width=px(3))
     # Inner frame
-    gap = 8
-    draw.rectangle([x1 + gap, y1 + gap, x2 - gap, y2 - gap], outline=dark_color, width=2)
+    gap = px(8)
+    draw.rectangle([x1 + gap, y1 + gap, x2 - gap, y2 - gap], outline=dark_color, width=px(2))
 
     # Corner ornaments - small squares at corners
-    cs = 6
+    cs = px(6)
     for cx, cy in [(x1, y1), (x2, y1), (x1, y2), (x2, y2)]:
         draw.rectangle([cx - cs, cy - cs, cx + cs, cy + cs], fill=color)
 
     # Midpoint ornaments - small diamonds
     mid_x = (x1 + x2) // 2
     mid_y = (y1 + y2) // 2
-    ds = 5
+    ds = px(5)
     for dx, dy in [(mid_x, y1), (mid_x, y2), (x1, mid_y), (x2, mid_y)]:
         draw.polygon([(dx, dy - ds), (dx + ds, dy), (dx, dy + ds), (dx - ds, dy)], fill=dark_color)
 
 
 def create_gradient_bg(img, color1, color2):
     """Create a vertical gradient background."""
-    draw = ImageDraw.Draw(img)
-    w, h = img.size
-    for y in range(h):
-        ratio = y / h
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        draw.line([(0, y), (w, y)], fill=(r, g, b))
-
-
-def get_font(size, bold=False):
-    """Try to get a nice font, fall back gracefully."""
-    font_paths = [
-        "/System/Library/Fonts/Supplemental/Georgia Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Georgia.ttf",
-        "/System/Library/Fonts/Supplemental/Times New Roman Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Times New Roman.ttf",
-        "/System/Library/Fonts/Helvetica.ttc",
-    ]
-    for fp in font_paths:
-        if os.path.exists(fp):
-            try:
-                return ImageFont.truetype(fp, size)
-            except:
-                continue
-    return ImageFont.load_default()
+    fill_gradient(img, [color1, color2])
 
 
-def text_width(draw, text, font):
+def text_width(text, font):
     """Get text width."""
-    bbox = draw.textbbox((0, 0), text, font=font)
-    return bbox[2] - bbox[0]
+    return textlayout.width(text, font)
 
 
-def text_height(draw, text, font):
+def text_height(text, font):
     """Get text height."""
-    bbox = draw.textbbox((0, 0), text, font=font)
-    return bbox[3] - bbox[1]
+    return textlayout.height(text, font)
 
 
-def draw_text_centered(draw, text, y, font, fill, width):
+def draw_text_centered(img, text, y, font, fill, width):
     """Draw text centered horizontally."""
-    tw = text_width(draw, text, font)
-    x = (width - tw) // 2
-    draw.text((x, y), text, font=font, fill=fill)
+    textlayout.draw_centered(img, text, y, font, fill, width)
+
+
+def draw_text_with_shadow(img, text, y, font, fill, width, shadow_color=None, offset=2):
+    """Draw text centered with a drop shadow pasted from the same glyph mask."""
+    textlayout.draw_centered(img, text, y, font, fill, width, shadow_color, offset)
 
 
-def draw_text_with_shadow(draw, text, y, font, fill, width, shadow_color=None, offset=2):
-    """Draw text centered with drop shadow."""
-    tw = text_width(draw, text, font)
-    x = (width - tw) // 2
-    if shadow_color:
-        draw.text((x + offset, y + offset), text, font=font, fill=shadow_color)
-    draw.text((x, y), text, font=font, fill=fill)
+def _total_kb(reports):
+    """Combined size and savings of several saved PNGs."""
+    size = sum(r.bytes for r in reports)
+    saved = sum(r.baseline_bytes - r.bytes for r in reports)
+    return f"{size / 1024:.1f}KB, saved {saved / 1024:.1f}KB"
+
+
+def _output_path(output_dir, name):
+    """Resolve an output file path, creating the directory if needed."""
+    output_dir = output_dir or OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, name)
 
 
 # ============================================================
 # 1. APP ICON (512x512)
 # ============================================================
-def create_icon():
-    print("Creating icon 512x512...")
-    size = 512
-    img = Image.new('RGB', (size, size))
-    create_gradient_bg(img, CHARCOAL, DEEP_BG)
+def render_icon(size=512, layer="full", palette=None):
+    """Draw the icon at any size; the layout is designed at 512x512.
+
+    ``layer`` is "full", or "background" / "foreground" for the two layers
+    of an Android adaptive icon (the foreground is transparent RGBA).
+    """
+    palette = palette or PALETTE
+    px = _scaler(size / 512)
+    phase = trace.phases()
+    phase("background")
+    c = size // 2
+    if layer == "foreground":
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    else:
+        img = Image.new('RGB', (size, size))
+        create_gradient_bg(img, palette.charcoal, palette.deep_bg)
     draw = ImageDraw.Draw(img)
 
-    # Subtle sunburst behind monogram
-    draw_sunburst(draw, size // 2, size // 2, 220, (30, 30, 55), num_rays=36, ray_width=1)
+    if layer != "foreground":
+        # Subtle sunburst behind monogram
+        draw_sunburst(img, c, c, px(220), (30, 30, 55), num_rays=36, ray_width=max(1, px(1)))
+    if layer == "background":
+        phase.close()
+        return img
 
+    phase("ornaments")
     # Art Deco decorative border
-    border_margin = 24
+    border_margin = px(24)
     draw_decorative_frame(draw, border_margin, border_margin,
-                         size - border_margin, size - border_margin, GOLD, DARK_GOLD)
+                         size - border_margin, size - border_margin, palette.gold, palette.dark_gold,
+                         scale=size / 512)
 
     # Second inner border
-    inner_margin = 44
+    inner_margin = px(44)
     draw.rectangle([inner_margin, inner_margin, size - inner_margin, size - inner_margin],
-                   outline=DARK_GOLD, width=1)
+                   outline=palette.dark_gold, width=max(1, px(1)))
 
     # Horizontal line accents at top and bottom
-    for y_pos in [70, 75]:
-        draw.line([(60, y_pos), (size - 60, y_pos)], fill=GOLD, width=1)
-    for y_pos in [size - 70, size - 75]:
-        draw.line([(60, y_pos), (size - 60, y_pos)], fill=GOLD, width=1)
+    for y_pos in [px(70), px(75)]:
+        draw.line([(px(60), y_pos), (size - px(60), y_pos)], fill=palette.gold, width=max(1, px(1)))
+    for y_pos in [size - px(70), size - px(75)]:
+        draw.line([(px(60), y_pos), (size - px(60), y_pos)], fill=palette.gold, width=max(1, px(1)))
 
     # Draw RT monogram large and centered
-    draw_rt_monogram(draw, size // 2, size // 2 - 15, 120, GOLD, DARK_GOLD)
+    draw_rt_monogram(draw, c, c - px(15), px(120), palette.gold, palette.dark_gold)
 
+    phase("text")
     # "ROARING TRADES" text below monogram
-    font_title = get_font(28, bold=True)
-    draw_text_centered(draw, "ROARING", size // 2 + 100, font_title, LIGHT_GOLD, size)
+    font_title = get_font(px(28), bold=True)
+    draw_text_centered(img, "ROARING", c + px(100), font_title, palette.light_gold, size)
 
-    font_sub = get_font(22, bold=True)
-    draw_text_centered(draw, "TRADES", size // 2 + 132, font_sub, GOLD, size)
+    font_sub = get_font(px(22), bold=True)
+    draw_text_centered(img, "TRADES", c + px(132), font_sub, palette.gold, size)
 
+    phase("ornaments")
     # Small decorative dots/diamonds
-    dot_y = size // 2 + 90
-    for dx in [-40, -20, 0, 20, 40]:
-        cx = size // 2 + dx
-        ds = 3
-        draw.polygon([(cx, dot_y - ds), (cx + ds, dot_y), (cx, dot_y + ds), (cx - ds, dot_y)], fill=GOLD)
+    dot_y = c + px(90)
+    primitives.diamonds(img, [(c + px(dx), dot_y) for dx in [-40, -20, 0, 20, 40]], px(3), palette.gold)
 
     # Art Deco fan/arch at top center
-    fan_cx = size // 2
-    fan_cy = 52
-    for i in range(7):
-        angle = math.pi + math.pi * i / 6
-        r = 18
-        ex = fan_cx + int(r * math.cos(angle))
-        ey = fan_cy + int(r * math.sin(angle))
-        draw.line([(fan_cx, fan_cy), (ex, ey)], fill=GOLD, width=2)
+    primitives.fan(img, (c, px(52)), px(18), palette.gold, num_rays=7, width=px(2), direction="up")
 
     # Art Deco fan at bottom center
-    fan_cy = size - 52
-    for i in range(7):
-        angle = math.pi * i / 6
-        r = 18
-        ex = fan_cx + int(r * math.cos(angle))
-        ey = fan_cy + int(r * math.sin(angle))
-        draw.line([(fan_cx, fan_cy), (ex, ey)], fill=GOLD, width=2)
+    primitives.fan(img, (c, size - px(52)), px(18), palette.gold, num_rays=7, width=px(2), direction="down")
+    phase.close()
+    return img
+
 
-    img.save(os.path.join(OUTPUT_DIR, "icon_512x512.png"), "PNG")
-    print(f"  Saved icon_512x512.png")
+def create_icon(output_dir=None):
+    print("Creating icon 512x512...")
+    img = render_icon(512)
+    output_path = _output_path(output_dir, "icon_512x512.png")
+    report = save_png(img, output_path)
+    print(f"  Saved icon_512x512.png ({describe(report)})")
+    return output_path
+
+
+# Android launcher densities: legacy icon (48dp) and adaptive layers (108dp)
+LAUNCHER_DENSITIES = [("mdpi", 1), ("hdpi", 1.5), ("xhdpi", 2), ("xxhdpi", 3), ("xxxhdpi", 4)]
+ICON_MASTER = 2048
+
+
+def create_icon_set(output_dir=None, master=ICON_MASTER):
+    """Draw the icon once at ``master`` px and derive every launcher size from it.
+
+    Writes launcher/mipmap-<density>/ic_launcher.png (48dp) plus the adaptive
+    ic_launcher_foreground.png / ic_launcher_background.png layers (108dp,
+    with the artwork inside the 72dp safe zone).
+    """
+    print(f"Creating launcher icons from a {master}x{master} master...")
+    full = render_icon(master)
+    background = render_icon(master, "background")
+    # The adaptive foreground shows the middle 72dp of its 108dp canvas
+    inner = master * 2 // 3
+    foreground = Image.new('RGBA', (master, master), (0, 0, 0, 0))
+    foreground.paste(render_icon(inner, "foreground"), ((master - inner) // 2,) * 2)
+
+    legacy = pyramid(full, [(int(48 * k),) * 2 for _, k in LAUNCHER_DENSITIES])
+    fg = pyramid(foreground, [(int(108 * k),) * 2 for _, k in LAUNCHER_DENSITIES])
+    bg = pyramid(background, [(int(108 * k),) * 2 for _, k in LAUNCHER_DENSITIES])
+
+    reports = []
+    for density, k in LAUNCHER_DENSITIES:
+        d = os.path.join("launcher", f"mipmap-{density}")
+        for name, levels, px in [("ic_launcher.png", legacy, int(48 * k)),
+                                 ("ic_launcher_foreground.png", fg, int(108 * k)),
+                                 ("ic_launcher_background.png", bg, int(108 * k))]:
+            output_path = _output_path(os.path.join(output_dir or OUTPUT_DIR, d), name)
+            reports.append(save_png(levels[(px, px)], output_path))
+    paths = tuple(r.path for r in reports)
+    print(f"  Saved {len(paths)} launcher icons ({_total_kb(reports)})")
+    return paths
 
 
 # ============================================================
 # 2. BANNER (1200x600)
 # ============================================================
-def create_banner():
-    print("Creating banner 1200x600...")
-    w, h = 1200, 600
-    img = Image.new('RGB', (w, h))
-    create_gradient_bg(img, CHARCOAL, DEEP_BG)
-    draw = ImageDraw.Draw(img)
-
-    # Sunburst from center-left
-    draw_sunburst(draw, 300, h // 2, 500, (30, 30, 55), num_rays=48, ray_width=1)
-
+BANNER_RAYS = 48
+
+
+def draw_banner_sunburst(canvas, w, angle=0.0):
+    """The banner's sunburst from center-left, turned by ``angle`` radians."""
+    px = _scaler(w / 1200)
+    draw_sunburst(canvas, px(300), px(600) // 2, px(500), (30, 30, 55), num_rays=BANNER_RAYS,
+                  ray_width=max(1, px(1)), start=angle)
+
+
+def banner_sunburst_box(w):
+    """The part of the banner the sunburst can touch, whatever its angle."""
+    px = _scaler(w / 1200)
+    h = px(600)
+    cx, cy, r = px(300), h // 2, px(500) + px(2)
+    return max(0, cx - r), max(0, cy - r), min(w, cx + r), min(h, cy + r)
+
+
+def render_banner(w=1200, rows=None, palette=None, layer="full"):
+    """Draw the banner at any width; the layout is designed at 1200x600.
+
+    ``rows=(top, bottom)`` draws just that strip of it; see ``banner_bands``.
+    ``layer`` is "full", "gradient" (the background without the sunburst) or
+    "foreground" (everything above the sunburst, transparent RGBA).
+    """
+    palette = palette or PALETTE
+    px = _scaler(w / 1200)
+    h = px(600)
+    phase = trace.phases()
+    phase("background")
+    top, bottom = rows or (0, h)
+    if layer == "foreground":
+        img = Image.new("RGBA", (w, bottom - top), (0, 0, 0, 0))
+    else:
+        img = vertical_gradient((w, h), palette.charcoal, palette.deep_bg, (top, bottom))
+    canvas = primitives.Band(img, top, h) if rows else img
+    draw = primitives.draw_for(canvas)
+    thin = max(1, px(1))
+
+    if layer == "full":
+        draw_banner_sunburst(canvas, w)
+    if layer == "gradient":
+        phase.close()
+        return img
+
+    phase("ornaments")
     # Art Deco border
-    bm = 16
-    draw_decorative_frame(draw, bm, bm, w - bm, h - bm, GOLD, DARK_GOLD)
+    bm = px(16)
+    draw_decorative_frame(draw, bm, bm, w - bm, h - bm, palette.gold, palette.dark_gold, scale=w / 1200)
 
     # Inner border
-    im = 32
-    draw.rectangle([im, im, w - im, h - im], outline=DARK_GOLD, width=1)
+    im = px(32)
+    draw.rectangle([im, im, w - im, h - im], outline=palette.dark_gold, width=thin)
 
     # Vertical Art Deco line accents on left side
-    draw_vertical_lines(draw, 50, 90, 50, h - 50, (40, 40, 65), spacing=8)
+    draw_vertical_lines(draw, px(50), px(90), px(50), h - px(50), (40, 40, 65), spacing=px(8), width=thin)
 
     # Vertical lines on right side
-    draw_vertical_lines(draw, w - 90, w - 50, 50, h - 50, (40, 40, 65), spacing=8)
+    draw_vertical_lines(draw, w - px(90), w - px(50), px(50), h - px(50), (40, 40, 65), spacing=px(8), width=thin)
 
     # RT Monogram on left
-    draw_rt_monogram(draw, 220, h // 2 - 10, 90, GOLD, DARK_GOLD)
+    draw_rt_monogram(draw, px(220), h // 2 - px(10), px(90), palette.gold, palette.dark_gold)
 
     # Decorative diamond divider
-    div_x = 370
-    for dy in range(-80, 81, 20):
-        ds = 4
-        cy = h // 2 + dy
-        draw.polygon([(div_x, cy - ds), (div_x + ds, cy), (div_x, cy + ds), (div_x - ds, cy)], fill=GOLD)
-    draw.line([(div_x, h // 2 - 100), (div_x, h // 2 + 100)], fill=DARK_GOLD, width=1)
+    div_x = px(370)
+    primitives.diamonds(canvas, [(div_x, h // 2 + px(dy)) for dy in range(-80, 81, 20)], px(4), palette.gold)
+    draw.line([(div_x, h // 2 - px(100)), (div_x, h // 2 + px(100))], fill=palette.dark_gold, width=thin)
 
+    phase("text")
     # Title text on the right
-    font_roaring = get_font(72, bold=True)
-    font_trades = get_font(72, bold=True)
-    font_sub = get_font(26, bold=False)
-    font_tagline = get_font(20, bold=False)
+    font_roaring = get_font(px(72), bold=True)
+    font_trades = get_font(px(72), bold=True)
+    font_sub = get_font(px(26), bold=False)
+    font_tagline = get_font(px(20), bold=False)
 
-    text_x = 420
+    text_x = px(420)
 
     # "ROARING"
-    draw.text((text_x, h // 2 - 110), "ROARING", font=font_roaring, fill=GOLD)
+    textlayout.draw(canvas, (text_x, h // 2 - px(110)), "ROARING", font_roaring, palette.gold)
 
     # "TRADES"
-    draw.text((text_x, h // 2 - 35), "TRADES", font=font_trades, fill=LIGHT_GOLD)
+    textlayout.draw(canvas, (text_x, h // 2 - px(35)), "TRADES", font_trades, palette.light_gold)
 
     # Decorative line under title
-    line_y = h // 2 + 55
-    draw.line([(text_x, line_y), (text_x + 400, line_y)], fill=GOLD, width=2)
-    draw.line([(text_x, line_y + 5), (text_x + 400, line_y + 5)], fill=DARK_GOLD, width=1)
+    line_y = h // 2 + px(55)
+    draw.line([(text_x, line_y), (text_x + px(400), line_y)], fill=palette.gold, width=px(2))
+    draw.line([(text_x, line_y + px(5)), (text_x + px(400), line_y + px(5))], fill=palette.dark_gold, width=thin)
 
     # Subtitle
-    draw.text((text_x, h // 2 + 75), "CHICAGO, 1920s", font=font_sub, fill=CREAM)
+    textlayout.draw(canvas, (text_x, h // 2 + px(75)), "CHICAGO, 1920s", font_sub, palette.cream)
 
     # Tagline
-    draw.text((text_x, h // 2 + 115), "Buy low, sell high. Build your empire in 30 days.",
-              font=font_tagline, fill=DARK_GOLD)
+    textlayout.draw(canvas, (text_x, h // 2 + px(115)), "Buy low, sell high. Build your empire in 30 days.",
+                    font_tagline, palette.dark_gold)
 
+    phase("ornaments")
     # Decorative dots under tagline
-    dot_y = h // 2 + 155
-    for dx in range(0, 200, 20):
-        ds = 2
-        cx = text_x + 100 + dx
-        draw.polygon([(cx, dot_y - ds), (cx + ds, dot_y), (cx, dot_y + ds), (cx - ds, dot_y)], fill=GOLD)
+    dot_y = h // 2 + px(155)
+    primitives.diamonds(canvas, [(text_x + px(100 + dx), dot_y) for dx in range(0, 200, 20)], px(2), palette.gold)
 
     # Top decorative arch/fan
-    fan_cx = w // 2
-    for i in range(9):
-        angle = math.pi + math.pi * i / 8
-        r = 22
-        ex = fan_cx + int(r * math.cos(angle))
-        ey = 20 + int(r * math.sin(angle))
-        draw.line([(fan_cx, 20), (ex, ey)], fill=GOLD, width=2)
+    primitives.fan(canvas, (w // 2, px(20)), px(22), palette.gold, num_rays=9, width=px(2), direction="up")
 
     # Bottom decorative arch/fan
-    for i in range(9):
-        angle = math.pi * i / 8
-        r = 22
-        ex = fan_cx + int(r * math.cos(angle))
-        ey = h - 20 + int(r * math.sin(angle))
-        draw.line([(fan_cx, h - 20), (ex, ey)], fill=GOLD, width=2)
+    primitives.fan(canvas, (w // 2, h - px(20)), px(22), palette.gold, num_rays=9, width=px(2), direction="down")
 
     # Corner accent lines (Art Deco style)
-    accent_len = 60
-    for corner_x, corner_y, dx, dy in [(50, 50, 1, 1), (w-50, 50, -1, 1),
-                                         (50, h-50, 1, -1), (w-50, h-50, -1, -1)]:
-        draw.line([(corner_x, corner_y), (corner_x + accent_len * dx, corner_y)], fill=GOLD, width=2)
-        draw.line([(corner_x, corner_y), (corner_x, corner_y + accent_len * dy)], fill=GOLD, width=2)
+    accent_len = px(60)
+    m = px(50)
+    for corner_x, corner_y, dx, dy in [(m, m, 1, 1), (w - m, m, -1, 1),
+                                         (m, h - m, 1, -1), (w - m, h - m, -1, -1)]:
+        draw.line([(corner_x, corner_y), (corner_x + accent_len * dx, corner_y)], fill=palette.gold, width=px(2))
+        draw.line([(corner_x, corner_y), (corner_x, corner_y + accent_len * dy)], fill=palette.gold, width=px(2))
+    phase.close()
+    return img
+
 
-    img.save(os.path.join(OUTPUT_DIR, "banner_1200x600.png"), "PNG")
-    print(f"  Saved banner_1200x600.png")
+def create_banner(output_dir=None):
+    print("Creating banner 1200x600...")
+    img = render_banner(1200)
+    output_path = _output_path(output_dir, "banner_1200x600.png")
+    report = save_png(img, output_path)
+    print(f"  Saved banner_1200x600.png ({describe(report)})")
+    return output_path
+
+
+def banner_bands(w, palette=None):
+    """Yield ``render_banner(w)`` as horizontal bands, top to bottom."""
+    for rows in band_ranges((w, _scaler(w / 1200)(600))):
+        yield render_banner(w, rows, palette)
+
+
+BANNER_WIDTHS = [2400, 1200, 600]
+
+
+def create_banner_set(output_dir=None, widths=tuple(BANNER_WIDTHS)):
+    """Draw the banner once at the largest width and reduce it to the others."""
+    master = max(widths)
+    print(f"Creating banners from a {master}x{master // 2} master...")
+    levels = pyramid(render_banner(master), [(w, w // 2) for w in widths])
+    reports = []
+    for w in widths:
+        output_path = _output_path(os.path.join(output_dir or OUTPUT_DIR, "banner"), f"banner_{w}x{w // 2}.png")
+        reports.append(save_png(levels[(w, w // 2)], output_path))
+    print(f"  Saved {len(reports)} banners ({_total_kb(reports)})")
+    return tuple(r.path for r in reports)
+
+
+PROMO_WIDTH = 3840
+
+
+def create_promo(output_dir=None, w=PROMO_WIDTH):
+    """4K promo art: the banner layout at 3840x1920.
+
+    At this size the canvas is drawn in bands and streamed to the PNG
+    writer, so the job never holds the whole image.
+    """
+    size = (w, _scaler(w / 1200)(600))
+    name = f"promo_{size[0]}x{size[1]}.png"
+    print(f"Creating promo art {size[0]}x{size[1]}...")
+    output_path = _output_path(os.path.join(output_dir or OUTPUT_DIR, "promo"), name)
+    if banded(size):
+        report = save_png_bands(output_path, size, "RGB", banner_bands(w))
+    else:
+        report = save_png(render_banner(w), output_path)
+    print(f"  Saved {name} ({describe(report)})")
+    return output_path
+
+
+def banner_frames(w=1200, steps=24, palette=None, fps=None):
+    """The banner with its sunburst turning by one ray spacing: a seamless loop.
+
+    The gradient and the foreground are drawn once; each frame redraws the
+    sunburst's box only.
+    """
+    gradient = render_banner(w, palette=palette, layer="gradient")
+    foreground = render_banner(w, palette=palette, layer="foreground")
+    _, y0, x1, y1 = animate.even_box(banner_sunburst_box(w))
+    h = gradient.height
+    frames = []
+    for k in range(steps):
+        # A band of full-width rows starting at x=0, so the primitives draw unshifted
+        patch = gradient.crop((0, y0, x1, y1))
+        draw_banner_sunburst(primitives.Band(patch, y0, h), w, 2 * math.pi / BANNER_RAYS * k / steps)
+        over = foreground.crop((0, y0, x1, y1))
+        patch.paste(over, (0, 0), over)
+        frames.append(animate.Frame(patch, (0, y0), animate.frame_ms(fps)))
+    first = gradient.copy()
+    first.paste(foreground, (0, 0), foreground)
+    first.paste(frames[0].image, frames[0].position)
+    return [frames[0]._replace(image=first, position=(0, 0))] + frames[1:]
+
+
+def create_banner_animation(output_dir=None, w=1200, fmt="apng"):
+    """Animated banner: the sunburst slowly turning behind the title."""
+    name = animate.output_name(f"banner_{w}x{w // 2}", fmt)
+    print(f"Creating animated banner {name}...")
+    output_path = _output_path(os.path.join(output_dir or OUTPUT_DIR, "animated"), name)
+    report = animate.save_animation(output_path, banner_frames(w))
+    print(f"  Saved {name} ({describe(report)})")
+    return output_path
 
 
 # ============================================================
 # 3. EDITOR'S CHOICE GRAPHIC (1200x1200)
 # ============================================================
-def create_editors_choice():
-    print("Creating editor's choice 1200x1200...")
-    size = 1200
-    img = Image.new('RGB', (size, size))
-
+def render_editors_choice(size=1200, palette=None):
+    """Draw the editor's-choice graphic at any size; the layout is designed at 1200x1200."""
+    palette = palette or PALETTE
+    px = _scaler(size / 1200)
+    thin = max(1, px(1))
+
+    phase = trace.phases()
+    phase("background")
     # Rich gradient background
+    # Gradient from deep charcoal to dark burgundy-tinted
+    burgundy_tint = tuple((palette.dark_burgundy[i] + palette.deep_bg[i]) * 0.5 for i in range(3))
+    img = vertical_gradient((size, size), palette.charcoal, burgundy_tint)
     draw = ImageDraw.Draw(img)
-    for y in range(size):
-        ratio = y / size
-        # Gradient from deep charcoal to dark burgundy-tinted
-        r = int(CHARCOAL[0] * (1 - ratio) + DARK_BURGUNDY[0] * ratio * 0.5 + DEEP_BG[0] * ratio * 0.5)
-        g = int(CHARCOAL[1] * (1 - ratio) + DARK_BURGUNDY[1] * ratio * 0.5 + DEEP_BG[1] * ratio * 0.5)
-        b = int(CHARCOAL[2] * (1 - ratio) + DARK_BURGUNDY[2] * ratio * 0.5 + DEEP_BG[2] * ratio * 0.5)
-        draw.line([(0, y), (size, y)], fill=(r, g, b))
 
     # Large sunburst from center
-    draw_sunburst(draw, size // 2, size // 2, 520, (35, 35, 60), num_rays=60, ray_width=1)
+    draw_sunburst(img, size // 2, size // 2, px(520), (35, 35, 60), num_rays=60, ray_width=thin)
 
+    phase("ornaments")
     # Outer Art Deco border
-    bm = 20
-    draw_decorative_frame(draw, bm, bm, size - bm, size - bm, GOLD, DARK_GOLD)
+    bm = px(20)
+    draw_decorative_frame(draw, bm, bm, size - bm, size - bm, palette.gold, palette.dark_gold, scale=size / 1200)
 
     # Middle border
-    im = 40
-    draw.rectangle([im, im, size - im, size - im], outline=DARK_GOLD, width=1)
+    im = px(40)
+    draw.rectangle([im, im, size - im, size - im], outline=palette.dark_gold, width=thin)
 
     # Inner border
-    im2 = 50
-    draw.rectangle([im2, im2, size - im2, size - im2], outline=GOLD, width=2)
+    im2 = px(50)
+    draw.rectangle([im2, im2, size - im2, size - im2], outline=palette.gold, width=max(1, px(2)))
 
     # Vertical line accents on sides
-    draw_vertical_lines(draw, 62, 100, 62, size - 62, (40, 40, 65), spacing=8)
-    draw_vertical_lines(draw, size - 100, size - 62, 62, size - 62, (40, 40, 65), spacing=8)
+    spacing = max(2, px(8))
+    draw_vertical_lines(draw, px(62), px(100), px(62), size - px(62), (40, 40, 65), spacing=spacing)
+    draw_vertical_lines(draw, size - px(100), size - px(62), px(62), size - px(62), (40, 40, 65), spacing=spacing)
 
     # === TOP SECTION: Decorative header ===
     # Art Deco arch/fan at top
     fan_cx = size // 2
-    for i in range(13):
-        angle = math.pi + math.pi * i / 12
-        r = 35
-        ex = fan_cx + int(r * math.cos(angle))
-        ey = 40 + int(r * math.sin(angle))
-        draw.line([(fan_cx, 40), (ex, ey)], fill=GOLD, width=2)
+    primitives.fan(img, (fan_cx, px(40)), px(35), palette.gold, num_rays=13, width=max(1, px(2)), direction="up")
 
     # Top decorative line
-    line_y = 90
-    draw.line([(120, line_y), (size - 120, line_y)], fill=GOLD, width=2)
-    draw.line([(120, line_y + 5), (size - 120, line_y + 5)], fill=DARK_GOLD, width=1)
+    line_y = px(90)
+    draw.line([(px(120), line_y), (size - px(120), line_y)], fill=palette.gold, width=max(1, px(2)))
+    draw.line([(px(120), line_y + px(5)), (size - px(120), line_y + px(5))], fill=palette.dark_gold, width=thin)
 
     # Diamond accents on top line
-    for dx in range(0, size - 240, 40):
-        ds = 4
-        cx = 120 + dx
-        draw.polygon([(cx, line_y - ds), (cx + ds, line_y), (cx, line_y + ds), (cx - ds, line_y)], fill=GOLD)
+    primitives.diamonds(img, [(px(120) + dx, line_y) for dx in range(0, size - px(240), px(40))], px(4), palette.gold)
 
     # === MAIN CONTENT ===
 
+    phase("text")
     # "ROARING" - large
-    font_main = get_font(110, bold=True)
-    draw_text_with_shadow(draw, "ROARING", 140, font_main, GOLD, size, shadow_color=(100, 80, 20), offset=3)
+    font_main = get_font(px(110), bold=True)
+    draw_text_with_shadow(img, "ROARING", px(140), font_main, palette.gold, size,
+                          shadow_color=(100, 80, 20), offset=max(1, px(3)))
 
     # "TRADES" - large
-    draw_text_with_shadow(draw, "TRADES", 265, font_main, LIGHT_GOLD, size, shadow_color=(100, 80, 20), offset=3)
+    draw_text_with_shadow(img, "TRADES", px(265), font_main, palette.light_gold, size,
+                          shadow_color=(100, 80, 20), offset=max(1, px(3)))
 
+    phase("ornaments")
     # Decorative separator
-    sep_y = 400
-    draw.line([(180, sep_y), (size - 180, sep_y)], fill=GOLD, width=3)
-    draw.line([(200, sep_y + 8), (size - 200, sep_y + 8)], fill=DARK_GOLD, width=1)
+    sep_y = px(400)
+    draw.line([(px(180), sep_y), (size - px(180), sep_y)], fill=palette.gold, width=max(1, px(3)))
+    draw.line([(px(200), sep_y + px(8)), (size - px(200), sep_y + px(8))], fill=palette.dark_gold, width=thin)
 
     # Center diamond on separator
-    ds = 10
-    draw.polygon([(size // 2, sep_y - ds), (size // 2 + ds, sep_y + 4),
-                   (size // 2, sep_y + 4 + ds), (size // 2 - ds, sep_y + 4)], fill=GOLD)
+    ds = px(10)
+    draw.polygon([(size // 2, sep_y - ds), (size // 2 + ds, sep_y + px(4)),
+                   (size // 2, sep_y + px(4) + ds), (size // 2 - ds, sep_y + px(4))], fill=palette.gold)
 
     # RT Monogram centered
-    draw_rt_monogram(draw, size // 2, 530, 100, GOLD, DARK_GOLD)
+    draw_rt_monogram(draw, size // 2, px(530), px(100), palette.gold, palette.dark_gold)
 
     # Circle around monogram
-    for r in [105, 110]:
-        for angle_step in range(360):
-            angle = math.radians(angle_step)
-            x = size // 2 + int(r * math.cos(angle))
-            y = 530 + int(r * math.sin(angle))
-            draw.point((x, y), fill=GOLD if r == 110 else DARK_GOLD)
+    primitives.ring(img, (size // 2, px(530)), px(105), palette.dark_gold, width=thin)
+    primitives.ring(img, (size // 2, px(530)), px(110), palette.gold, width=thin)
 
+    phase("text")
     # "CHICAGO, 1920s" subtitle
-    font_sub = get_font(40, bold=True)
-    draw_text_centered(draw, "CHICAGO, 1920s", 670, font_sub, CREAM, size)
+    font_sub = get_font(px(40), bold=True)
+    draw_text_centered(img, "CHICAGO, 1920s", px(670), font_sub, palette.cream, size)
 
     # Tagline
-    font_tag = get_font(28, bold=False)
-    draw_text_centered(draw, "Buy low, sell high.", 740, font_tag, DARK_GOLD, size)
-    draw_text_centered(draw, "Build your trading empire in 30 days.", 778, font_tag, DARK_GOLD, size)
+    font_tag = get_font(px(28), bold=False)
+    draw_text_centered(img, "Buy low, sell high.", px(740), font_tag, palette.dark_gold, size)
+    draw_text_centered(img, "Build your trading empire in 30 days.", px(778), font_tag, palette.dark_gold, size)
 
     # Feature highlights
-    font_feat = get_font(22, bold=False)
+    font_feat = get_font(px(22), bold=False)
     features = [
         "Bootleg 5 types of Prohibition-era spirits",
         "Explore 6 Chicago neighborhoods & speakeasies",
@@ -456,57 +582,74 @@ def create_editors_choice():
         "Outsmart rival gangs & evade the law",
         "Solana wallet leaderboard integration",
     ]
-    feat_y = 850
+    feat_y = px(850)
     for i, feat in enumerate(features):
         # Gold diamond bullet
-        bx = 250
-        by = feat_y + i * 35
-        ds = 4
-        draw.polygon([(bx, by + 8 - ds), (bx + ds, by + 8), (bx, by + 8 + ds), (bx - ds, by + 8)], fill=GOLD)
-        draw.text((bx + 12, by), feat, font=font_feat, fill=CREAM)
-
+        bx = px(250)
+        by = feat_y + px(i * 35)
+        ds = px(4)
+        draw.polygon([(bx, by + px(8) - ds), (bx + ds, by + px(8)), (bx, by + px(8) + ds), (bx - ds, by + px(8))],
+                     fill=palette.gold)
+        textlayout.draw(img, (bx + px(12), by), feat, font_feat, palette.cream)
+
+    phase("ornaments")
     # Bottom decorative section
-    bot_line_y = size - 110
-    draw.line([(120, bot_line_y), (size - 120, bot_line_y)], fill=GOLD, width=2)
-    draw.line([(120, bot_line_y + 5), (size - 120, bot_line_y + 5)], fill=DARK_GOLD, width=1)
+    bot_line_y = size - px(110)
+    draw.line([(px(120), bot_line_y), (size - px(120), bot_line_y)], fill=palette.gold, width=max(1, px(2)))
+    draw.line([(px(120), bot_line_y + px(5)), (size - px(120), bot_line_y + px(5))],
+              fill=palette.dark_gold, width=thin)
 
+    phase("text")
     # Publisher credit
-    font_pub = get_font(20, bold=False)
-    draw_text_centered(draw, "A MIDMIGHTBIT GAMES PRODUCTION", size - 80, font_pub, DARK_GOLD, size)
+    font_pub = get_font(px(20), bold=False)
+    draw_text_centered(img, "A MIDMIGHTBIT GAMES PRODUCTION", size - px(80), font_pub, palette.dark_gold, size)
 
+    phase("ornaments")
     # Bottom fan
-    for i in range(13):
-        angle = math.pi * i / 12
-        r = 35
-        ex = fan_cx + int(r * math.cos(angle))
-        ey = size - 40 + int(r * math.sin(angle))
-        draw.line([(fan_cx, size - 40), (ex, ey)], fill=GOLD, width=2)
+    primitives.fan(img, (fan_cx, size - px(40)), px(35), palette.gold, num_rays=13, width=max(1, px(2)),
+                   direction="down")
 
     # Corner accent flourishes
-    accent_len = 80
-    for corner_x, corner_y, dx, dy in [(60, 60, 1, 1), (size-60, 60, -1, 1),
-                                         (60, size-60, 1, -1), (size-60, size-60, -1, -1)]:
-        draw.line([(corner_x, corner_y), (corner_x + accent_len * dx, corner_y)], fill=GOLD, width=3)
-        draw.line([(corner_x, corner_y), (corner_x, corner_y + accent_len * dy)], fill=GOLD, width=3)
+    accent_len = px(80)
+    for corner_x, corner_y, dx, dy in [(px(60), px(60), 1, 1), (size - px(60), px(60), -1, 1),
+                                         (px(60), size - px(60), 1, -1), (size - px(60), size - px(60), -1, -1)]:
+        draw.line([(corner_x, corner_y), (corner_x + accent_len * dx, corner_y)], fill=palette.gold,
+                  width=max(1, px(3)))
+        draw.line([(corner_x, corner_y), (corner_x, corner_y + accent_len * dy)], fill=palette.gold,
+                  width=max(1, px(3)))
         # Small diagonal
         draw.line([(corner_x, corner_y),
                    (corner_x + int(accent_len * 0.5 * dx), corner_y + int(accent_len * 0.5 * dy))],
-                  fill=DARK_GOLD, width=2)
+                  fill=palette.dark_gold, width=max(1, px(2)))
 
-    img.save(os.path.join(OUTPUT_DIR, "editors_choice_1200x1200.png"), "PNG")
-    print(f"  Saved editors_choice_1200x1200.png")
+    phase.close()
+    return img
+
+
+def create_editors_choice(output_dir=None):
+    print("Creating editor's choice 1200x1200...")
+    img = render_editors_choice()
+    output_path = _output_path(output_dir, "editors_choice_1200x1200.png")
+    report = save_png(img, output_path)
+    print(f"  Saved editors_choice_1200x1200.png ({describe(report)})")
+    return output_path
 
 
 # ============================================================
 # Run all
 # ============================================================
 if __name__ == "__main__":
-    create_icon()
-    create_banner()
-    create_editors_choice()
+    from assetgen.jobs import graphic_jobs
+    from assetgen.render import build
+
+    _, skipped = build(graphic_jobs(), workers=1, force="--force" in sys.argv)
+    for job in skipped:
+        print(f"  {os.path.basename(job.output)} is up to date")
+    if trace.enabled():
+        print(f"  trace written to {trace.save()}")
     print("\nAll assets created in:", OUTPUT_DIR)
     for f in sorted(os.listdir(OUTPUT_DIR)):
         if f.endswith('.png'):
             fp = os.path.join(OUTPUT_DIR, f)
-            img = Image.open(fp)
-            print(f"  {f}: {img.size[0]}x{img.size[1]}, {os.path.getsize(fp) / 1024:.1f}KB")
+            header = png_header(fp)
+            print(f"  {f}: {header.width}x{header.height}, {os.path.getsize(fp) / 1024:.1f}KB")
@@ -1,181 +1,380 @@
 #!/usr/bin/env python3
 """Format raw screenshots into polished dApp Store screenshots with Art Deco framing."""
 
-from PIL import Image, ImageDraw, ImageFont
-import math
+from PIL import Image
+import functools
 import os
-
-ASSETS = "/Users/heathbertram/Downloads/RoaringTrades/assets"
-
-# Color palette
-CHARCOAL = (26, 26, 46)
-DEEP_BG = (15, 15, 35)
-GOLD = (212, 175, 55)
-DARK_GOLD = (184, 134, 11)
-LIGHT_GOLD = (232, 212, 139)
-CREAM = (255, 248, 231)
+import sys
+
+from assetgen import animate, compositor, primitives, textlayout, trace
+from assetgen.compositor import Layer
+from assetgen.encode import band_ranges, banded, describe, save_png, save_png_bands
+from assetgen.fonts import get_font
+from assetgen.gradients import vertical_gradient
+from assetgen.palette import PALETTE
+from assetgen.resize_cache import REDUCING_GAP, RESIZE_CACHE
+
+ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# Color palette (see assetgen.palette)
+CHARCOAL = PALETTE.charcoal
+DEEP_BG = PALETTE.deep_bg
+GOLD = PALETTE.gold
+DARK_GOLD = PALETTE.dark_gold
+LIGHT_GOLD = PALETTE.light_gold
+CREAM = PALETTE.cream
 
 # Output: 1080x1920 (9:16 portrait, standard store screenshot ratio, meets 1080x1080 min)
 OUT_W, OUT_H = 1080, 1920
+# Tablet: 2560x1600 landscape; the capture sits in the same phone-style frame
+TABLET_SIZE = (2560, 1600)
+CAPTION_AREA_H = 260
 
+# How captures are mounted: rounded screen corners inside a gold bezel
+DEVICE = compositor.DeviceProfile("phone", corner=0.06, bezel=4, color=GOLD, edge=DARK_GOLD)
 
-def get_font(size, bold=False):
-    font_paths = [
-        "/System/Library/Fonts/Supplemental/Georgia Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Georgia.ttf",
-        "/System/Library/Fonts/Supplemental/Times New Roman Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Times New Roman.ttf",
-    ]
-    for fp in font_paths:
-        if os.path.exists(fp):
-            try:
-                return ImageFont.truetype(fp, size)
-            except:
-                continue
-    return ImageFont.load_default()
+# (raw capture, output name, caption, subtitle)
+SCREENSHOTS = [
+    ("1. Screenshot Garage.png",  "screenshot_1_garage.png",  "Garage", "Upgrade your ride from On Foot to Zeppelin"),
+    ("2. Screenshot Market.png",  "screenshot_2_market.png",  "Market", "Trade bootleg spirits across Chicago"),
+    ("3. Screenshot Travel.png",  "screenshot_3_travel.png",  "Travel", "Explore 6 Chicago neighborhoods"),
+    ("4. Screenshot Status.png",  "screenshot_4_status.png",  "Status", "Track your empire & visit speakeasies"),
+]
 
 
-def text_width(draw, text, font):
-    bbox = draw.textbbox((0, 0), text, font=font)
-    return bbox[2] - bbox[0]
+def text_width(text, font):
+    return textlayout.width(text, font)
 
 
-def draw_text_centered(draw, text, y, font, fill, width):
-    tw = text_width(draw, text, font)
-    x = (width - tw) // 2
-    draw.text((x, y), text, font=font, fill=fill)
+def draw_text_centered(img, text, y, font, fill, width):
+    textlayout.draw_centered(img, text, y, font, fill, width)
 
 
-def draw_art_deco_fan(draw, cx, cy, r, color, direction="up", num=9):
+def draw_art_deco_fan(img, cx, cy, r, color, direction="up", num=9):
     """Draw a small Art Deco fan. direction='up' fans upward, 'down' fans downward."""
-    for i in range(num):
-        if direction == "up":
-            angle = math.pi + math.pi * i / (num - 1)
-        else:
-            angle = math.pi * i / (num - 1)
-        ex = cx + int(r * math.cos(angle))
-        ey = cy + int(r * math.sin(angle))
-        draw.line([(cx, cy), (ex, ey)], fill=color, width=2)
-
-
-def create_framed_screenshot(input_path, output_name, caption, subtitle=None):
-    """Create a store-ready screenshot with Art Deco frame and caption."""
-
-    # Load original screenshot
-    raw = Image.open(input_path)
-    raw_w, raw_h = raw.size  # 1200x2670
-
-    # Create output canvas
-    img = Image.new('RGB', (OUT_W, OUT_H))
-    draw = ImageDraw.Draw(img)
-
-    # Gradient background
-    for y in range(OUT_H):
-        ratio = y / OUT_H
-        r = int(CHARCOAL[0] * (1 - ratio) + DEEP_BG[0] * ratio)
-        g = int(CHARCOAL[1] * (1 - ratio) + DEEP_BG[1] * ratio)
-        b = int(CHARCOAL[2] * (1 - ratio) + DEEP_BG[2] * ratio)
-        draw.line([(0, y), (OUT_W, y)], fill=(r, g, b))
+    primitives.fan(img, (cx, cy), r, color, num_rays=num, width=2, direction=direction)
 
-    # === TOP CAPTION AREA ===
-    caption_area_h = 260
 
+def device(palette=None):
+    """``DEVICE`` with its bezel in ``palette``'s golds."""
+    palette = palette or PALETTE
+    return DEVICE._replace(color=palette.gold, edge=palette.dark_gold)
+
+
+def screenshot_rect(raw_size, size=(OUT_W, OUT_H)):
+    """Return (x, y, w, h) of the scaled screenshot inside the phone area."""
+    out_w, out_h = size
+    raw_w, raw_h = raw_size
+
+    # Phone mockup area - place screenshot with rounded-corner mask and subtle border
+    phone_margin_x = 60
+    phone_top = CAPTION_AREA_H
+    phone_bottom = out_h - 60
+    phone_w = out_w - 2 * phone_margin_x
+    phone_h = phone_bottom - phone_top
+
+    # Scale the screenshot to fit within the phone area
+    # Original is 1200x2670, we need to fit in phone_w x phone_h
+    scale = min(phone_w / raw_w, phone_h / raw_h)
+    new_w = int(raw_w * scale)
+    new_h = int(raw_h * scale)
+
+    # Center the screenshot
+    ss_x = (out_w - new_w) // 2
+    ss_y = phone_top + (phone_h - new_h) // 2
+    return ss_x, ss_y, new_w, new_h
+
+
+def static_layers(size, has_subtitle, rect, rows=None, palette=None):
+    """The background, frame and bezel layers: everything but the screenshot and caption.
+
+    ``rows=(top, bottom)`` draws the background and frame for just that band.
+    """
+    palette = palette or PALETTE
+    top, bottom = rows or (0, size[1])
+    with trace.span("background"):
+        background = vertical_gradient(size, palette.charcoal, palette.deep_bg, (top, bottom))
+    with trace.span("ornaments"):
+        frame = Image.new("RGBA", background.size, (0, 0, 0, 0))
+        _draw_frame_ornaments(primitives.Band(frame, top, size[1]) if rows else frame, size, has_subtitle, palette)
+    return ([Layer("background", background, (0, top)), Layer("frame", frame, (0, top))]
+            + compositor.bezel_layers(device(palette), rect))
+
+
+def render_frame(size, has_subtitle, rect, palette=None):
+    """Flatten everything that does not depend on the caption or screenshot pixels.
+
+    Flattened band by band, so the transparent frame layer is never held at
+    full size.
+    """
+    img = Image.new("RGB", size)
+    for top, bottom in band_ranges(size):
+        rows = (top, bottom)
+        img.paste(compositor.flatten(static_layers(size, has_subtitle, rect, rows, palette), size, rows), (0, top))
+    return img
+
+
+def _draw_frame_ornaments(img, size, has_subtitle, palette=None):
+    """Borders, corner accents and caption rule.
+
+    ``img`` may be a ``primitives.Band`` of a ``size`` canvas.
+    """
+    palette = palette or PALETTE
+    gold, dark_gold = palette.gold, palette.dark_gold
+    out_w, out_h = size
+    draw = primitives.draw_for(img)
+
+    # === TOP CAPTION AREA ===
     # Top decorative fan
-    draw_art_deco_fan(draw, OUT_W // 2, 15, 18, GOLD, "up", 7)
+    draw_art_deco_fan(img, out_w // 2, 15, 18, gold, "up", 7)
 
     # Outer border (just top portion framing)
     bm = 14
-    draw.rectangle([bm, bm, OUT_W - bm, OUT_H - bm], outline=GOLD, width=2)
+    draw.rectangle([bm, bm, out_w - bm, out_h - bm], outline=gold, width=2)
     # Inner border
     im = 26
-    draw.rectangle([im, im, OUT_W - im, OUT_H - im], outline=DARK_GOLD, width=1)
+    draw.rectangle([im, im, out_w - im, out_h - im], outline=dark_gold, width=1)
 
     # Corner accents
     accent = 45
-    for cx, cy, dx, dy in [(im, im, 1, 1), (OUT_W - im, im, -1, 1),
-                            (im, OUT_H - im, 1, -1), (OUT_W - im, OUT_H - im, -1, -1)]:
-        draw.line([(cx, cy), (cx + accent * dx, cy)], fill=GOLD, width=3)
-        draw.line([(cx, cy), (cx, cy + accent * dy)], fill=GOLD, width=3)
+    for cx, cy, dx, dy in [(im, im, 1, 1), (out_w - im, im, -1, 1),
+                            (im, out_h - im, 1, -1), (out_w - im, out_h - im, -1, -1)]:
+        draw.line([(cx, cy), (cx + accent * dx, cy)], fill=gold, width=3)
+        draw.line([(cx, cy), (cx, cy + accent * dy)], fill=gold, width=3)
 
     # Corner diamonds
     cs = 5
-    for cx, cy in [(bm, bm), (OUT_W - bm, bm), (bm, OUT_H - bm), (OUT_W - bm, OUT_H - bm)]:
-        draw.polygon([(cx, cy - cs), (cx + cs, cy), (cx, cy + cs), (cx - cs, cy)], fill=GOLD)
+    for cx, cy in [(bm, bm), (out_w - bm, bm), (bm, out_h - bm), (out_w - bm, out_h - bm)]:
+        draw.polygon([(cx, cy - cs), (cx + cs, cy), (cx, cy + cs), (cx - cs, cy)], fill=gold)
+
+    # Decorative line under caption
+    line_y = 170 if has_subtitle else 140
+    draw.line([(80, line_y), (out_w - 80, line_y)], fill=gold, width=2)
+    draw.line([(100, line_y + 5), (out_w - 100, line_y + 5)], fill=dark_gold, width=1)
+
+    # Small diamonds on the line
+    primitives.diamonds(img, [(dx, line_y) for dx in range(80, out_w - 80, 50)], 3, gold)
+
+    # Bottom fan
+    draw_art_deco_fan(img, out_w // 2, out_h - 15, 18, gold, "down", 7)
+
+
+@functools.lru_cache(maxsize=None)
+def frame_template(size, has_subtitle, rect, palette=None):
+    """Cached ``render_frame``: the static layers, flattened once per layout and
+    palette and shared by every screenshot and locale. Copy before drawing on it."""
+    return render_frame(size, has_subtitle, rect, palette)
+
+
+def fit_font(text, size, bold, locale, max_width):
+    """Largest font up to ``size`` that keeps ``text`` within ``max_width``."""
+    font = get_font(size, bold, locale)
+    while size > 12 and text_width(text, font) > max_width:
+        size -= 2
+        font = get_font(size, bold, locale)
+    return font
+
+
+def draw_captions(img, caption, subtitle=None, locale=None, palette=None):
+    """Draw the caption and optional subtitle onto a frame (or a band of one)."""
+    palette = palette or PALETTE
+    out_w = primitives.image_of(img).width
+    # Translations can run longer than the English text; keep them inside the rule
+    max_w = out_w - 160
 
     # Caption text
-    font_caption = get_font(48, bold=True)
-    draw_text_centered(draw, caption, 65, font_caption, GOLD, OUT_W)
+    font_caption = fit_font(caption, 48, True, locale, max_w)
+    draw_text_centered(img, caption, 65, font_caption, palette.gold, out_w)
 
     if subtitle:
-        font_sub = get_font(24, bold=False)
-        draw_text_centered(draw, subtitle, 130, font_sub, DARK_GOLD, OUT_W)
+        font_sub = fit_font(subtitle, 24, False, locale, max_w)
+        draw_text_centered(img, subtitle, 130, font_sub, palette.dark_gold, out_w)
 
-    # Decorative line under caption
-    line_y = 170 if subtitle else 140
-    draw.line([(80, line_y), (OUT_W - 80, line_y)], fill=GOLD, width=2)
-    draw.line([(100, line_y + 5), (OUT_W - 100, line_y + 5)], fill=DARK_GOLD, width=1)
 
-    # Small diamonds on the line
-    for dx in range(80, OUT_W - 80, 50):
-        ds = 3
-        draw.polygon([(dx, line_y - ds), (dx + ds, line_y), (dx, line_y + ds), (dx - ds, line_y)], fill=GOLD)
+def load_screenshot(input_path, size=(OUT_W, OUT_H)):
+    """Fit a raw screenshot to the phone area. Returns (image, rect).
 
-    # === SCREENSHOT AREA ===
-    # Phone mockup area - place screenshot with rounded-corner mask and subtle border
-    phone_margin_x = 60
-    phone_top = caption_area_h
-    phone_bottom = OUT_H - 60
-    phone_w = OUT_W - 2 * phone_margin_x
-    phone_h = phone_bottom - phone_top
+    Only the PNG header is read to size the rect; the decode and resize go
+    through the resize cache, so the returned image is shared.
+    """
+    with Image.open(input_path) as raw:
+        rect = screenshot_rect(raw.size, size)  # raw is 1200x2670
+    # Resize screenshot with high quality
+    resized = RESIZE_CACHE.resize(input_path, rect[2:], Image.LANCZOS)
+    return resized, rect
 
-    # Scale the screenshot to fit within the phone area
-    # Original is 1200x2670, we need to fit in phone_w x phone_h
-    scale = min(phone_w / raw_w, phone_h / raw_h)
-    new_w = int(raw_w * scale)
-    new_h = int(raw_h * scale)
 
-    # Center the screenshot
-    ss_x = (OUT_W - new_w) // 2
-    ss_y = phone_top + (phone_h - new_h) // 2
+def fit_screenshot(raw, size=(OUT_W, OUT_H)):
+    """``load_screenshot`` for a capture already in memory; nothing is cached."""
+    rect = screenshot_rect(raw.size, size)
+    return raw.resize(rect[2:], Image.LANCZOS, reducing_gap=REDUCING_GAP), rect
 
-    # Resize screenshot with high quality
-    resized = raw.resize((new_w, new_h), Image.LANCZOS)
-
-    # Draw a subtle gold border around the screenshot
-    border_w = 3
-    draw.rectangle(
-        [ss_x - border_w, ss_y - border_w, ss_x + new_w + border_w, ss_y + new_h + border_w],
-        outline=GOLD, width=border_w
-    )
-    # Inner subtle border
-    draw.rectangle(
-        [ss_x - 1, ss_y - 1, ss_x + new_w + 1, ss_y + new_h + 1],
-        outline=DARK_GOLD, width=1
-    )
-
-    # Paste the screenshot
-    img.paste(resized, (ss_x, ss_y))
 
-    # Bottom fan
-    draw_art_deco_fan(draw, OUT_W // 2, OUT_H - 15, 18, GOLD, "down", 7)
+def caption_layer(caption, subtitle=None, locale=None, width=OUT_W, palette=None):
+    """The caption and subtitle on a transparent strip across the top of the canvas."""
+    img = Image.new("RGBA", (width, CAPTION_AREA_H), (0, 0, 0, 0))
+    draw_captions(img, caption, subtitle, locale, palette)
+    return Layer("caption", img, (0, 0))
+
+
+def compose_screenshot(resized, rect, caption, subtitle=None, locale=None, size=(OUT_W, OUT_H), palette=None):
+    """Frame an already-resized screenshot with its caption."""
+    # The static layers are identical for every screenshot with the same layout
+    with trace.span("frame"):
+        static = Layer("static", frame_template(size, bool(subtitle), rect, palette), (0, 0))
+    with trace.span("text", locale=locale or ""):
+        caption = caption_layer(caption, subtitle, locale, size[0], palette)
+    with trace.span("composite"):
+        screen = compositor.screen_layer(device(palette), resized, rect[:2])
+        return compositor.flatten([static, screen, caption], size)
+
+
+def screenshot_bands(resized, rect, caption, subtitle=None, locale=None, size=(OUT_W, OUT_H), palette=None):
+    """Yield ``compose_screenshot``'s image as horizontal bands, top to bottom.
+
+    Only one band is alive at a time: the static layers are drawn for each
+    band rather than copied from a full-size template.
+    """
+    screen = compositor.screen_layer(device(palette), resized, rect[:2])
+    caption = caption_layer(caption, subtitle, locale, size[0], palette)
+    for top, bottom in band_ranges(size):
+        with trace.span("band", top=top):
+            layers = static_layers(size, bool(subtitle), rect, (top, bottom), palette) + [screen, caption]
+            band = compositor.flatten(layers, size, (top, bottom))
+        yield band
+
 
-    # Save
-    output_path = os.path.join(ASSETS, output_name)
-    img.save(output_path, "PNG")
-    print(f"  {output_name}: {OUT_W}x{OUT_H}, {os.path.getsize(output_path) / 1024:.1f}KB")
+def _output_file(output_name, output_dir):
+    output_path = os.path.join(output_dir or ASSETS, output_name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
     return output_path
 
 
+def save_screenshot(img, output_name, output_dir=None):
+    output_path = _output_file(output_name, output_dir)
+    report = save_png(img, output_path)
+    print(f"  {output_name}: {img.size[0]}x{img.size[1]}, {describe(report)}")
+    return output_path
+
+
+def render_screenshot(input_path, caption, subtitle=None, locale=None, size=(OUT_W, OUT_H), palette=None):
+    """Frame one raw screenshot in memory and return the image."""
+    resized, rect = load_screenshot(input_path, size)
+    return compose_screenshot(resized, rect, caption, subtitle, locale, size, palette)
+
+
+def create_framed_screenshot(input_path, output_name, caption, subtitle=None, output_dir=None,
+                             size=(OUT_W, OUT_H), palette=None):
+    """Create a store-ready screenshot with Art Deco frame and caption.
+
+    Large sizes (see ``assetgen.encode.banded``) are rendered band by band
+    and streamed to the PNG writer, so the full canvas is never held.
+    """
+    if not banded(size):
+        img = render_screenshot(input_path, caption, subtitle, size=size, palette=palette)
+        return save_screenshot(img, output_name, output_dir)
+    resized, rect = load_screenshot(input_path, size)
+    output_path = _output_file(output_name, output_dir)
+    bands = screenshot_bands(resized, rect, caption, subtitle, size=size, palette=palette)
+    report = save_png_bands(output_path, size, "RGB", bands)
+    print(f"  {output_name}: {size[0]}x{size[1]}, {describe(report)}")
+    return output_path
+
+
+def localized_name(output_name, locale):
+    """screenshot_1_garage.png -> screenshot_1_garage.<locale>.png"""
+    stem, ext = os.path.splitext(output_name)
+    return f"{stem}.{locale}{ext}"
+
+
+def create_localized_screenshots(input_path, output_name, captions, output_dir=None):
+    """Render one screenshot for every locale, decoding and resizing it once.
+
+    ``captions`` is a sequence of ``(locale, caption, subtitle)``. Returns the
+    output paths in the same order.
+    """
+    resized, rect = load_screenshot(input_path)
+    return [save_screenshot(compose_screenshot(resized, rect, caption, subtitle, locale),
+                            localized_name(output_name, locale), output_dir)
+            for locale, caption, subtitle in captions]
+
+
+def caption_reveal_frames(input_path, caption, subtitle=None, locale=None, steps=12, fps=None, palette=None):
+    """The framed screenshot with its caption fading in; only the caption's box changes."""
+    size = (OUT_W, OUT_H)
+    resized, rect = load_screenshot(input_path, size)
+    static = Layer("static", frame_template(size, bool(subtitle), rect, palette), (0, 0))
+    base = compositor.flatten([static, compositor.screen_layer(device(palette), resized, rect[:2])], size)
+    layer = caption_layer(caption, subtitle, locale, size[0], palette)
+    text = Image.new("RGBA", size, (0, 0, 0, 0))
+    text.paste(layer.image, layer.position)
+    first = animate.Frame(base, (0, 0), animate.HOLD_MS // 2)
+    box = text.getbbox()
+    if box is None:  # nothing to reveal: just hold the framed capture
+        return [first, animate.Frame(None, (0, 0), animate.HOLD_MS)]
+    return [first] + animate.fade(base, text, animate.even_box(box), steps, animate.frame_ms(fps))
+
+
+def tour_frames(screenshots, steps=8, fps=None, palette=None):
+    """Crossfade through ``screenshots`` (``[(input_path, caption, subtitle)]``) and back
+    to the first; each step redraws only the pixels that differ."""
+    frames = [render_screenshot(path, caption, subtitle, palette=palette) for path, caption, subtitle in screenshots]
+    out = [animate.Frame(frames[0], (0, 0), animate.HOLD_MS)]
+    for a, b in zip(frames, frames[1:] + frames[:1]):
+        out += animate.crossfade(a, b, steps, animate.frame_ms(fps))
+    return out
+
+
+def create_caption_reveal(input_path, output_name, caption, subtitle=None, output_dir=None, fmt="apng"):
+    """Animated screenshot whose caption fades in over the framed capture."""
+    output_path = _output_file(animate.output_name(output_name, fmt), output_dir)
+    report = animate.save_animation(output_path, caption_reveal_frames(input_path, caption, subtitle))
+    print(f"  {os.path.basename(output_path)}: {OUT_W}x{OUT_H}, {describe(report)}")
+    return output_path
+
+
+def create_screenshot_tour(screenshots, output_name, output_dir=None, fmt="apng"):
+    """Animated tour crossfading between the framed screenshots."""
+    output_path = _output_file(animate.output_name(output_name, fmt), output_dir)
+    report = animate.save_animation(output_path, tour_frames(screenshots))
+    print(f"  {os.path.basename(output_path)}: {OUT_W}x{OUT_H}, {describe(report)}")
+    return output_path
+
+
+def framed_stages(input_path, output_name, caption, subtitle=None, output_dir=None, size=(OUT_W, OUT_H),
+                  palette=None):
+    """``create_framed_screenshot`` split for ``assetgen.pipeline``: ``(decode, render)``.
+
+    ``decode()`` loads the capture and ``render(loaded)`` yields
+    ``(output_path, image)`` for the encode stage. Sizes rendered in bands
+    stream their own output and are not split (returns None).
+    """
+    if banded(size):
+        return None
+    output_path = _output_file(output_name, output_dir)
+    return (lambda: load_screenshot(input_path, size),
+            lambda loaded: [(output_path, compose_screenshot(*loaded, caption, subtitle, size=size, palette=palette))])
+
+
+def localized_stages(input_path, output_name, captions, output_dir=None):
+    """``create_localized_screenshots`` split like ``framed_stages``: one decode,
+    then one image per locale."""
+    paths = [_output_file(localized_name(output_name, locale), output_dir) for locale, _, _ in captions]
+    return (lambda: load_screenshot(input_path),
+            lambda loaded: ((path, compose_screenshot(*loaded, caption, subtitle, locale))
+                            for path, (locale, caption, subtitle) in zip(paths, captions)))
+
+
 if __name__ == "__main__":
     print("Formatting screenshots for dApp Store...")
 
-    screenshots = [
-        ("1. Screenshot Garage.png",  "screenshot_1_garage.png",  "Garage", "Upgrade your ride from On Foot to Zeppelin"),
-        ("2. Screenshot Market.png",  "screenshot_2_market.png",  "Market", "Trade bootleg spirits across Chicago"),
-        ("3. Screenshot Travel.png",  "screenshot_3_travel.png",  "Travel", "Explore 6 Chicago neighborhoods"),
-        ("4. Screenshot Status.png",  "screenshot_4_status.png",  "Status", "Track your empire & visit speakeasies"),
-    ]
+    from assetgen.jobs import screenshot_jobs
+    from assetgen.render import build
 
-    for raw_name, out_name, caption, subtitle in screenshots:
-        input_path = os.path.join(ASSETS, raw_name)
-        create_framed_screenshot(input_path, out_name, caption, subtitle)
+    _, skipped = build(screenshot_jobs(), workers=1, force="--force" in sys.argv)
+    for job in skipped:
+        print(f"  {os.path.basename(job.output)} is up to date")
+    if trace.enabled():
+        print(f"  trace written to {trace.save()}")
 
     print("\nDone! All formatted screenshots ready.")
@@ -0,0 +1,83 @@
+"""Localized captions for the store screenshots.
+
+Keyed by locale (the ``android_details.locales`` in config.yaml), then by
+screenshot key (the last part of the output name, e.g. ``garage`` for
+``screenshot_1_garage.png``). Each value is ``(caption, subtitle)``.
+"""
+
+CAPTIONS = {
+    "en-US": {
+        "garage": ("Garage", "Upgrade your ride from On Foot to Zeppelin"),
+        "market": ("Market", "Trade bootleg spirits across Chicago"),
+        "travel": ("Travel", "Explore 6 Chicago neighborhoods"),
+        "status": ("Status", "Track your empire & visit speakeasies"),
+    },
+    "es": {
+        "garage": ("Garaje", "Mejora tu vehículo: de a pie al zepelín"),
+        "market": ("Mercado", "Trafica licores de contrabando por Chicago"),
+        "travel": ("Viaje", "Explora 6 barrios de Chicago"),
+        "status": ("Estado", "Controla tu imperio y visita bares clandestinos"),
+    },
+    "pt-BR": {
+        "garage": ("Garagem", "Melhore seu veículo: de a pé ao zepelim"),
+        "market": ("Mercado", "Negocie bebidas contrabandeadas em Chicago"),
+        "travel": ("Viagem", "Explore 6 bairros de Chicago"),
+        "status": ("Status", "Acompanhe seu império e visite bares clandestinos"),
+    },
+    "fr": {
+        "garage": ("Garage", "Passez de la marche à pied au zeppelin"),
+        "market": ("Marché", "Vendez de l'alcool de contrebande à Chicago"),
+        "travel": ("Voyage", "Explorez 6 quartiers de Chicago"),
+        "status": ("Statut", "Suivez votre empire et visitez les bars clandestins"),
+    },
+    "de": {
+        "garage": ("Garage", "Vom Fußgänger zum Zeppelin aufrüsten"),
+        "market": ("Markt", "Handle mit geschmuggeltem Schnaps in Chicago"),
+        "travel": ("Reisen", "Erkunde 6 Viertel von Chicago"),
+        "status": ("Status", "Verfolge dein Imperium & besuche Flüsterkneipen"),
+    },
+    "ja": {
+        "garage": ("ガレージ", "徒歩からツェッペリンまで乗り物をアップグレード"),
+        "market": ("マーケット", "シカゴ中で密造酒を取引しよう"),
+        "travel": ("移動", "シカゴの6つの地区を探索"),
+        "status": ("ステータス", "帝国を管理し、スピークイージーを訪れよう"),
+    },
+    "ko": {
+        "garage": ("차고", "도보에서 체펠린까지 탈것을 업그레이드하세요"),
+        "market": ("시장", "시카고 전역에서 밀주를 거래하세요"),
+        "travel": ("이동", "시카고의 6개 지역을 탐험하세요"),
+        "status": ("상태", "제국을 관리하고 비밀 술집을 방문하세요"),
+    },
+    "zh-CN": {
+        "garage": ("车库", "从步行一路升级到齐柏林飞艇"),
+        "market": ("市场", "在芝加哥各地交易私酒"),
+        "travel": ("旅行", "探索芝加哥的6个街区"),
+        "status": ("状态", "管理你的帝国，光顾地下酒吧"),
+    },
+    "tr": {
+        "garage": ("Garaj", "Yaya olarak başla, zeplinle devam et"),
+        "market": ("Pazar", "Chicago genelinde kaçak içki ticareti yap"),
+        "travel": ("Seyahat", "Chicago'nun 6 mahallesini keşfet"),
+        "status": ("Durum", "İmparatorluğunu izle ve gizli barları ziyaret et"),
+    },
+    "ru": {
+        "garage": ("Гараж", "От пеших прогулок до дирижабля"),
+        "market": ("Рынок", "Торгуйте контрабандным спиртным по всему Чикаго"),
+        "travel": ("Поездки", "Исследуйте 6 районов Чикаго"),
+        "status": ("Статус", "Следите за империей и посещайте подпольные бары"),
+    },
+    "hi": {
+        "garage": ("गैराज", "पैदल से ज़ेपेलिन तक अपनी सवारी अपग्रेड करें"),
+        "market": ("बाज़ार", "पूरे शिकागो में तस्करी की शराब का व्यापार करें"),
+        "travel": ("यात्रा", "शिकागो के 6 इलाकों की खोज करें"),
+        "status": ("स्थिति", "अपने साम्राज्य पर नज़र रखें और गुप्त बार जाएँ"),
+    },
+    "id": {
+        "garage": ("Garasi", "Tingkatkan kendaraan dari jalan kaki ke zeppelin"),
+        "market": ("Pasar", "Perdagangkan minuman selundupan di seluruh Chicago"),
+        "travel": ("Perjalanan", "Jelajahi 6 distrik Chicago"),
+        "status": ("Status", "Pantau kerajaanmu & kunjungi bar rahasia"),
+    },
+}
+
+LOCALES = list(CAPTIONS)